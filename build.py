@@ -26,6 +26,8 @@ import subprocess
 import tarfile
 import tempfile
 import datetime
+import threading
+import traceback
 
 try:
     import pathlib
@@ -436,7 +438,9 @@ def makeOptionParser():
         ("extra_waf",      ("",    "Extra args to pass on waf's command line.")),
         ("extra_pytest",   ("",    "Extra args to pass on py.test's command line.")),
 
-        (("j","jobs"),     ("",    "Number of parallel compile jobs to do, if supported.")),
+        (("j","jobs"),     ("",    "Number of parallel compile jobs to do, if supported. "
+                                   "Also used for running the etg and sip commands, and for "
+                                   "post-processing the sphinx output.")),
         ("both",           (False, "Build both a debug and release version. (Only used on Windows)")),
         ("unicode",        (True,  "Build wxPython with unicode support (always on for wx2.9+)")),
         (("v", "verbose"), (False, "Print out more information during the build.")),
@@ -674,6 +678,57 @@ class CommandTimer(object):
         msg('Finished command: %s (%s)' % (self.name, time))
 
 
+def getNumJobs(options):
+    """
+    Returns the number of parallel jobs asked for with --jobs, or 1.
+    """
+    try:
+        return max(int(options.jobs), 1)
+    except ValueError:
+        return 1
+
+
+def runParallel(func, items, numJobs):
+    """
+    Calls func(item) for each of the items, with up to numJobs of the calls
+    running at the same time. Threads are used since the items are expected
+    to do their work in subprocesses. If an item fails (that is, runcmd
+    exits) then no more items are started, and this exits once the items
+    already running have finished.
+    """
+    if numJobs <= 1 or len(items) <= 1:
+        for item in items:
+            func(item)
+        return
+
+    pending = list(items)
+    failures = []
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                if not pending or failures:
+                    return
+                item = pending.pop(0)
+            try:
+                func(item)
+            except SystemExit as e:
+                failures.append(e.code or 1)
+            except Exception:
+                traceback.print_exc()
+                failures.append(1)
+
+    threads = [threading.Thread(target=worker) for i in range(min(numJobs, len(items)))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if failures:
+        sys.exit(failures[0])
+
+
 def uploadPackage(fileName, options, mask=defaultMask, keep=75):
     """
     Upload the given filename to the configured package server location. Only
@@ -1020,27 +1075,37 @@ def cmd_etg(options, args):
     if options.nodoc:
         flags += ' --nodoc'
 
-    # get the files to run, moving _core the to the front of the list
-    etgfiles = glob.glob(opj('etg', '_*.py'))
+    numJobs = getNumJobs(options)
+
+    def runETG(script):
+        # Run the script of a module, then the scripts of the items it includes
+        # which are still out of date.
+        etgfiles = [script]
+        for script in etgfiles:
+            sipfile = etg2sip(script)
+            deps = [script]
+            ns = loadETG(script)
+            if hasattr(ns, 'ETGFILES'):
+                etgfiles += ns.ETGFILES[1:] # all but itself
+            if hasattr(ns, 'DEPENDS'):
+                deps += ns.DEPENDS
+            if hasattr(ns, 'OTHERDEPS'):
+                deps += ns.OTHERDEPS
+
+            # run the script only if any dependencies are newer
+            if newer_group(deps, sipfile):
+                itemTimer = CommandTimer('etg %s' % script)
+                runcmd('"%s" %s %s' % (PYTHON, script, flags))
+                del itemTimer
+
+    # get the files to run, doing _core first since the others depend on it
+    etgfiles = sorted(glob.glob(opj('etg', '_*.py')))
     core_file = opj('etg', '_core.py')
     if core_file in etgfiles:
         etgfiles.remove(core_file)
-        etgfiles.insert(0, core_file)
-
-    for script in etgfiles:
-        sipfile = etg2sip(script)
-        deps = [script]
-        ns = loadETG(script)
-        if hasattr(ns, 'ETGFILES'):
-            etgfiles += ns.ETGFILES[1:] # all but itself
-        if hasattr(ns, 'DEPENDS'):
-            deps += ns.DEPENDS
-        if hasattr(ns, 'OTHERDEPS'):
-            deps += ns.OTHERDEPS
+        runETG(core_file)
 
-        # run the script only if any dependencies are newer
-        if newer_group(deps, sipfile):
-            runcmd('"%s" %s %s' % (PYTHON, script, flags))
+    runParallel(runETG, etgfiles, numJobs)
 
 
 def cmd_sphinx(options, args):
@@ -1177,14 +1242,8 @@ def cmd_sip(options, args):
     cmdTimer = CommandTimer('sip')
     cfg = Config()
     pwd = pushDir(cfg.ROOT_DIR)
-    modules = glob.glob(opj(cfg.SIPGEN, '_*.sip'))
-    # move _core the to the front of the list
-    core_file = opj(cfg.SIPGEN, '_core.sip')
-    if core_file in modules:
-        modules.remove(core_file)
-        modules.insert(0, core_file)
 
-    for src_name in modules:
+    def runSip(src_name):
         tmpdir = tempfile.mkdtemp()
         tmpdir = tmpdir.replace('\\', '/')
         src_name = src_name.replace('\\', '/')
@@ -1199,13 +1258,16 @@ def cmd_sip(options, args):
         etg = loadETG(posixjoin('etg', base + '.py'))
         sipFiles = getSipFiles(etg.INCLUDES) + [opj(cfg.SIPGEN, base+'.sip')]
         if not newer_group(sipFiles, sbf) and os.path.exists(pycode):
-            continue
+            shutil.rmtree(tmpdir)
+            return
 
         pycode = '-X pycode'+base+':'+pycode
         sip = getSipCmd()
         cmd = '%s %s -c %s -b %s %s %s'  % \
             (sip, cfg.SIPOPTS, tmpdir, sbf, pycode, src_name)
+        itemTimer = CommandTimer('sip %s' % base)
         runcmd(cmd)
+        del itemTimer
 
         classesNeedingClassInfo = { 'sip_corewxTreeCtrl.cpp' : 'wxTreeCtrl', }
 
@@ -1270,6 +1332,16 @@ def cmd_sip(options, args):
         # Remove tmpdir and its contents
         shutil.rmtree(tmpdir)
 
+    # each module is run in its own temporary folder, so all but _core (which
+    # the others depend on) can run at the same time
+    modules = sorted(glob.glob(opj(cfg.SIPGEN, '_*.sip')))
+    core_file = opj(cfg.SIPGEN, '_core.sip')
+    if core_file in modules:
+        modules.remove(core_file)
+        runSip(core_file)
+
+    runParallel(runSip, modules, getNumJobs(options))
+
 
 
 def cmd_touch(options, args):
@@ -1824,6 +1896,7 @@ def cmd_clean_sphinx(options, args):
               opj(sphinxDir, '*.rst'),
               opj(sphinxDir, '*.inc'),
               opj(sphinxDir, '*.pkl'),
+              opj(sphinxDir, '*.pkl.lock'),
               opj(sphinxDir, '*.lst'),
               opj(sphinxDir, '_templates/gallery.html'),
               opj(sphinxDir, 'rest_substitutions/snippets/python/*.py'),
@@ -1875,6 +1948,7 @@ def cmd_cleanall(options, args):
     for wc in ['sip/cpp/*.h', 'sip/cpp/*.cpp', 'sip/cpp/*.sbf', 'sip/gen/*.sip']:
         files += glob.glob(wc)
     delFiles(files)
+    deleteIfExists(opj(phoenixDir(), 'build', 'etgcache'))
 
     cmd_clean_vagrant(options, args)
 
@@ -13,6 +13,10 @@ them from the Doxygen XML, and producing wrapper code from them.
 """
 
 import sys, os
+import hashlib
+import json
+import tempfile
+import xml.etree.ElementTree as et
 # Mac Python actually has a buildtools module, so we need
 # to make sure ours is picked up when we're not run from the
 # Phoenix root dir.
@@ -30,6 +34,78 @@ XMLSRC = cfg.DOXY_XML_DIR
 class DoxyXMLError(Exception):
     pass
 
+#---------------------------------------------------------------------------
+# Every ClassDef walks up its class hierarchy for the inheritance diagrams,
+# and that used to mean parsing the (often huge) XML file of each base class,
+# again and again for every class in every ETG script. The base class refs of
+# each XML file are now kept in memory, and also saved in a small file per XML
+# file in the cache folder, named with the hash of the XML content so other
+# ETG processes and later runs can use them without parsing anything. A new
+# Doxygen run changes the hash, so stale entries are never used.
+
+ETG_CACHE_DIR = os.environ.get('WXPYTHON_ETG_CACHE',
+                               os.path.join(phoenixRoot, 'build', 'etgcache'))
+_ETG_CACHE_VERSION = 1
+
+_baserefs = dict()
+
+def _xmlContentHash(pathname):
+    with open(pathname, 'rb') as f:
+        data = f.read()
+    return hashlib.sha1(data).hexdigest()
+
+
+def _readCache(key):
+    try:
+        with open(os.path.join(ETG_CACHE_DIR, key + '.json')) as f:
+            data = json.load(f)
+        if data['version'] == _ETG_CACHE_VERSION:
+            return data['value']
+    except (IOError, OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def _writeCache(key, value):
+    # Write to a temp file and rename it, so a parallel ETG process never
+    # sees a partly written file. The cache is only an optimization, so any
+    # error is ignored.
+    try:
+        if not os.path.exists(ETG_CACHE_DIR):
+            os.makedirs(ETG_CACHE_DIR)
+        fd, tmpname = tempfile.mkstemp(dir=ETG_CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(dict(version=_ETG_CACHE_VERSION, value=value), f)
+        try:
+            os.rename(tmpname, os.path.join(ETG_CACHE_DIR, key + '.json'))
+        except OSError:
+            # Windows won't rename over an existing file, which means another
+            # process has just saved the same thing.
+            os.remove(tmpname)
+    except (IOError, OSError):
+        pass
+
+
+def getBaseCompoundRefs(pathname):
+    """
+    Return the base classes listed in a Doxygen XML file, as a list of
+    (name, refid) tuples, where refid is None for classes Doxygen doesn't
+    know about. The result comes from the on-disk cache if the file has been
+    seen before, by this or another process.
+    """
+    refs = _baserefs.get(pathname)
+    if refs is None:
+        key = _xmlContentHash(pathname)
+        refs = _readCache(key)
+        if refs is None:
+            root = et.parse(pathname).getroot()
+            refs = [(node.text, node.get('refid'))
+                    for node in findDescendants(root, 'basecompoundref')]
+            _writeCache(key, refs)
+        refs = [tuple(ref) for ref in refs]
+        _baserefs[pathname] = refs
+    return refs
+
 #---------------------------------------------------------------------------
 
 _filesparsed = set()
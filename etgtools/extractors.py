@@ -703,29 +703,30 @@ class ClassDef(BaseDef):
 
 
     def findHierarchy(self, element, all_classes, specials, read):
-        from etgtools import XMLSRC
+        # When read is True, element is a (name, refid) tuple for a base
+        # class, as returned by getBaseCompoundRefs.
+        from etgtools import XMLSRC, getBaseCompoundRefs
 
         if not read:
             fullname = self.name
             specials = [fullname]
         else:
-            fullname = element.text
+            fullname, refid = element
 
         baselist = []
 
         if read:
-            refid = element.get('refid')
             if refid is None:
                 return all_classes, specials
 
             fname = os.path.join(XMLSRC, refid+'.xml')
-            root = et.parse(fname).getroot()
-            compounds = findDescendants(root, 'basecompoundref')
+            compounds = getBaseCompoundRefs(fname)
         else:
-            compounds = element.findall('basecompoundref')
+            compounds = [(node.text, node.get('refid'))
+                         for node in element.findall('basecompoundref')]
 
         for c in compounds:
-            baselist.append(c.text)
+            baselist.append(c[0])
 
         all_classes[fullname] = (fullname, baselist)
 
@@ -23,6 +23,8 @@ import json
 # Phoenix imports
 from .generators import textfile_open
 from sphinxtools.constants import SPHINXROOT
+from sphinxtools.utilities import acquireFileLock, releaseFileLock
+from sphinxtools.utilities import writeFileAtomically
 
 # ---------------------------------------------------------------------------
 
@@ -34,9 +36,13 @@ class ItemModuleMap(object):
     """
 
     # This is the Borg pattern, so all instances of this class actually share
-    # the same data attributes
+    # the same data attributes. The items added or removed since the data
+    # was read are kept in _changes (with None for a removed item), so that
+    # they can be merged with what other processes have written meanwhile.
     __shared_state = dict(_haveReadData=False,
-                          _items=dict())
+                          _items=dict(),
+                          _changes=dict(),
+                          _cleared=False)
 
     def __init__(self):
         self.__dict__ = self.__shared_state # Borg part 2
@@ -53,33 +59,64 @@ class ItemModuleMap(object):
 
     # Methods for reading/writing the data from/to persistent storage.
     def read(self):
-        if op.isfile(self.fileName):
-            with textfile_open(self.fileName, 'rt') as fid:
-                items = json.load(fid)
-                # TODO: catch JSON exception...
-                if items is None:
-                    items = dict()
-        else:
-            items = dict()
-
         self._items.clear()
-        self._items.update(items)
+        self._items.update(self._load())
+        self._applyChanges(self._items)
         self._haveReadData = True
 
 
     def flush(self):
-        if not self._haveReadData and not self._items:
+        """
+        Write the changes made in this process to the file. Several ETG
+        scripts may be run at the same time, so the file is locked while it is
+        updated, the changes are merged with what is in it now, and it is
+        replaced with a renamed temp file so readers never see it half written.
+        """
+        if not self._changes and not self._cleared:
             return
-        with textfile_open(self.fileName, 'wt') as fid:
+        lockFile = acquireFileLock(self.fileName)
+        try:
+            if self._cleared:
+                items = dict()
+            else:
+                items = self._load()
+            self._applyChanges(items)
             # Dump the data to a file in json, using a format that minimizes
             # excess whitespace.
-            json.dump(self._items, fid, sort_keys=True,
-                      indent=0, separators=(',', ':'))
+            writeFileAtomically(self.fileName,
+                                lambda fid: json.dump(items, fid, sort_keys=True,
+                                                      indent=0, separators=(',', ':')),
+                                'wt')
+        finally:
+            releaseFileLock(lockFile)
+        self._changes.clear()
+        self._cleared = False
+        self._items.clear()
+        self._items.update(items)
+        self._haveReadData = True
 
 
     def reset(self):
-        self._haveReadData = False,
+        self._haveReadData = False
         self._items.clear()
+        self._changes.clear()
+        self._cleared = False
+
+
+    def _load(self):
+        items = None
+        if op.isfile(self.fileName):
+            with textfile_open(self.fileName, 'rt') as fid:
+                items = json.load(fid)
+        return items or dict()
+
+
+    def _applyChanges(self, items):
+        for key, item in self._changes.items():
+            if item is None:
+                items.pop(key, None)
+            else:
+                items[key] = item
 
 
     def get_module(self, name):
@@ -99,6 +136,8 @@ class ItemModuleMap(object):
 
     def clear(self):
         self.items.clear()
+        self._changes.clear()
+        self._cleared = True
 
     def __len__(self):
         return len(self.items)
@@ -110,9 +149,11 @@ class ItemModuleMap(object):
 
     def __setitem__(self, key, item):
         self.items[key] = item
+        self._changes[key] = item
 
     def __delitem__(self, key):
         del self.items[key]
+        self._changes[key] = None
 
     def __iter__(self):
         return iter(self.items)
@@ -47,7 +47,7 @@ from sphinxtools.utilities import chopDescription, pythonizeType, wx2Sphinx
 from sphinxtools.utilities import pickleClassInfo, pickleFunctionInfo, isNumeric
 from sphinxtools.utilities import underscore2Capitals, countSpaces
 from sphinxtools.utilities import formatContributedSnippets
-from sphinxtools.utilities import PickleFile
+from sphinxtools.utilities import addPickleItem, flushPickleItems
 
 from sphinxtools.constants import VERSION, REMOVED_LINKS, SECTIONS
 from sphinxtools.constants import MAGIC_METHODS, MODULENAME_REPLACE
@@ -2895,6 +2895,7 @@ class SphinxGenerator(generators.DocsGeneratorBase):
         self.current_class = None
 
         self.generateModule(module)
+        flushPickleItems()
 
     # -----------------------------------------------------------------------
 
@@ -2959,8 +2960,7 @@ class SphinxGenerator(generators.DocsGeneratorBase):
 
         if module.isARealModule:
             filename = os.path.join(SPHINXROOT, self.current_module+'1moduleindex.pkl')
-            with PickleFile(filename) as pf:
-                pf.items[DOCSTRING_KEY] = module.docstring
+            addPickleItem(filename, DOCSTRING_KEY, module.docstring)
 
         for item in module:
             if item.ignored or item.docsIgnored:
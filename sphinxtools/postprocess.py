@@ -13,6 +13,10 @@ import os
 import re
 import glob
 import random
+import json
+import hashlib
+import tempfile
+import multiprocessing
 
 # Phoenix-specific imports
 from buildtools.config import Config, writeIfChanged, newer, textfile_open, runcmd
@@ -22,7 +26,7 @@ from . import templates
 from .utilities import wx2Sphinx, PickleFile
 from .constants import HTML_REPLACE, TODAY, SPHINXROOT, SECTIONS_EXCLUDE
 from .constants import CONSTANT_INSTANCES, WIDGETS_IMAGES_ROOT, SPHINX_IMAGES_ROOT
-from .constants import DOCSTRING_KEY
+from .constants import DOCSTRING_KEY, VERSION
 
 # ----------------------------------------------------------------------- #
 
@@ -658,89 +662,201 @@ def addJavaScript(text):
 
 # ----------------------------------------------------------------------- #
 
-def postProcess(folder, options):
+# The enum links added by postProcess, as a dict of the full enum name to
+# the link. Set in each worker process by _initPostProcess.
+_enumLinks = {}
 
-    fileNames = glob.glob(folder + "/*.html")
+# Matches all the places where an enum name may need a link, in one pass
+ENUM_RE = re.compile(r'\(<em>([^<>()]+)</em>\)')
 
-    enum_files = glob.glob(folder + '/*.enumeration.html')
+# Where postProcess remembers the files it has already done
+POSTPROCESS_INDEX = os.path.join(SPHINXROOT, 'build', 'postprocess.json')
 
-    enum_base = [os.path.split(os.path.splitext(enum)[0])[1] for enum in enum_files]
-    enum_base = [enum.replace('.enumeration', '') for enum in enum_base]
 
-    enum_dict = {}
-    # ENUMS
+def _initPostProcess(enumLinks):
+    global _enumLinks
+    _enumLinks = enumLinks
 
-    for indx, enum in enumerate(enum_base):
-        html_file = os.path.split(enum_files[indx])[1]
-        base = enum.split('.')[-1]
-        new = '(<a class="reference internal" href="%s" title="%s"><em>%s</em></a>)'%(html_file, base, base)
-        enum_dict['(<em>%s</em>)'%enum] = new
 
-    for files in fileNames:
+def _enumLink(match):
+    return _enumLinks.get(match.group(1), match.group(0))
 
-        if "genindex" in files or "modindex" in files:
-            continue
 
-        methods_done = properties_done = False
+def _textHash(text):
+    return hashlib.md5(text.encode('utf-8')).hexdigest()
 
-        fid = open(files, "rt")
-        orig_text = text = fid.read()
-        fid.close()
 
-        split = os.path.split(files)[1]
+def _settingsHash(enumLinks, options):
+    """
+    The hash of everything, apart from the text of a file, that changes what
+    postProcessFile makes of it: the enum links and the options it uses.
+    """
+    settings = dict(enumLinks=sorted(enumLinks.items()),
+                    release=bool(getattr(options, 'release', False)),
+                    version=VERSION)
+    return _textHash(json.dumps(settings, sort_keys=True))
 
-        if split == 'index.html':
-            text = changeWelcomeText(text, options)
-        else:
-            text = text.replace('class="headerimage"', 'class="headerimage-noshow"')
 
-        text = text.replace('&#8211; <p>', '&#8211; ')
-        text = text.replace('<p><img alt="overload"', '<br><p><img alt="overload"')
-        text = text.replace('<strong>Overloaded Implementations</strong>', '<em><strong>Overloaded Implementations</strong></em>')
-        text = text.replace('<strong>~~~</strong></p>', '<hr style="color:#0000FF;background-color:#0000FF;height:1px;border:none;width:50%;float:left" /></p><br>')
+def postProcessFile(files, options, done=None):
+    """
+    Post-process one HTML file made by sphinx, rewriting it if needed.
 
-        text = text.replace('<p><img alt="contributed"', '<br><p><img alt="contributed"')
+    Returns the hash of the text of the file once processed. If the file
+    already has the hash given in done, it is the output of an earlier run
+    that sphinx didn't rebuild, so it is left alone.
+    """
+    methods_done = properties_done = False
 
-        for item in HTML_REPLACE:
-            text = text.replace('<dl class="%s">'%item, '<br><hr />\n<dl class="%s">'%item)
+    fid = open(files, "rt")
+    orig_text = text = fid.read()
+    fid.close()
 
-        newtext = ''
-        splitted_text = text.splitlines()
-        len_split = len(splitted_text)
+    if done is not None and _textHash(orig_text) == done:
+        return done
 
-        for index, line in enumerate(splitted_text):
-            if '<div class="admonition-availability admonition' in line:
-                line = '<div class="admonition-availability admonition availability">'
+    split = os.path.split(files)[1]
 
-            if index < len_split - 1:
+    if split == 'index.html':
+        text = changeWelcomeText(text, options)
+    else:
+        text = text.replace('class="headerimage"', 'class="headerimage-noshow"')
 
-                if line.strip() == '<br><hr />' or line.strip() == '<dd><br><hr />':
-                    next_line = splitted_text[index+1]
-                    stripline = next_line.strip()
+    text = text.replace('&#8211; <p>', '&#8211; ')
+    text = text.replace('<p><img alt="overload"', '<br><p><img alt="overload"')
+    text = text.replace('<strong>Overloaded Implementations</strong>', '<em><strong>Overloaded Implementations</strong></em>')
+    text = text.replace('<strong>~~~</strong></p>', '<hr style="color:#0000FF;background-color:#0000FF;height:1px;border:none;width:50%;float:left" /></p><br>')
 
-                    if (stripline == '<dl class="staticmethod">' or stripline == '<dl class="method">' \
-                       or stripline == '<dl class="classmethod">') and not methods_done:
-                        line = '<br><h3>Methods<a class="headerlink" href="#methods" title="Permalink to this headline">¶</a></h3>' + '\n' + line
-                        methods_done = True
+    text = text.replace('<p><img alt="contributed"', '<br><p><img alt="contributed"')
 
-                    elif stripline == '<dl class="attribute">' and not properties_done:
-                        line = '<br><h3>Properties<a class="headerlink" href="#properties" title="Permalink to this headline">¶</a></h3>' + '\n' + line
-                        properties_done = True
+    for item in HTML_REPLACE:
+        text = text.replace('<dl class="%s">'%item, '<br><hr />\n<dl class="%s">'%item)
 
-            if '<em>  ' in line and '&#8211;' in line:
-                line = line.replace('<em>  ', '<em>')
+    newlines = []
+    splitted_text = text.splitlines()
+    len_split = len(splitted_text)
 
-            newtext += line + '\n'
+    for index, line in enumerate(splitted_text):
+        if '<div class="admonition-availability admonition' in line:
+            line = '<div class="admonition-availability admonition availability">'
 
-        for old, new in list(enum_dict.items()):
-            newtext = newtext.replace(old, new)
+        if index < len_split - 1:
 
-        newtext = addJavaScript(newtext)
+            if line.strip() == '<br><hr />' or line.strip() == '<dd><br><hr />':
+                next_line = splitted_text[index+1]
+                stripline = next_line.strip()
 
-        if orig_text != newtext:
-            fid = open(files, "wt")
-            fid.write(newtext)
-            fid.close()
+                if (stripline == '<dl class="staticmethod">' or stripline == '<dl class="method">' \
+                   or stripline == '<dl class="classmethod">') and not methods_done:
+                    line = '<br><h3>Methods<a class="headerlink" href="#methods" title="Permalink to this headline">¶</a></h3>' + '\n' + line
+                    methods_done = True
+
+                elif stripline == '<dl class="attribute">' and not properties_done:
+                    line = '<br><h3>Properties<a class="headerlink" href="#properties" title="Permalink to this headline">¶</a></h3>' + '\n' + line
+                    properties_done = True
+
+        if '<em>  ' in line and '&#8211;' in line:
+            line = line.replace('<em>  ', '<em>')
+
+        newlines.append(line)
+
+    newlines.append('')
+    newtext = '\n'.join(newlines)
+
+    if _enumLinks:
+        newtext = ENUM_RE.sub(_enumLink, newtext)
+
+    newtext = addJavaScript(newtext)
+
+    if orig_text != newtext:
+        fid = open(files, "wt")
+        fid.write(newtext)
+        fid.close()
+
+    return _textHash(newtext)
+
+
+def _postProcessWorker(args):
+    files, options, done = args
+    return files, postProcessFile(files, options, done)
+
+
+def _loadPostProcessIndex(folder, settings):
+    try:
+        with open(POSTPROCESS_INDEX) as fid:
+            index = json.load(fid)
+        if (index.get('folder') == os.path.abspath(folder) and
+                index.get('settings') == settings):
+            return index['files']
+    except (IOError, OSError, ValueError, KeyError, AttributeError):
+        pass
+    return {}
+
+
+def _savePostProcessIndex(folder, settings, done):
+    dirname = os.path.dirname(POSTPROCESS_INDEX)
+    if not os.path.exists(dirname):
+        os.makedirs(dirname)
+    fd, tmpname = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+    with os.fdopen(fd, 'w') as fid:
+        json.dump(dict(folder=os.path.abspath(folder), settings=settings,
+                       files=done), fid)
+    if os.path.exists(POSTPROCESS_INDEX):
+        os.remove(POSTPROCESS_INDEX)
+    os.rename(tmpname, POSTPROCESS_INDEX)
+
+
+def postProcess(folder, options):
+    """
+    Post-process the HTML files made by sphinx in folder.
+
+    The files are spread over the number of processes given by the --jobs
+    option. The hash of each file is saved once it has been processed, so
+    the files that sphinx didn't rebuild since the last run are skipped. If
+    the enum links or the options have changed since then, all the files are
+    processed again.
+    """
+    fileNames = glob.glob(folder + "/*.html")
+
+    enum_files = glob.glob(folder + '/*.enumeration.html')
+
+    enum_base = [os.path.split(os.path.splitext(enum)[0])[1] for enum in enum_files]
+    enum_base = [enum.replace('.enumeration', '') for enum in enum_base]
+
+    enum_dict = {}
+    # ENUMS
+
+    for indx, enum in enumerate(enum_base):
+        html_file = os.path.split(enum_files[indx])[1]
+        base = enum.split('.')[-1]
+        new = '(<a class="reference internal" href="%s" title="%s"><em>%s</em></a>)'%(html_file, base, base)
+        enum_dict[enum] = new
+
+    settings = _settingsHash(enum_dict, options)
+    done = _loadPostProcessIndex(folder, settings)
+
+    jobs = [(files, options, done.get(os.path.basename(files)))
+            for files in fileNames
+            if "genindex" not in files and "modindex" not in files]
+
+    try:
+        numJobs = max(int(getattr(options, 'jobs', '') or 1), 1)
+    except ValueError:
+        numJobs = 1
+    numJobs = min(numJobs, len(jobs))
+
+    if numJobs > 1:
+        pool = multiprocessing.Pool(numJobs, _initPostProcess, (enum_dict,))
+        try:
+            results = pool.map(_postProcessWorker, jobs, chunksize=16)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        _initPostProcess(enum_dict)
+        results = [_postProcessWorker(job) for job in jobs]
+
+    done = dict((os.path.basename(files), hashValue) for files, hashValue in results)
+    _savePostProcessIndex(folder, settings, done)
 
 
 # ----------------------------------------------------------------------- #
@@ -15,6 +15,14 @@ import os
 import codecs
 import shutil
 import re
+import atexit
+import tempfile
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
 
 if sys.version_info < (3,):
     import cPickle as pickle
@@ -618,16 +626,38 @@ def chopDescription(text):
 class PickleFile(object):
     """
     A class to help simplify loading and saving data to pickle files.
+
+    When used as a context manager the file is locked from the read to the
+    write, so that several processes (like ETG scripts run in parallel) can
+    update the same pickle file without losing each other's items.
     """
     def __init__(self, fileName):
         self.fileName = fileName
+        self.lockFile = None
 
     def __enter__(self):
-        self.read()
+        self.lock()
+        try:
+            self.read()
+        except:
+            self.unlock()
+            raise
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.write(self.items)
+        try:
+            self.write(self.items)
+        finally:
+            self.unlock()
+
+    def lock(self):
+        self.lockFile = acquireFileLock(self.fileName)
+
+    def unlock(self):
+        if self.lockFile is None:
+            return
+        releaseFileLock(self.lockFile)
+        self.lockFile = None
 
     def read(self):
         if os.path.isfile(self.fileName):
@@ -639,8 +669,104 @@ class PickleFile(object):
         return items
 
     def write(self, items):
-        with open(self.fileName, 'wb') as fid:
-            pickle.dump(items, fid)
+        writeFileAtomically(self.fileName, lambda fid: pickle.dump(items, fid))
+
+
+def acquireFileLock(fileName):
+    """
+    Locks fileName against the other processes that lock it, waiting for
+    them if needed. The lock is held on a separate ``.lock`` file, so that
+    fileName itself can be replaced while it is locked.
+
+    :returns: the open lock file, to be given to :func:`releaseFileLock`.
+    """
+    lockFile = open(fileName + '.lock', 'w')
+    if fcntl is not None:
+        fcntl.flock(lockFile.fileno(), fcntl.LOCK_EX)
+    else:
+        while True:
+            try:
+                msvcrt.locking(lockFile.fileno(), msvcrt.LK_LOCK, 1)
+                break
+            except IOError:
+                # LK_LOCK gives up after 10 seconds, keep on waiting
+                pass
+    return lockFile
+
+
+def releaseFileLock(lockFile):
+    """
+    Releases a lock taken with :func:`acquireFileLock`.
+    """
+    if fcntl is not None:
+        fcntl.flock(lockFile.fileno(), fcntl.LOCK_UN)
+    else:
+        lockFile.seek(0)
+        msvcrt.locking(lockFile.fileno(), msvcrt.LK_UNLCK, 1)
+    lockFile.close()
+
+
+def writeFileAtomically(fileName, writer, mode='wb'):
+    """
+    Writes fileName with ``writer(fid)``, to a temp file that is then renamed,
+    so that nobody reading the file at the same time can see it half written.
+    """
+    dirName, baseName = os.path.split(os.path.abspath(fileName))
+    fd, tmpName = tempfile.mkstemp(dir=dirName, prefix=baseName, suffix='.tmp')
+    try:
+        if 'b' in mode:
+            fid = os.fdopen(fd, mode)
+        else:
+            os.close(fd)
+            fid = codecs.open(tmpName, mode.replace('t', ''), encoding='utf-8')
+        with fid:
+            writer(fid)
+        if hasattr(os, 'replace'):
+            os.replace(tmpName, fileName)
+        else:
+            if os.path.exists(fileName):
+                os.remove(fileName)
+            os.rename(tmpName, fileName)
+    except:
+        if os.path.exists(tmpName):
+            os.remove(tmpName)
+        raise
+
+# ----------------------------------------------------------------------- #
+
+# The items given to addPickleItem, by pickle file name, which are not saved
+# in the pickle files yet.
+_pickleItems = {}
+
+def addPickleItem(fileName, key, value):
+    """
+    Adds an item to a dictionary saved in a pickle file.
+
+    The items are only kept in memory until :func:`flushPickleItems` is
+    called, so that each pickle file is read and written once per run rather
+    than once per item.
+
+    :param string `fileName`: the pickle file name;
+    :param `key`: the key of the item in the pickled dictionary;
+    :param `value`: the value of the item.
+    """
+    _pickleItems.setdefault(fileName, {})[key] = value
+
+
+def flushPickleItems():
+    """
+    Saves all the items given to :func:`addPickleItem` in their pickle files.
+
+    It is called at the end of each documentation run and when the process
+    exits, and it is safe to call while other processes do the same with the
+    same files.
+    """
+    while _pickleItems:
+        fileName, items = _pickleItems.popitem()
+        with PickleFile(fileName) as pf:
+            pf.items.update(items)
+
+atexit.register(flushPickleItems)
 
 # ----------------------------------------------------------------------- #
 
@@ -654,6 +780,8 @@ def pickleItem(description, current_module, name, kind):
     This step is necessary as the function names/description do not come out
     in alphabetical order from the ``etg`` process.
 
+    The item is saved by :func:`flushPickleItems`.
+
     :param string `description`: the function/class description.
     :param string `current_module`: the harmonized module name for this class
      or function (see ``MODULENAME_REPLACE`` in `sphinxtools/constants.py`).
@@ -666,8 +794,7 @@ def pickleItem(description, current_module, name, kind):
     else:
         pickle_file = os.path.join(SPHINXROOT, current_module + '1moduleindex.pkl')
 
-    with PickleFile(pickle_file) as pf:
-        pf.items[name] = description
+    addPickleItem(pickle_file, name, description)
 
 
 # ----------------------------------------------------------------------- #
@@ -677,6 +804,8 @@ def pickleClassInfo(class_name, element, short_description):
     Saves some information about a class in a pickle-compatible file., i.e. the
     list of methods in that class and its super-classes.
 
+    The item is saved by :func:`flushPickleItems`.
+
     :param string `class_name`: the name of the class we want to pickle;
     :param xml.etree.ElementTree.Element `element`: the XML element we want to examine;
     :param string `short_description`: the class short description (if any).
@@ -690,8 +819,7 @@ def pickleClassInfo(class_name, element, short_description):
         bases.append(wx2Sphinx(base)[1])
 
     pickle_file = os.path.join(SPHINXROOT, 'class_summary.pkl')
-    with PickleFile(pickle_file) as pf:
-        pf.items[class_name] = (method_list, bases, short_description)
+    addPickleItem(pickle_file, class_name, (method_list, bases, short_description))
 
 
 # ----------------------------------------------------------------------- #
@@ -699,11 +827,10 @@ def pickleClassInfo(class_name, element, short_description):
 def pickleFunctionInfo(fullname, short_description):
     """
     Saves the short description for each function, used for generating the
-    summary pages later.
+    summary pages later. The item is saved by :func:`flushPickleItems`.
     """
     pickle_file = os.path.join(SPHINXROOT, 'function_summary.pkl')
-    with PickleFile(pickle_file) as pf:
-        pf.items[fullname] = short_description
+    addPickleItem(pickle_file, fullname, short_description)
 
 
 # ----------------------------------------------------------------------- #
@@ -29,6 +29,111 @@ class lib_agw_aui_Tests(wtc.WidgetTestCase):
                           .Bottom())
         self._mgr.Update()
 
+    def test_lib_agw_auiPaneLookup(self):
+        self._mgr = aui.AuiManager()
+        self._mgr.SetManagedWindow(self.frame)
+
+        panels = []
+        for idx in range(20):
+            pane = wx.Panel(self.frame)
+            panels.append(pane)
+            self._mgr.AddPane(pane, aui.AuiPaneInfo().Name("pane%d" % idx).Left())
+        self._mgr.Update()
+
+        self.assertTrue(self._mgr.GetPane("pane5").window is panels[5])
+        self.assertTrue(self._mgr.GetPane(panels[7]).name == "pane7")
+        self.assertFalse(self._mgr.GetPane("nothere").IsOk())
+
+        # the lookups follow renames and detached panes
+        self._mgr.GetPane(panels[3]).Name("renamed")
+        self.assertTrue(self._mgr.GetPane("renamed").window is panels[3])
+        self.assertFalse(self._mgr.GetPane("pane3").IsOk())
+        self._mgr.DetachPane(panels[4])
+        self.assertFalse(self._mgr.GetPane(panels[4]).IsOk())
+        self.assertFalse(self._mgr.GetPane("pane4").IsOk())
+
+        # copies of the panes, made while dragging, leave the tables alone
+        index = self._mgr._pane_index
+        aui.framemanager.CopyDocksAndPanes2(self._mgr._docks, self._mgr._panes)
+        self.assertTrue(self._mgr.GetPane("pane5").window is panels[5])
+        self.assertTrue(self._mgr._pane_index is index)
+
+        # a pane put in place of another one is still found
+        swapped = aui.AuiPaneInfo().Name("swapped")
+        self._mgr._panes[0] = swapped
+        self.assertTrue(self._mgr.GetPane("swapped") is swapped)
+        self.assertFalse(self._mgr.GetPane("pane0").IsOk())
+
+    def test_lib_agw_auiHitTest(self):
+        self._mgr = aui.AuiManager()
+        self._mgr.SetManagedWindow(self.frame)
+
+        for idx in range(5):
+            self._mgr.AddPane(wx.Panel(self.frame), aui.AuiPaneInfo().Name("pane%d" % idx)
+                              .Caption("A pane").Top())
+        self._mgr.AddPane(wx.Panel(self.frame), aui.AuiPaneInfo().Name("center").CenterPane())
+        self._mgr.Update()
+        self.myYield()
+
+        # the HitTest index must give the same answers as a search through all
+        # the UI parts
+        def hitTest(x, y):
+            result = None
+            for item in self._mgr._uiparts:
+                if item.type == aui.AuiDockUIPart.typeDock:
+                    continue
+                if item.type in [aui.AuiDockUIPart.typePane, aui.AuiDockUIPart.typePaneBorder] and result:
+                    continue
+                if item.rect.Contains((x, y)):
+                    result = item
+            return result
+
+        w, h = self.frame.GetClientSize()
+        for x in range(-5, w + 5, 7):
+            for y in range(-5, h + 5, 7):
+                self.assertTrue(self._mgr.HitTest(x, y) is hitTest(x, y))
+
+    def test_lib_agw_auiBatchUpdate(self):
+        self._mgr = aui.AuiManager()
+        self._mgr.SetManagedWindow(self.frame)
+
+        panels = []
+        for idx in range(5):
+            pane = wx.Panel(self.frame)
+            panels.append(pane)
+            self._mgr.AddPane(pane, aui.AuiPaneInfo().Name("pane%d" % idx).Caption("A pane")
+                              .Left())
+        self._mgr.Update()
+        self.myYield()
+
+        layouts = []
+        layoutAll = self._mgr.LayoutAll
+        def LayoutAll(*args, **kw):
+            layouts.append(args)
+            return layoutAll(*args, **kw)
+        self._mgr.LayoutAll = LayoutAll
+
+        # the updates asked for during a batch make one layout at the end
+        self._mgr.BeginBatch()
+        for pane in panels[1:]:
+            self._mgr.ShowPane(pane, False)
+        self.myYield()
+        self.assertEqual(len(layouts), 0)
+        self._mgr.EndBatch()
+        self.myYield()
+        self.assertEqual(len(layouts), 1)
+        self.assertFalse(panels[1].IsShown())
+
+        # an update that doesn't change the layout doesn't redo it
+        self._mgr.GetPane(panels[0]).Caption("New caption")
+        self._mgr.Update()
+        self.myYield()
+        self.assertEqual(len(layouts), 1)
+
+        self._mgr.ShowPane(panels[1], True)
+        self.myYield()
+        self.assertEqual(len(layouts), 2)
+
     def tearDown(self):
         self._mgr.UnInit()
 
@@ -1,3 +1,6 @@
+import os
+import shutil
+import tempfile
 import unittest
 from unittests import wtc
 import wx
@@ -18,6 +21,69 @@ class lib_agw_thumbnailctrl_Tests(wtc.WidgetTestCase):
         TNC.EVT_THUMBNAILS_SEL_CHANGED
         TNC.EVT_THUMBNAILS_THUMB_CHANGED
 
+    def test_lib_agw_thumbnailctrlCache(self):
+        folder = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(folder, 'image.png')
+            with open(filename, 'wb') as fid:
+                fid.write(b'not really an image')
+
+            cache = TNC.ThumbnailCache(os.path.join(folder, 'cache'))
+            self.assertTrue(cache.Get(filename, (30, 20)) is None)
+
+            img = wx.Image(3, 2)
+            img.SetRGB(wx.Rect(0, 0, 3, 2), 10, 20, 30)
+            cache.Put(filename, (30, 20), TNC.ThumbnailToData(img, (300, 200)))
+
+            cached, originalsize, alpha = TNC.ThumbnailFromData(cache.Get(filename, (30, 20)))
+            self.assertEqual(cached.GetSize(), wx.Size(3, 2))
+            self.assertEqual(cached.GetRed(2, 1), 10)
+            self.assertEqual(originalsize, (300, 200))
+            self.assertFalse(alpha)
+
+            # another thumbnail size, or a modified file, is not in the cache
+            self.assertTrue(cache.Get(filename, (60, 40)) is None)
+            os.utime(filename, (0, 0))
+            self.assertTrue(cache.Get(filename, (30, 20)) is None)
+        finally:
+            shutil.rmtree(folder)
+
+    def test_lib_agw_thumbnailctrlLoader(self):
+        tnc = TNC.ThumbnailCtrl(self.frame, -1, imagehandler=TNC.NativeImageHandler)
+        loader = TNC.ThumbnailLoader()
+        tnc.SetThumbnailLoader(loader)
+        self.assertTrue(tnc.GetThumbnailLoader() is loader)
+
+        generation = loader.Load([], (30, 20), lambda *args: None)
+        self.assertTrue(loader.IsCurrent(generation))
+        loader.Cancel()
+        self.assertFalse(loader.IsCurrent(generation))
+
+    def test_lib_agw_thumbnailctrlVirtualMode(self):
+        class Loader(TNC.ThumbnailLoader):
+            def Load(self, jobs, thumbnailsize, callback):
+                self.jobs = list(jobs)
+                return 0
+
+        tnc = TNC.ThumbnailCtrl(self.frame, -1, imagehandler=TNC.NativeImageHandler)
+        tnc.SetSize((400, 300))
+        loader = Loader()
+        tnc.SetThumbnailLoader(loader)
+        tnc.EnableVirtualMode(True, maxImages=10)
+        self.assertTrue(tnc.GetVirtualMode())
+
+        thumbs = [TNC.Thumb(tnc, os.getcwd(), 'image%04d.png' % ii, 'image%04d.png' % ii)
+                  for ii in range(2000)]
+        tnc.ShowThumbs(thumbs, 'caption')
+        self.assertEqual(tnc.GetItemCount(), 2000)
+
+        # only the thumbnails near the view are loaded
+        self.assertTrue(0 < len(loader.jobs) < 2000)
+        self.assertTrue(loader.jobs[0][0] is tnc.GetItem(0))
+
+        border = tnc.GetThumbBorder()
+        self.assertEqual(tnc.GetItemIndex(border + 1, border + 1), 0)
+
 #---------------------------------------------------------------------------
 
 if __name__ == '__main__':
@@ -0,0 +1,94 @@
+import os
+import base64
+import shutil
+import tempfile
+import unittest
+from unittests import wtc
+import wx
+
+import wx.lib.embeddedimage as EI
+
+pngFile = os.path.join(os.path.dirname(__file__), 'smile.png')
+
+#---------------------------------------------------------------------------
+
+class lib_embeddedimage_Tests(wtc.WidgetTestCase):
+
+    def setUp(self):
+        super(lib_embeddedimage_Tests, self).setUp()
+        with open(pngFile, 'rb') as f:
+            self.raw = f.read()
+        self.b64 = base64.b64encode(self.raw)
+        self.budget = EI.GetCacheBudget()
+
+    def tearDown(self):
+        EI.SetCacheBudget(self.budget)
+        EI.ClearCache()
+        super(lib_embeddedimage_Tests, self).tearDown()
+
+    def test_lib_embeddedimageCtor(self):
+        img = EI.PyEmbeddedImage(self.b64)
+        self.assertEqual(img.GetData(), self.raw)
+        self.assertTrue(img.GetImage().IsOk())
+        self.assertTrue(img.GetBitmap().IsOk())
+        self.assertFalse(img.IsCacheEnabled())
+        self.assertEqual(EI.GetCacheSize(), 0)
+
+    def test_lib_embeddedimageCache(self):
+        img = EI.PyEmbeddedImage(self.b64, cache=True)
+        image = img.GetImage()
+        self.assertTrue(image.IsOk())
+        self.assertTrue(EI.GetCacheSize() > 0)
+
+        # the cached image is not handed out, changing a copy is harmless
+        image.Rescale(1, 1)
+        self.assertEqual(img.GetImage().GetSize(), wx.Image(pngFile).GetSize())
+        self.assertTrue(img.GetBitmap().IsOk())
+
+        # the base64 data is dropped, but can still be had
+        self.assertEqual(img.GetData(), self.raw)
+        self.assertEqual(img.data, self.b64)
+
+        img.Evict()
+        self.assertEqual(EI.GetCacheSize(), 0)
+
+    def test_lib_embeddedimageCacheBudget(self):
+        images = [EI.PyEmbeddedImage(self.b64, cache=True) for i in range(3)]
+        images[0].GetImage()
+        size = EI.GetCacheSize()
+
+        EI.SetCacheBudget(2 * size)
+        for img in images:
+            img.GetImage()
+        self.assertEqual(EI.GetCacheSize(), 2 * size)
+
+        EI.ClearCache()
+        self.assertEqual(EI.GetCacheSize(), 0)
+
+    def test_lib_embeddedimageBundle(self):
+        folder = tempfile.mkdtemp()
+        try:
+            fileName = os.path.join(folder, 'images.bundle')
+            EI.WriteImageBundle(fileName, [('smile', self.raw), ('again', self.raw)])
+
+            bundle = EI.ImageBundle(fileName)
+            self.assertEqual(bundle.index, ['smile', 'again'])
+            self.assertTrue('smile' in bundle)
+            self.assertFalse('frown' in bundle)
+            self.assertEqual(bundle['smile'].GetData(), self.raw)
+            self.assertTrue(bundle['again'].GetBitmap().IsOk())
+            with self.assertRaises(KeyError):
+                bundle['frown']
+            bundle.Close()
+
+            with open(fileName, 'wb') as f:
+                f.write(b'not a bundle')
+            with self.assertRaises(ValueError):
+                EI.ImageBundle(fileName)
+        finally:
+            shutil.rmtree(folder)
+
+#---------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,8 +4,13 @@ import wx
 
 import wx.lib.floatcanvas.FloatCanvas as fc
 import wx.lib.floatcanvas.NavCanvas as nc
+from wx.lib.floatcanvas.Utilities import FontCache
 
 import os
+import threading
+import time
+import numpy as np
+
 pngFile = os.path.join(os.path.dirname(__file__), 'toucan.png')
 
 #---------------------------------------------------------------------------
@@ -167,6 +172,216 @@ class lib_floatcanvas_floatcanvas_Tests(wtc.WidgetTestCase):
         fccanvas.AddObject(obj)
         fccanvas.Destroy()
 
+    def test_lib_floatcanvas_spatialindex(self):
+        fccanvas = fc.FloatCanvas(self.frame)
+        fccanvas.SetSpatialIndex(True)
+
+        near = fccanvas.AddRectangle((0, 0), (10, 10))
+        far = fccanvas.AddCircle((10000, 10000), 10)
+        fore = fccanvas.AddPoint((5, 5), InForeground=True)
+        self.assertEqual(len(fccanvas._DrawIndex), 2)
+        self.assertEqual(len(fccanvas._ForeDrawIndex), 1)
+
+        BB = fc.BBox.asBBox(((-5, -5), (20, 20)))
+        self.assertEqual(fccanvas._DrawIndex.Query(BB), [near])
+        far.Move((-10000, -10000))
+        self.assertEqual(fccanvas._DrawIndex.Query(BB), [near, far])
+
+        fore.PutInBackground()
+        self.assertEqual(len(fccanvas._ForeDrawIndex), 0)
+        self.assertEqual(fccanvas._DrawIndex.Query(BB), [near, far, fore])
+
+        fccanvas.RemoveObject(near)
+        self.assertEqual(fccanvas._DrawIndex.Query(BB), [far, fore])
+        fccanvas.ClearAll()
+        self.assertEqual(len(fccanvas._DrawIndex), 0)
+        fccanvas.Destroy()
+
+    def test_lib_floatcanvas_batchdraw(self):
+        fccanvas = fc.FloatCanvas(self.frame, size=(300, 300))
+
+        objs = []
+        for i in range(10):
+            objs.append(fccanvas.AddPoint((i, i), Diameter=3))
+            objs.append(fccanvas.AddCircle((i, -i), 2, FillColor="Red"))
+        for i in range(10):
+            objs.append(fccanvas.AddRectangle((i, 2*i), (1, 1), FillColor="Blue"))
+            objs.append(fccanvas.AddLine(((i, 0), (i, 10))))
+        for i in range(10):
+            objs.append(fccanvas.AddPoint((i, 5), Diameter=5, InForeground=True))
+        # the hit test bitmaps are only drawn for objects that are bound
+        for obj in objs[::2]:
+            obj.Bind(fc.EVT_FC_LEFT_DOWN, lambda obj: None)
+        fccanvas.ZoomToBB()
+
+        def render(batch):
+            fccanvas.BatchDraw = batch
+            fccanvas.Draw(Force=True)
+            bitmaps = (fccanvas._Buffer, fccanvas._ForegroundBuffer,
+                       fccanvas._HTBitmap, fccanvas._ForegroundHTBitmap)
+            self.assertTrue(None not in bitmaps)
+            return [bytes(bmp.ConvertToImage().GetData()) for bmp in bitmaps]
+
+        # batched drawing gives exactly the same pixels, hit tests included
+        self.assertEqual(render(False), render(True))
+        fccanvas.Destroy()
+
+    def test_lib_floatcanvas_tilecache(self):
+        fccanvas = fc.FloatCanvas(self.frame, size=(300, 300))
+        fccanvas.SetTileCache(TileSize=64, MaxTiles=100)
+
+        for i in range(20):
+            fccanvas.AddRectangle((i, i), (2, 2), FillColor="Red")
+        fccanvas.ZoomToBB()
+        fccanvas.Draw()
+        numTiles = len(fccanvas._TileCache)
+        self.assertTrue(numTiles > 0)
+
+        fccanvas.MoveImage((10, 5), 'Pixel')
+        self.assertTrue(len(fccanvas._TileCache) >= numTiles)
+
+        fccanvas.AddCircle((5, 5), 3)
+        self.assertEqual(len(fccanvas._TileCache), 0)
+        fccanvas.Draw(Force=True)
+        fccanvas.Destroy()
+
+    def test_lib_floatcanvas_geometryhittest(self):
+        fccanvas = fc.FloatCanvas(self.frame, size=(300, 300))
+        fccanvas.SetHitTestMethod("Geometry")
+        self.assertRaises(fc.FloatCanvasError, fccanvas.SetHitTestMethod, "Nothing")
+
+        rect = fccanvas.AddRectangle((0, 0), (10, 10), FillColor="Red")
+        line = fccanvas.AddLine(((20, 0), (30, 10)), LineWidth=3)
+        circle = fccanvas.AddCircle((5, 5), 4, InForeground=True)
+        for obj in (rect, line, circle):
+            obj.Bind(fc.EVT_FC_LEFT_DOWN, lambda obj: None)
+        fccanvas.ZoomToBB()
+        fccanvas.Draw()
+        self.assertTrue(fccanvas._HTBitmap is None)
+        self.assertTrue(fccanvas._ForegroundHTBitmap is None)
+
+        def hitAt(xy):
+            return fccanvas._GeometricHitObject(fccanvas.WorldToPixel(xy))
+        self.assertTrue(hitAt((5, 5)) is circle)
+        self.assertTrue(hitAt((1, 1)) is rect)
+        self.assertTrue(hitAt((25, 5)) is line)
+        self.assertTrue(hitAt((25, 9)) is None)
+
+        fccanvas.SetSpatialIndex()
+        self.assertTrue(hitAt((1, 1)) is rect)
+        self.assertTrue(hitAt((25, 5)) is line)
+        fccanvas.Destroy()
+
+    def test_lib_floatcanvas_threadeddraw(self):
+        fccanvas = fc.FloatCanvas(self.frame, size=(300, 300))
+        fccanvas.SetThreadedDraw()
+
+        for i in range(50):
+            fccanvas.AddRectangle((i, i), (2, 2), FillColor="Red")
+        text = fccanvas.AddScaledText("Text", (20, 20), 5)
+        fccanvas.AddCircle((5, 5), 3, InForeground=True)
+        fccanvas.ZoomToBB()
+
+        # the fonts are made on the GUI thread, before the render starts
+        fonts = {}
+        text._GetDrawFonts(fccanvas.ScaleWorldToPixel, fonts)
+        self.assertEqual(len(fonts), 1)
+        oldBuffer = fccanvas._Buffer
+        fccanvas.Draw()
+        fccanvas.MoveImage((10, 5), 'Pixel') # makes the first render stale
+
+        for i in range(50):
+            self.myYield()
+            if fccanvas._Buffer is not oldBuffer:
+                break
+            time.sleep(0.1)
+        self.assertTrue(fccanvas._Buffer is not oldBuffer)
+
+        fccanvas.SetThreadedDraw(False)
+        self.assertTrue(fccanvas._Renderer is None)
+        fccanvas.Draw(Force=True)
+        # turning it on again doesn't add another destroy handler
+        fccanvas.SetThreadedDraw()
+        fccanvas.SetThreadedDraw(False)
+        self.assertFalse(fccanvas.Unbind(wx.EVT_WINDOW_DESTROY,
+                                         handler=fccanvas._OnDestroyRenderer))
+        fccanvas.Destroy()
+
+    def test_lib_floatcanvas_threadeddrawScaledBitmap(self):
+        fccanvas = fc.FloatCanvas(self.frame, size=(300, 300))
+        fccanvas.SetThreadedDraw()
+        fccanvas.AddRectangle((0, 0), (2, 2), FillColor="Red")
+        bmp = wx.Bitmap(wx.Image(20, 20))
+        fccanvas.AddScaledBitmap(bmp, (1, 1), 1)
+        fccanvas.ZoomToBB()
+
+        # the scaled bitmap is made when it is drawn, so the background is
+        # drawn on the GUI thread, right away
+        submitted = []
+        fccanvas._Renderer.Submit = submitted.append
+        fccanvas.Draw(Force=True)
+        self.assertEqual(submitted, [])
+        self.assertFalse(fccanvas._BackgroundDirty)
+        self.assertTrue(fc.Group([fc.ScaledBitmap(bmp, (1, 1), 1)]).Threadable is False)
+        fccanvas.SetThreadedDraw(False)
+        fccanvas.Destroy()
+
+    def test_lib_floatcanvas_levelofdetail(self):
+        x = np.linspace(0, 1000, 10000)
+        points = np.column_stack((x, np.sin(x / 10) * 100))
+
+        def scaleWorldToPixel(lengths):
+            return (np.asarray(lengths, float) * (0.1, -0.1)).astype('i')
+
+        for cls in (fc.Line, fc.Polygon, fc.PointSet):
+            obj = cls(points)
+            lod = obj._LODPoints(scaleWorldToPixel)
+            self.assertTrue(3 <= len(lod) < len(points))
+            self.assertTrue(obj._LODPoints(scaleWorldToPixel) is lod)
+            obj.Move((1, 1))
+            self.assertTrue(obj._LODPoints(scaleWorldToPixel) is not lod)
+
+        line = fc.Line(points)
+        lod = line._LODPoints(scaleWorldToPixel)
+        self.assertTrue((lod[0] == points[0]).all())
+        self.assertTrue((lod[-1] == points[-1]).all())
+        line.LODMinPoints = None
+        self.assertTrue(line._LODPoints(scaleWorldToPixel) is line.Points)
+
+    def test_lib_floatcanvas_fontcache(self):
+        cache = FontCache.FontCache(MaxFonts=3)
+        args = (wx.FONTFAMILY_SWISS, wx.FONTSTYLE_NORMAL,
+                wx.FONTWEIGHT_NORMAL, False, '')
+        font = cache.GetFont(10, *args)
+        self.assertTrue(cache.GetFont(10, *args) is font)
+        for size in (11, 12, 13):
+            cache.GetFont(size, *args)
+        self.assertEqual(len(cache), 3)
+        self.assertTrue((10,) + args not in cache)
+        self.assertEqual(cache.Memory, sum(cache.EstimateMemory(size) for size in (11, 12, 13)))
+
+        cache.MaxMemory = cache.EstimateMemory(100)
+        cache.GetFont(200, *args) # too big, but kept until the next one
+        self.assertEqual(len(cache), 1)
+        cache.GetFont(20, *args)
+        self.assertTrue((200,) + args not in cache)
+        cache.Clear()
+        self.assertEqual((len(cache), cache.Memory), (0, 0))
+
+        # fonts handed to a thread are used there, and only there
+        threadFont = wx.Font(30, *args)
+        threadFonts = {(30,) + args: threadFont}
+        found = []
+        def worker():
+            cache.SetThreadFonts(threadFonts)
+            found.append(cache.GetFont(30, *args))
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        self.assertTrue(found[0] is threadFont)
+        self.assertEqual(len(cache), 0)
+        self.assertTrue(cache.GetFont(30, *args) is not threadFont)
+
     def test_lib_floatcanvas_floatcanvasEvents(self):
 
         fc.EVT_FC_ENTER_WINDOW
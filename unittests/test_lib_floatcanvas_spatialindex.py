@@ -0,0 +1,72 @@
+import unittest
+from unittests import wtc
+import wx
+
+from wx.lib.floatcanvas.Utilities import BBox
+from wx.lib.floatcanvas.Utilities.SpatialIndex import GridIndex
+
+#---------------------------------------------------------------------------
+
+class _Thing(object):
+    def __init__(self, BB):
+        self.BoundingBox = BBox.asBBox(BB)
+
+
+class lib_floatcanvas_spatialindex_Tests(wtc.WidgetTestCase):
+
+    def setUp(self):
+        super(lib_floatcanvas_spatialindex_Tests, self).setUp()
+        self.small = _Thing(((1, 1), (2, 2)))
+        self.big = _Thing(((-50, -50), (50, 50)))
+        self.far = _Thing(((1000, 1000), (1001, 1001)))
+        self.point = _Thing(((5, 5), (5, 5)))
+
+    def test_lib_floatcanvas_spatialindexQuery(self):
+        index = GridIndex(CellSize=1.0)
+        for obj in (self.small, self.big, self.far, self.point):
+            index.Insert(obj)
+        result = index.Query(BBox.asBBox(((0, 0), (10, 10))))
+        self.assertEqual(result, [self.small, self.big, self.point])
+
+    def test_lib_floatcanvas_spatialindexAutoCellSize(self):
+        index = GridIndex()
+        for obj in (self.small, self.big, self.far, self.point):
+            index.Insert(obj)
+        result = index.Query(BBox.asBBox(((999, 999), (1002, 1002))))
+        self.assertEqual(result, [self.far])
+        self.assertTrue(index.CellSize is not None)
+
+    def test_lib_floatcanvas_spatialindexRemove(self):
+        index = GridIndex(CellSize=1.0)
+        index.Insert(self.small)
+        index.Insert(self.point)
+        index.Remove(self.small)
+        self.assertEqual(len(index), 1)
+        self.assertFalse(self.small in index)
+        result = index.Query(BBox.asBBox(((0, 0), (10, 10))))
+        self.assertEqual(result, [self.point])
+
+    def test_lib_floatcanvas_spatialindexUpdate(self):
+        index = GridIndex(CellSize=1.0)
+        index.Insert(self.small)
+        index.Insert(self.point)
+        self.small.BoundingBox = BBox.asBBox(((500, 500), (501, 501)))
+        index.Update(self.small)
+        result = index.Query(BBox.asBBox(((0, 0), (10, 10))))
+        self.assertEqual(result, [self.point])
+        result = index.Query(BBox.asBBox(((400, 400), (600, 600))))
+        self.assertEqual(result, [self.small])
+
+    def test_lib_floatcanvas_spatialindexUnbounded(self):
+        index = GridIndex(CellSize=1.0)
+        inf = _Thing(BBox.InfBBox())
+        null = _Thing(BBox.NullBBox())
+        index.Insert(inf)
+        index.Insert(null)
+        result = index.Query(BBox.asBBox(((0, 0), (10, 10))))
+        self.assertEqual(result, [inf])
+
+#---------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,7 @@ from unittests import wtc
 import wx
 
 import wx.lib.plot as wxplot
+import numpy as np
 
 #---------------------------------------------------------------------------
 
@@ -13,8 +14,101 @@ class lib_plot_PlotCanvas_Tests(wtc.WidgetTestCase):
         """ Ctor? """
         p = wxplot.PlotCanvas(self.frame)
 
+    def test_lib_plot_decimatedDraw(self):
+        p = wxplot.PlotCanvas(self.frame)
+        x = np.linspace(0, 100, 100000)
+        y = np.sin(x) + np.random.random_sample(len(x))
+        line = wxplot.PolyLine(np.column_stack((x, y)), decimate=True)
+        p.Draw(wxplot.PlotGraphics([line]))
+        self.assertTrue(line._canDecimate())
+        self.assertEqual(len(line._envelopes), 1)
+        p.Draw(wxplot.PlotGraphics([line]), xAxis=(10.0, 20.0))
+        self.assertEqual(len(line._envelopes), 2)
+
+        line.points = np.column_stack((x[::-1], y))
+        self.assertFalse(line._canDecimate())
+        p.Draw(wxplot.PlotGraphics([line]))
+
+    def test_lib_plot_redrawData(self):
+        p = wxplot.PlotCanvas(self.frame)
+        line = wxplot.PolyLine([(0, 0), (1, 1)])
+        p.Draw(wxplot.PlotGraphics([line]))
+        xAxis = p.xCurrentRange
+
+        # still inside the axes: they stay as they are
+        line.append((0.5, 0.5))
+        p.RedrawData()
+        self.assertTrue(np.array_equal(p.xCurrentRange, xAxis))
+
+        # outside of the x axis: it is worked out again
+        line.extend([(5, 0.5), (6, 0.2)])
+        p.RedrawData()
+        self.assertTrue(p.xCurrentRange[1] >= 6)
+
 
 class lib_plot_Tests(wtc.WidgetTestCase):
+    def test_lib_plot_envelopeIndices(self):
+        x = np.arange(12.0)
+        y = np.array([0, 5, -5, 1, 2, 3, 4, 9, 8, 7, 6, 0], float)
+        # 4 points per pixel column
+        idx = wxplot.PolyLine._envelopeIndices(x, y, 0, 2, 0.25, 0.0)
+        self.assertEqual(list(idx), [0, 1, 2, 3, 4, 7, 8, 11])
+
+    def test_lib_plot_extend(self):
+        line = wxplot.PolyLine(np.zeros((0, 2)), maxLen=10)
+        expected = np.zeros((0, 2))
+        for n in range(50):
+            points = np.random.random_sample((n % 7, 2))
+            line.extend(points)
+            expected = np.concatenate((expected, points))[-10:]
+            self.assertTrue(np.array_equal(line.points, expected))
+        line.append((2, 3))
+        self.assertEqual(len(line.points), 10)
+        self.assertEqual(list(line.points[-1]), [2, 3])
+
+        line.maxLen = 4
+        self.assertTrue(np.array_equal(line.points, expected[-3:].tolist()
+                                       + [[2, 3]]))
+
+    def test_lib_plot_pointIndex(self):
+        from wx.lib.plot.utils import PointIndex
+        x = np.sort(np.random.random_sample(2000))
+        for points in (np.column_stack((x, np.sin(x * 50))),
+                       np.random.random_sample((2000, 2)),
+                       np.round(np.random.random_sample((2000, 2)) * 5)):
+            index = PointIndex(points)
+            for pxy in np.random.random_sample((20, 2)) * 6 - 0.5:
+                d = np.sqrt(np.add.reduce((points - pxy) ** 2, 1))
+                self.assertEqual(index.closest(pxy)[0], np.argmin(d))
+
+    def test_lib_plot_pointIndexOffData(self):
+        import time
+        from wx.lib.plot.utils import PointIndex
+        clusters = np.random.random_sample((20000, 2)) * 0.01
+        clusters[::2] += 0.99
+        for points in (np.random.random_sample((2000, 2)) * 1e-3,
+                       np.random.random_sample((100000, 2)),
+                       clusters):
+            index = PointIndex(points)
+            for pxy in ((100, 100), (-50, 0.5), (0.5, 1e6), (1.001, 0.3),
+                        (0.5, 0.5), (0.2, 0.9)):
+                start = time.time()
+                closest = index.closest(pxy)
+                self.assertTrue(time.time() - start < 0.5)
+                d = np.sqrt(np.add.reduce((points - pxy) ** 2, 1))
+                self.assertEqual(closest[0], np.argmin(d))
+
+    def test_lib_plot_getClosestPoint(self):
+        line = wxplot.PolyLine(np.random.random_sample((5000, 2)))
+        line.scaleAndShift((400, -300), (10, 320))
+        for pxy in np.random.random_sample((10, 2)):
+            d = np.sqrt(np.add.reduce((line.points - pxy) ** 2, 1))
+            self.assertEqual(line.getClosestPoint(pxy, False)[0],
+                             np.argmin(d))
+            scaled = line.currentScale * pxy + line.currentShift
+            d = np.sqrt(np.add.reduce((line.scaled - scaled) ** 2, 1))
+            self.assertEqual(line.getClosestPoint(pxy)[0], np.argmin(d))
+
     def test_lib_plot_tempstyle_contextmanager(self):
         pass
 
@@ -148,6 +148,77 @@ class lib_pubsub_Except(wtc.PubsubTestCase):
             if topic not in ('testSendTopic', 'testSendTopic.subtopic')] )
 
 
+    def testSendAfterSubscriptionsChange(self):
+        heard = []
+        def listenRoot():
+            heard.append('root')
+        def listenMid():
+            heard.append('mid')
+        def listenLeaf():
+            heard.append('leaf')
+            # subscribing to an ancestor during the send: it gets the message
+            self.pub.subscribe(listenRoot, 'testSendPlan')
+
+        self.pub.subscribe(listenLeaf, 'testSendPlan.mid.leaf')
+        self.pub.sendMessage('testSendPlan.mid.leaf')
+        self.assertEqual(heard, ['leaf', 'root'])
+
+        del heard[:]
+        self.pub.subscribe(listenMid, 'testSendPlan.mid')
+        self.pub.sendMessage('testSendPlan.mid.leaf')
+        self.assertEqual(heard, ['leaf', 'mid', 'root'])
+
+        del heard[:]
+        self.pub.unsubscribe(listenRoot, 'testSendPlan')
+        self.pub.unsubscribe(listenLeaf, 'testSendPlan.mid.leaf')
+        self.pub.sendMessage('testSendPlan.mid.leaf')
+        self.assertEqual(heard, ['mid'])
+
+    def testSendMessageAsync(self):
+        import threading
+        scheduled = []
+        self.pub.setAsyncScheduler(scheduled.append)
+        heard = []
+        def listener(num, msgTopic=self.pub.AUTO_TOPIC):
+            heard.append( (msgTopic.getName(), num) )
+        self.pub.subscribe(listener, 'testAsync')
+        self.pub.subscribe(listener, 'testAsync.progress')
+        self.pub.setAsyncCoalesce('testAsync.progress')
+
+        def worker():
+            for num in range(100):
+                self.pub.sendMessageAsync('testAsync', num=num)
+                self.pub.sendMessageAsync('testAsync.progress', num=num)
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        # one call scheduled for the whole batch, nothing sent yet
+        self.assertEqual(len(scheduled), 1)
+        self.assertEqual(heard, [])
+        # one message of the coalesced topic is queued however many are sent
+        self.assertEqual(self.pub.getNumQueuedMessages(), 101)
+
+        scheduled.pop()()
+        self.assertEqual(self.pub.getNumQueuedMessages(), 0)
+        self.assertEqual([num for name, num in heard if name == 'testAsync'],
+                         list(range(100)))
+        # only the latest progress, which is also heard by the parent topic
+        self.assertEqual([num for name, num in heard
+                          if name == 'testAsync.progress'], [99, 99])
+
+        # messages left over are scheduled again
+        for num in range(5):
+            self.pub.sendMessageAsync('testAsync', num=num)
+        del heard[:]
+        self.assertEqual(self.pub.sendQueuedMessages(maxMessages=3), 3)
+        self.assertEqual(len(scheduled), 2)
+        self.assertEqual(self.pub.sendQueuedMessages(), 2)
+        self.assertEqual([num for name, num in heard], list(range(5)))
+
+        self.pub.setAsyncCoalesce('testAsync.progress', False)
+        self.pub.setAsyncScheduler(lambda func: None)
+
     def testAcceptAllArgs(self):
         def listen(arg1=None):
             pass
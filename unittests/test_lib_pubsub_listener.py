@@ -308,6 +308,28 @@ class lib_pubsub_ArgsInfo(wtc.PubsubTestCase):
             self.assertEqual(str(exc), msg)
 
 
+    def test9_getArgsCached(self):
+        class Foo:
+            def __call__(self, arg1):
+                pass
+            def meth(self, arg1, arg2=None):
+                pass
+        foo1, foo2 = Foo(), Foo()
+
+        # same function, so same args info; the instance isn't kept
+        self.assertTrue(getArgs(foo1.meth) is getArgs(foo2.meth))
+        self.assertTrue(getArgs(foo1) is getArgs(foo2))
+        self.assertFalse(getArgs(foo1) is getArgs(foo1.meth))
+        self.assertEqual(getArgs(foo2.meth).getRequiredArgs(), ('arg1',))
+        self.assertEqual(getArgs(Foo.meth).getRequiredArgs(), ('self', 'arg1'))
+
+        validator = ListenerValidator(['arg1'], ['arg2'])
+        validator.validate(foo1.meth)
+        validator.validate(foo2.meth)
+        self.assertRaises(ListenerMismatchError,
+                          ListenerValidator(['arg1'], []).validate, foo2.meth)
+
+
     def test10_weakMethod(self):
         class Foo:
             def meth(self):
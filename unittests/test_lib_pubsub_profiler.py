@@ -0,0 +1,74 @@
+"""
+
+:copyright: Copyright 2006-2009 by Oliver Schoenborn, all rights reserved.
+:license: BSD, see LICENSE.txt for details.
+
+
+"""
+
+import unittest
+from unittests import wtc
+
+from six import StringIO
+
+
+#---------------------------------------------------------------------------
+
+
+class lib_pubsub_Profiler(wtc.PubsubTestCase):
+
+    def tearDown(self):
+        self.pub.setProfilingFlags(enabled=False, slowThreshold=False,
+                                   slowListenerHandler=False)
+        self.pub.getProfiler().reset()
+        super(lib_pubsub_Profiler, self).tearDown()
+
+    def testDisabled(self):
+        def listener():
+            pass
+        self.pub.subscribe(listener, 'testProfiler')
+        self.pub.sendMessage('testProfiler')
+        self.assertEqual(self.pub.getProfilingFlags()['enabled'], False)
+        self.assertEqual(self.pub.getProfiler().getStats(),
+                         dict(topics={}, listeners={}))
+
+    def testStats(self):
+        import time
+        slow = []
+        def onSlow(listener, topicObj, seconds):
+            slow.append( (listener.typeName(), topicObj.getName()) )
+        def fast():
+            pass
+        def sleepy():
+            time.sleep(0.02)
+
+        self.pub.subscribe(fast, 'testProfiler')
+        self.pub.subscribe(sleepy, 'testProfiler.sub')
+        self.pub.setProfilingFlags(enabled=True, slowThreshold=0.01,
+                                   slowListenerHandler=onSlow)
+        self.pub.sendMessage('testProfiler')
+        self.pub.sendMessage('testProfiler.sub')
+
+        profiler = self.pub.getProfiler()
+        self.assertEqual(profiler.getTopicCounts(),
+                         {'testProfiler': 1, 'testProfiler.sub': 1})
+        listeners = dict( (name.split('_')[0], stats) for name, stats in
+                          profiler.getListenerStats().items() )
+        self.assertEqual(listeners['fast']['calls'], 2)
+        self.assertEqual(listeners['sleepy']['calls'], 1)
+        self.assertTrue(listeners['sleepy']['maxTime'] >= 0.01)
+        self.assertEqual(slow, [('sleepy', 'testProfiler.sub')])
+
+        output = StringIO()
+        profiler.exportCSV(output)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(lines[0], 'kind,name,count,totalTime,maxTime')
+        self.assertEqual(len(lines), 5)
+        self.assertTrue(lines[3].startswith('listener,sleepy_'))
+
+
+#---------------------------------------------------------------------------
+
+
+if __name__ == '__main__':
+    unittest.main()
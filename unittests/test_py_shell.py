@@ -0,0 +1,71 @@
+import os
+import sys
+import unittest
+from unittests import wtc
+import wx
+import wx.py.shell as shell
+
+#---------------------------------------------------------------------------
+
+class py_shell_Tests(wtc.WidgetTestCase):
+
+    def test_py_shellFixLineEndings(self):
+        s = shell.Shell(self.frame)
+        text = s.fixLineEndings('a\r\nb\rc\nd\r\n\r\n')
+        self.assertEqual(text, os.linesep.join(['a', 'b', 'c', 'd', '', '']))
+
+    def test_py_shellBufferOutput(self):
+        s = shell.Shell(self.frame)
+        length = s.GetTextLength()
+        s.bufferOutput('abc')
+        s.bufferOutput('\ndef')
+        # nothing is displayed until the buffer is flushed
+        self.assertEqual(s.GetTextLength(), length)
+        s.flushOutput()
+        self.assertEqual(len(s.outputBuffer), 0)
+        self.assertEqual(s.GetTextRange(length, s.GetTextLength()),
+                         'abc' + os.linesep + 'def')
+
+    def test_py_shellPromptAfterOutput(self):
+        s = shell.Shell(self.frame)
+        s.bufferOutput('abc')
+        s.prompt()
+        # the prompt goes on a new line after the output
+        self.assertEqual(s.GetCurLine()[0], str(sys.ps1))
+        self.assertEqual(s.GetTextRange(s.promptPosStart, s.promptPosEnd),
+                         str(sys.ps1))
+
+    def test_py_shellTrimScrollback(self):
+        s = shell.Shell(self.frame)
+        s.maxScrollback = 50
+        # as if printed by a running command
+        s.waiting = True
+        s.write(''.join('line %d\n' % n for n in range(200)))
+        s.waiting = False
+        s.prompt()
+        self.assertTrue(s.GetLineCount() <= 50)
+        # the prompt positions are moved along with the text
+        self.assertEqual(s.GetTextRange(s.promptPosStart, s.promptPosEnd),
+                         str(sys.ps1))
+        self.assertEqual(s.promptPosEnd, s.GetTextLength())
+        self.assertEqual(s.GetLine(s.GetLineCount() - 2),
+                         'line 199' + os.linesep)
+
+    def test_py_shellTrimScrollbackKeepsCommand(self):
+        s = shell.Shell(self.frame)
+        s.maxScrollback = 5
+        command = os.linesep.join(['command'] * 10)
+        s.AddText(command)
+        s.trimScrollback()
+        # the command being edited is never deleted
+        self.assertEqual(s.GetTextRange(s.promptPosStart, s.promptPosEnd),
+                         str(sys.ps1))
+        self.assertEqual(s.GetTextRange(s.promptPosEnd, s.GetTextLength()),
+                         command)
+
+
+#---------------------------------------------------------------------------
+
+
+if __name__ == '__main__':
+    unittest.main()
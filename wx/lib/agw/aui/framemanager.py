@@ -521,6 +521,11 @@ class AuiPaneInfo(object):
     wasMaximized           = 2**35    # used internally
     needsRestore           = 2**36    # used internally
 
+    # the lookup tables of the AuiManager that holds the pane, marked as out
+    # of date when the name or the window of the pane is set, see
+    # AuiManager.GetPaneIndex
+    _lookup_index = None
+
 
     def __init__(self):
         """ Default class constructor. """
@@ -593,6 +598,47 @@ class AuiPaneInfo(object):
 
     dock_direction = property(dock_direction_get, dock_direction_set)
 
+
+    def name_get(self):
+        """ Getter for the `name`. """
+
+        return self._name
+
+
+    def name_set(self, value):
+        """
+        Setter for the `name`.
+
+        :param string `value`: the pane name.
+        """
+
+        self._name = value
+        if self._lookup_index is not None:
+            self._lookup_index["dirty"] = True
+
+    name = property(name_get, name_set)
+
+
+    def window_get(self):
+        """ Getter for the `window`. """
+
+        return self._window
+
+
+    def window_set(self, value):
+        """
+        Setter for the `window`.
+
+        :param `value`: a :class:`wx.Window` derived window, or ``None``.
+        """
+
+        self._window = value
+        if self._lookup_index is not None:
+            self._lookup_index["dirty"] = True
+
+    window = property(window_get, window_set)
+
+
     def IsOk(self):
         """
         Returns ``True`` if the :class:`AuiPaneInfo` structure is valid.
@@ -4149,6 +4195,19 @@ class AuiManager(wx.EvtHandler):
         self._docks = []
         self._uiparts = []
 
+        # lookup tables for GetPaneByName, GetPaneByWidget and HitTest, see
+        # GetPaneIndex and GetHitTestIndex
+        self._pane_index = None
+        self._hit_index = None
+        self._hit_index_key = None
+        self._hit_cell_size = 64
+
+        # state for Update, see BeginBatch and GetLayoutKey
+        self._batch_count = 0
+        self._update_pending = False
+        self._update_scheduled = False
+        self._layout_key = None
+
         self._guides = []
         self._notebooks = []
 
@@ -4248,6 +4307,40 @@ class AuiManager(wx.EvtHandler):
         return not (wx.GetKeyState(wx.WXK_CONTROL) or wx.GetKeyState(wx.WXK_ALT))
 
 
+    def GetPaneIndex(self):
+        """
+        Returns the lookup tables used by :meth:`GetPaneByName` and :meth:`GetPaneByWidget`,
+        as two dictionaries mapping the pane names and the pane windows to their position
+        in the list of panes. The tables are rebuilt whenever they are out of date: the
+        list of panes has been replaced or has changed length, or the name or the window
+        of one of its panes has been set.
+
+        :note: This is an internal method.
+        """
+
+        index = self._pane_index
+
+        if index is None or index["dirty"] or index["panes"] is not self._panes or \
+           index["length"] != len(self._panes):
+
+            names, windows = {}, {}
+            index = dict(panes=self._panes, length=len(self._panes),
+                         names=names, windows=windows, dirty=False)
+
+            for indx, p in enumerate(self._panes):
+                # the first pane wins, like a search through the list would
+                names.setdefault(p.name, indx)
+                try:
+                    windows.setdefault(p.window, indx)
+                except TypeError:
+                    pass
+                p._lookup_index = index
+
+            self._pane_index = index
+
+        return index["names"], index["windows"]
+
+
     def GetPaneByWidget(self, window):
         """
         This version of :meth:`GetPane` looks up a pane based on a 'pane window'.
@@ -4257,8 +4350,26 @@ class AuiManager(wx.EvtHandler):
         :see: :meth:`~AuiManager.GetPane`
         """
 
+        names, windows = self.GetPaneIndex()
+
+        try:
+            indx = windows.get(window)
+        except TypeError:
+            # can't be in the tables
+            for p in self._panes:
+                if p.window == window:
+                    return p
+            return NonePaneInfo
+
+        if indx is not None:
+            p = self._panes[indx]
+            if p.window == window:
+                return p
+
+        # the tables can miss a pane put in the list in place of another one
         for p in self._panes:
             if p.window == window:
+                self._pane_index = None
                 return p
 
         return NonePaneInfo
@@ -4273,8 +4384,18 @@ class AuiManager(wx.EvtHandler):
         :see: :meth:`GetPane`
         """
 
+        names, windows = self.GetPaneIndex()
+        indx = names.get(name)
+
+        if indx is not None:
+            p = self._panes[indx]
+            if p.name == name:
+                return p
+
+        # the tables can miss a pane put in the list in place of another one
         for p in self._panes:
             if p.name == name:
+                self._pane_index = None
                 return p
 
         return NonePaneInfo
@@ -4336,6 +4457,42 @@ class AuiManager(wx.EvtHandler):
             self.Update()
 
 
+    def GetHitTestIndex(self):
+        """
+        Returns the spatial index used by :meth:`HitTest`: a dictionary mapping the cells
+        of a grid laid over the managed window to the positions, in the list of UI parts,
+        of the parts whose rectangles cover that cell. The index is rebuilt by
+        :meth:`DoFrameLayout`, or here if the UI parts have changed since.
+
+        :note: This is an internal method.
+        """
+
+        if self._hit_index is None or self._hit_index[0] is not self._uiparts or \
+           self._hit_index_key != len(self._uiparts):
+
+            cells = {}
+            size = self._hit_cell_size
+
+            for indx, item in enumerate(self._uiparts):
+                # we are not interested in typeDock, because this space
+                # isn't used to draw anything, just for measurements
+                if item.type == AuiDockUIPart.typeDock:
+                    continue
+
+                rect = item.rect
+                if rect.width <= 0 or rect.height <= 0:
+                    continue
+
+                for cx in range(rect.x//size, (rect.x + rect.width - 1)//size + 1):
+                    for cy in range(rect.y//size, (rect.y + rect.height - 1)//size + 1):
+                        cells.setdefault((cx, cy), []).append(indx)
+
+            self._hit_index = (self._uiparts, cells)
+            self._hit_index_key = len(self._uiparts)
+
+        return self._hit_index[1]
+
+
     def HitTest(self, x, y):
         """
         This is an internal function which determines
@@ -4347,13 +4504,13 @@ class AuiManager(wx.EvtHandler):
 
         result = None
 
-        for item in self._uiparts:
-            # we are not interested in typeDock, because this space
-            # isn't used to draw anything, just for measurements
-            # besides, the entire dock area is covered with other
-            # rectangles, which we are interested in.
-            if item.type == AuiDockUIPart.typeDock:
-                continue
+        size = self._hit_cell_size
+        cells = self.GetHitTestIndex()
+
+        # only the parts covering the grid cell of the point can contain it,
+        # and they are listed in the same order as in self._uiparts
+        for indx in cells.get((x//size, y//size), []):
+            item = self._uiparts[indx]
 
             # if we already have a hit on a more specific item, we are not
             # interested in a pane hit.  If, however, we don't already have
@@ -6363,15 +6520,107 @@ class AuiManager(wx.EvtHandler):
         return self._dock_constraint_x, self._dock_constraint_y
 
 
+    def BeginBatch(self):
+        """
+        Starts a batch of changes to the panes. Until the matching :meth:`EndBatch`,
+        :meth:`Update` only takes note that an update is needed, so that any number of
+        calls to :meth:`Update` (by :meth:`ShowPane`, :meth:`ClosePane` and so on) only
+        cause one layout, when the batch ends.
+
+        Calls to :meth:`BeginBatch` can be nested.
+        """
+
+        self._batch_count += 1
+
+
+    def EndBatch(self):
+        """
+        Ends a batch of changes started with :meth:`BeginBatch`, calling :meth:`Update`
+        if it was called during the batch.
+        """
+
+        if self._batch_count > 0:
+            self._batch_count -= 1
+
+        if self._batch_count == 0 and self._update_pending:
+            self._update_pending = False
+            self.Update()
+
+
+    def GetBatchCount(self):
+        """ Returns the number of :meth:`BeginBatch` calls not matched by :meth:`EndBatch` yet. """
+
+        return self._batch_count
+
+
     def Update(self):
+        """
+        This method is called after any number of changes are made to any of the
+        managed panes. :meth:`Update` must be invoked after :meth:`AddPane`
+        or :meth:`InsertPane` are called in order to "realize" or "commit" the changes.
+
+        Inside a :meth:`BeginBatch` / :meth:`EndBatch` pair the update is delayed until
+        the end of the batch. On wxGTK the update is done later, with :func:`CallAfter`,
+        and several calls made before then only cause one update.
+        """
+
+        if self._batch_count:
+            self._update_pending = True
+            return
+
         if '__WXGTK__' in wx.PlatformInfo:
-            wx.CallAfter(self.DoUpdate)
+            self.ScheduleUpdate()
         else:
             self.DoUpdate()
 
+    def ScheduleUpdate(self):
+        """ Calls :meth:`DoUpdate` with :func:`CallAfter`, unless it is already planned. """
+
+        if not self._update_scheduled:
+            self._update_scheduled = True
+            wx.CallAfter(self.DoScheduledUpdate)
+
+    def DoScheduledUpdate(self):
+        """ Does the update planned by :meth:`ScheduleUpdate`. """
+
+        self._update_scheduled = False
+        self.DoUpdate()
+
     def DoUpdateEvt(self, evt):
         self.Unbind(wx.EVT_WINDOW_CREATE)
-        wx.CallAfter(self.DoUpdate)
+        self.ScheduleUpdate()
+
+    def GetLayoutKey(self):
+        """
+        Returns a value that holds everything :meth:`LayoutAll` looks at in the panes, the
+        docks and the manager. :meth:`DoUpdate` only rebuilds the layout if this value has
+        changed since the last layout; otherwise the panes that changed (caption, floating
+        frames, transparency and so on) are updated in the existing layout.
+
+        :note: This is an internal method.
+        """
+
+        panes = []
+        for p in self._panes:
+            panes.append((p.window, p.name, p.state, p.dock_direction, p.dock_layer,
+                          p.dock_row, p.dock_pos, p.dock_proportion, tuple(p.best_size),
+                          tuple(p.min_size), tuple(p.max_size), p.notebook_id,
+                          p.previousDockPos, p.previousDockSize,
+                          tuple([button.button_id for button in p.buttons])))
+
+        docks = []
+        for dock in self._docks:
+            docks.append((dock.dock_direction, dock.dock_layer, dock.dock_row, dock.size,
+                          dock.min_size, dock.resizable, dock.fixed, dock.toolbar))
+
+        metrics = []
+        for metric in [AUI_DOCKART_SASH_SIZE, AUI_DOCKART_CAPTION_SIZE, AUI_DOCKART_GRIPPER_SIZE,
+                       AUI_DOCKART_PANE_BORDER_SIZE, AUI_DOCKART_PANE_BUTTON_SIZE]:
+            metrics.append(self._art.GetMetric(metric))
+
+        return (panes, docks, metrics, self._art, self._agwFlags, self._has_maximized,
+                tuple(self._frame.GetClientSize()), self._dock_constraint_x,
+                self._dock_constraint_y, len(self._notebooks))
 
     def DoUpdate(self):
         """
@@ -6437,11 +6686,16 @@ class AuiManager(wx.EvtHandler):
         if not self._masterManager:
             self.UpdateNotebook()
 
-        # delete old sizer first
-        self._frame.SetSizer(None)
+        # only lay the panes out again if something that matters has changed
+        relayout = self._frame.GetSizer() is None or self.GetLayoutKey() != self._layout_key
 
-        # create a layout for all of the panes
-        sizer = self.LayoutAll(self._panes, self._docks, self._uiparts, False)
+        if relayout:
+            # delete old sizer first
+            self._frame.SetSizer(None)
+
+            # create a layout for all of the panes
+            sizer = self.LayoutAll(self._panes, self._docks, self._uiparts, False)
+            self._layout_key = self.GetLayoutKey()
 
         # hide or show panes as necessary,
         # and float panes as necessary
@@ -6543,8 +6797,9 @@ class AuiManager(wx.EvtHandler):
             old_pane_rects.append(r)
 
         # apply the new sizer
-        self._frame.SetSizer(sizer)
-        self._frame.SetAutoLayout(False)
+        if relayout:
+            self._frame.SetSizer(sizer)
+            self._frame.SetAutoLayout(False)
         self.DoFrameLayout()
 
         # now that the frame layout is done, we need to check
@@ -6925,6 +7180,10 @@ class AuiManager(wx.EvtHandler):
             if part.type == AuiDockUIPart.typePane:
                 part.pane.rect = part.rect
 
+        # the rectangles have changed, update the HitTest index
+        self._hit_index = None
+        self.GetHitTestIndex()
+
 
     def GetPanePart(self, wnd):
         """
@@ -8209,7 +8468,12 @@ class AuiManager(wx.EvtHandler):
 
         captionRect = wx.Rect()
 
-        for temp_part in self._uiparts:
+        # a caption that contains the button covers its grid cell
+        size = self._hit_cell_size
+        cells = self.GetHitTestIndex()
+
+        for indx in cells.get((part.rect.x//size, part.rect.y//size), []):
+            temp_part = self._uiparts[indx]
             if temp_part.pane == part.pane and \
                temp_part.type == AuiDockUIPart.typeCaption:
                 captionRect = temp_part.rect
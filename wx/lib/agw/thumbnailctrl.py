@@ -116,7 +116,16 @@ With :class:`ThumbnailCtrl` you can:
 - Show/hide a :class:`ComboBox` at the top of :class:`ThumbnailCtrl`: this combobox contains
   working directory information and it has history entries;
 - possibility to show tooltips on thumbnails, which display file information
-  (like file name, size, last modification date and thumbnail size).
+  (like file name, size, last modification date and thumbnail size);
+- Load the thumbnails in the background, those in view first, in a thread or in
+  a pool of processes (see :class:`ThumbnailLoader` and :class:`ProcessThumbnailLoader`),
+  and keep them in an on-disk cache between sessions (see :class:`ThumbnailCache`)::
+
+    cache = TC.ThumbnailCache()
+    thumbnail.SetThumbnailLoader(TC.ProcessThumbnailLoader(cache))
+
+- Show folders with a great many images in virtual mode, which only keeps the
+  images of the thumbnails near the view (see :meth:`ScrolledThumbnail.EnableVirtualMode`).
 
 
 :note: Using highlight thumbnails on mouse hovering may be slow on slower
@@ -165,16 +174,23 @@ import wx
 import os
 import time
 import zlib
+import struct
+import hashlib
+import tempfile
+import threading
+import multiprocessing
+from collections import deque, OrderedDict
 
 import six
-from math import pi
+from math import pi, floor, ceil
 
 from wx.lib.embeddedimage import PyEmbeddedImage
 
-if six.PY3:
-    import _thread as thread
-else:
-    import thread
+try:
+    import concurrent.futures as futures
+except ImportError:
+    # Python 2 without the "futures" backport
+    futures = None
 
 #----------------------------------------------------------------------
 # Get Default Icon/Data
@@ -435,6 +451,85 @@ def SortFiles(items, sorteditems, filenames):
 
     return newfiles
 
+def ThumbnailToData(img, originalsize):
+    """
+    Returns a thumbnail as a tuple of plain Python objects, which can be pickled
+    (to go from a worker process to the GUI) or stored in a :class:`ThumbnailCache`.
+
+    :param `img`: the thumbnail, an instance of :class:`wx.Image`;
+    :param `originalsize`: a tuple containing the original image width and height.
+    """
+
+    alpha = None
+    if img.HasAlpha():
+        alpha = bytes(img.GetAlpha())
+
+    return ((img.GetWidth(), img.GetHeight()), bytes(img.GetData()), alpha,
+            tuple(originalsize))
+
+
+def ThumbnailFromData(data):
+    """
+    Returns the thumbnail made by :func:`ThumbnailToData` or :func:`LoadPILThumbnailData`
+    as a tuple `(img, originalsize, alpha)`, like the image handlers `LoadThumbnail` method.
+
+    :param `data`: the thumbnail data.
+    """
+
+    size, rgb, alpha, originalsize = data
+
+    img = wx.Image(size[0], size[1])
+    img.SetData(rgb)
+    if alpha is not None:
+        img.SetAlpha(alpha)
+
+    return img, originalsize, alpha is not None
+
+
+def GetBrokenThumbnail():
+    """ Returns the thumbnail shown for a file that can not be loaded, as a tuple `(img, originalsize, alpha)`. """
+
+    img = file_broken.GetImage()
+    return img, (img.GetWidth(), img.GetHeight()), img.HasAlpha()
+
+
+def LoadPILThumbnailData(filename, thumbnailsize, cache=None):
+    """
+    Loads and rescales an image with PIL, returning it as with :func:`ThumbnailToData`.
+
+    This does not use wxPython at all, it is the function run in the worker processes
+    of :class:`ProcessThumbnailLoader`.
+
+    :param `filename`: a file containing an image;
+    :param `thumbnailsize`: the desired size of the thumbnail;
+    :param `cache`: if not ``None``, a :class:`ThumbnailCache` to look the thumbnail up
+     in first, and to store it in otherwise.
+    """
+
+    if cache is not None:
+        data = cache.Get(filename, thumbnailsize)
+        if data is not None:
+            return data
+
+    import PIL.Image as Image
+
+    pil = Image.open(filename)
+    originalsize = pil.size
+
+    pil.thumbnail(thumbnailsize)
+
+    alpha = None
+    if "A" in pil.getbands():
+        alpha = pil.convert("RGBA").tobytes()[3::4]
+
+    data = (pil.size, pil.convert("RGB").tobytes(), alpha, originalsize)
+
+    if cache is not None:
+        cache.Put(filename, thumbnailsize, data)
+
+    return data
+
+
 # ---------------------------------------------------------------------------- #
 # Class PILImageHandler, handles loading and highlighting images with PIL
 # ---------------------------------------------------------------------------- #
@@ -476,22 +571,7 @@ class PILImageHandler(object):
         :param `thumbnailsize`: the desired size of the thumbnail.
         """
 
-        import PIL.Image as Image
-
-        pil = Image.open(filename)
-        originalsize = pil.size
-
-        pil.thumbnail(thumbnailsize)
-        img = wx.Image(pil.size[0], pil.size[1])
-
-        img.SetData(pil.convert("RGB").tobytes())
-
-        alpha = False
-        if "A" in pil.getbands():
-            img.SetAlpha(pil.convert("RGBA").tobytes()[3::4])
-            alpha = True
-
-        return img, originalsize, alpha
+        return ThumbnailFromData(LoadPILThumbnailData(filename, thumbnailsize))
 
 
     def HighlightImage(self, img, factor):
@@ -558,6 +638,439 @@ class NativeImageHandler(object):
 
 
 
+# ---------------------------------------------------------------------------- #
+# Class ThumbnailCache, keeps the thumbnails on disk between sessions
+# ---------------------------------------------------------------------------- #
+
+class ThumbnailCache(object):
+    """
+    An on-disk cache of thumbnails, so that a folder which has been shown before
+    does not have to be decoded again.
+
+    A thumbnail is stored in a file whose name is a hash of the full path, the
+    modification time and the size of the image file, and of the thumbnail size:
+    an image which has been changed since gets a new entry, and the stale ones
+    can be thrown away with :meth:`~ThumbnailCache.Clear`. The thumbnails are
+    stored as zlib compressed pixels, so reading them back does not need wxPython
+    or PIL and can be done in a worker process.
+    """
+
+    _header = struct.Struct("<4s5I")
+    _magic = b"WXTN"
+
+    def __init__(self, folder=None):
+        """
+        Default class constructor.
+
+        :param `folder`: the directory holding the cached thumbnails, it is created
+         when the first thumbnail is stored. If defaulted to ``None``, a `wxthumbnails`
+         folder in the system temporary directory is used.
+        """
+
+        if folder is None:
+            folder = os.path.join(tempfile.gettempdir(), "wxthumbnails")
+
+        self._folder = folder
+
+
+    def GetFolder(self):
+        """ Returns the directory holding the cached thumbnails. """
+
+        return self._folder
+
+
+    def GetCacheFile(self, filename, thumbnailsize):
+        """
+        Returns the name of the file caching the thumbnail of an image.
+
+        :param `filename`: a file containing an image;
+        :param `thumbnailsize`: the size of the thumbnail.
+        """
+
+        stats = os.stat(filename)
+        key = "%s|%r|%d|%dx%d" % (os.path.abspath(filename), stats.st_mtime, stats.st_size,
+                                  thumbnailsize[0], thumbnailsize[1])
+        if not isinstance(key, bytes):
+            key = key.encode("utf-8")
+
+        return os.path.join(self._folder, hashlib.md5(key).hexdigest() + ".thumb")
+
+
+    def Get(self, filename, thumbnailsize):
+        """
+        Returns the cached thumbnail of an image, as with :func:`ThumbnailToData`,
+        or ``None`` if there is no up to date thumbnail in the cache.
+
+        :param `filename`: a file containing an image;
+        :param `thumbnailsize`: the size of the thumbnail.
+        """
+
+        try:
+            with open(self.GetCacheFile(filename, thumbnailsize), "rb") as fid:
+                stream = fid.read()
+
+            header = self._header
+            magic, width, height, origwidth, origheight, hasalpha = header.unpack(stream[:header.size])
+            pixels = zlib.decompress(stream[header.size:])
+
+        except (EnvironmentError, struct.error, zlib.error):
+            return None
+
+        npixels = width*height
+        if magic != self._magic or len(pixels) != npixels*(hasalpha and 4 or 3):
+            return None
+
+        alpha = (hasalpha and [pixels[3*npixels:]] or [None])[0]
+
+        return (width, height), pixels[:3*npixels], alpha, (origwidth, origheight)
+
+
+    def Put(self, filename, thumbnailsize, data):
+        """
+        Stores the thumbnail of an image. Errors are ignored, the thumbnail is
+        simply not cached.
+
+        :param `filename`: a file containing an image;
+        :param `thumbnailsize`: the size of the thumbnail;
+        :param `data`: the thumbnail, as returned by :func:`ThumbnailToData`.
+        """
+
+        size, rgb, alpha, originalsize = data
+        pixels = (alpha is None and [rgb] or [rgb + alpha])[0]
+        stream = self._header.pack(self._magic, size[0], size[1], originalsize[0],
+                                   originalsize[1], alpha is not None)
+
+        try:
+            cachefile = self.GetCacheFile(filename, thumbnailsize)
+
+            if not os.path.isdir(self._folder):
+                os.makedirs(self._folder)
+
+            # write in a temporary file first, so that a thumbnail being written
+            # is never seen by a loader in another process
+            fd, tmpfile = tempfile.mkstemp(suffix=".tmp", dir=self._folder)
+            with os.fdopen(fd, "wb") as fid:
+                fid.write(stream + zlib.compress(pixels))
+
+            try:
+                os.rename(tmpfile, cachefile)
+            except EnvironmentError:
+                # on Windows, someone else has cached it meanwhile
+                os.remove(tmpfile)
+
+        except EnvironmentError:
+            pass
+
+
+    def Clear(self):
+        """ Deletes all the cached thumbnails. """
+
+        if not os.path.isdir(self._folder):
+            return
+
+        for name in os.listdir(self._folder):
+            if os.path.splitext(name)[1] in (".thumb", ".tmp"):
+                try:
+                    os.remove(os.path.join(self._folder, name))
+                except EnvironmentError:
+                    pass
+
+
+# ---------------------------------------------------------------------------- #
+# Class ThumbnailLoader, loads the thumbnails in the background
+# ---------------------------------------------------------------------------- #
+
+class ThumbnailLoader(object):
+    """
+    Loads the thumbnails of a :class:`ScrolledThumbnail` in a background thread, with
+    the image handler of the :class:`ScrolledThumbnail`.
+
+    Every call to :meth:`~ThumbnailLoader.Load` starts a new job, which cancels the
+    thumbnails of the previous one still waiting to be loaded: each job has a
+    generation number, and loaded thumbnails are only handed back while their
+    generation is the current one.
+
+    This class can be derived to load the thumbnails some other way, see
+    :class:`ProcessThumbnailLoader`, and is plugged in with
+    :meth:`ScrolledThumbnail.SetThumbnailLoader() <ScrolledThumbnail.SetThumbnailLoader>`.
+    """
+
+    def __init__(self, cache=None):
+        """
+        Default class constructor.
+
+        :param `cache`: if not ``None``, a :class:`ThumbnailCache` used to store the
+         thumbnails loaded, and to look them up before loading them.
+        """
+
+        self._cache = cache
+        self._imageHandler = None
+        self._condition = threading.Condition()
+        self._jobs = deque()
+        self._generation = 0
+        self._thumbnailsize = (300, 240)
+        self._callback = None
+        self._thread = None
+
+
+    def SetImageHandler(self, imagehandler):
+        """
+        Sets the image handler used to load the thumbnails.
+
+        :param `imagehandler`: an instance of :class:`PILImageHandler` or
+         :class:`NativeImageHandler`.
+        """
+
+        self._imageHandler = imagehandler
+
+
+    def GetCache(self):
+        """ Returns the :class:`ThumbnailCache` used by the loader, or ``None``. """
+
+        return self._cache
+
+
+    def SetCache(self, cache):
+        """
+        Sets the :class:`ThumbnailCache` used by the loader.
+
+        :param `cache`: a :class:`ThumbnailCache`, or ``None`` to cache nothing.
+        """
+
+        self._cache = cache
+
+
+    def Load(self, jobs, thumbnailsize, callback):
+        """
+        Starts loading thumbnails in the background, in place of the ones still
+        waiting from the previous call. Returns the generation number of the job.
+
+        :param `jobs`: a sequence of `(key, filename)` tuples, in the order the
+         thumbnails should be loaded;
+        :param `thumbnailsize`: the desired size of the thumbnails;
+        :param `callback`: a function called in the GUI thread for every thumbnail
+         loaded, as ``callback(generation, key, (img, originalsize, alpha))``.
+        """
+
+        with self._condition:
+            self._generation += 1
+            self._jobs = deque(jobs)
+            self._thumbnailsize = thumbnailsize
+            self._callback = callback
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._Run, name="ThumbnailLoader")
+                self._thread.daemon = True
+                self._thread.start()
+
+            self._condition.notify()
+            return self._generation
+
+
+    def Prioritise(self, keys):
+        """
+        Moves the thumbnails of the current job with these keys to the front of the
+        queue, for instance because they have been scrolled into view.
+
+        :param `keys`: the keys of the thumbnails, as given to :meth:`~ThumbnailLoader.Load`.
+        """
+
+        with self._condition:
+            if not self._jobs:
+                return
+
+            wanted = dict((key, ii) for ii, key in enumerate(keys))
+            first = [job for job in self._jobs if job[0] in wanted]
+            if not first:
+                return
+
+            first.sort(key=lambda job: wanted[job[0]])
+            self._jobs = deque(first + [job for job in self._jobs if job[0] not in wanted])
+
+
+    def GetPendingCount(self):
+        """ Returns the number of thumbnails of the current job still waiting to be loaded. """
+
+        return len(self._jobs)
+
+
+    def Cancel(self):
+        """ Throws away the thumbnails waiting to be loaded, and the ones being loaded. """
+
+        with self._condition:
+            self._generation += 1
+            self._jobs = deque()
+
+
+    def IsCurrent(self, generation):
+        """
+        Returns ``True`` if the job with this generation number is still wanted.
+
+        :param `generation`: the number returned by :meth:`~ThumbnailLoader.Load`.
+        """
+
+        return generation == self._generation
+
+
+    def Stop(self):
+        """ Cancels the current job and lets the background thread finish. """
+
+        with self._condition:
+            self._generation += 1
+            self._jobs = deque()
+            self._thread = None
+            self._condition.notify_all()
+
+
+    def LoadThumbnail(self, filename, thumbnailsize):
+        """
+        Loads a thumbnail, from the cache if it is there. Called in the background
+        thread.
+
+        :param `filename`: a file containing an image;
+        :param `thumbnailsize`: the desired size of the thumbnail.
+        """
+
+        if self._cache is not None:
+            data = self._cache.Get(filename, thumbnailsize)
+            if data is not None:
+                return ThumbnailFromData(data)
+
+        imagehandler = self._imageHandler or NativeImageHandler()
+
+        try:
+            img, originalsize, alpha = imagehandler.LoadThumbnail(filename, thumbnailsize)
+        except Exception:
+            # a corrupt file, or a format the handler can not read
+            return GetBrokenThumbnail()
+
+        if self._cache is not None:
+            self._cache.Put(filename, thumbnailsize, ThumbnailToData(img, originalsize))
+
+        return img, originalsize, alpha
+
+
+    def _IsStopped(self):
+        """ Returns ``True`` if the calling background thread has been stopped. """
+
+        return self._thread is not threading.current_thread()
+
+
+    def _WaitForJob(self):
+        """
+        Waits until there is a thumbnail to load, and returns the generation, key,
+        filename, thumbnail size and callback of that thumbnail, or ``None`` if the
+        loader has been stopped.
+        """
+
+        with self._condition:
+            while not self._jobs and not self._IsStopped():
+                self._condition.wait()
+
+            if self._IsStopped():
+                return None
+
+            key, filename = self._jobs.popleft()
+            return self._generation, key, filename, self._thumbnailsize, self._callback
+
+
+    def _Run(self):
+        """ The background thread. """
+
+        while True:
+            job = self._WaitForJob()
+            if job is None:
+                return
+
+            generation, key, filename, thumbnailsize, callback = job
+            result = self.LoadThumbnail(filename, thumbnailsize)
+
+            if self.IsCurrent(generation):
+                wx.CallAfter(callback, generation, key, result)
+
+
+# ---------------------------------------------------------------------------- #
+# Class ProcessThumbnailLoader, loads the thumbnails in a pool of processes
+# ---------------------------------------------------------------------------- #
+
+class ProcessThumbnailLoader(ThumbnailLoader):
+    """
+    Loads the thumbnails in a pool of worker processes, so that decoding many
+    large images uses all the processors of the machine.
+
+    The images are decoded with PIL in the workers (see :func:`LoadPILThumbnailData`),
+    whatever the image handler of the :class:`ScrolledThumbnail`, and a :class:`ThumbnailCache`
+    is shared by all the workers. Where :mod:`concurrent.futures` is not available (Python 2
+    without the `futures` backport) this works like a :class:`ThumbnailLoader`.
+
+    :note: On platforms that spawn the worker processes (Windows, and macOS with
+     Python 3.8 and later) the main script of the application must be importable
+     without side effects, as usual with :mod:`multiprocessing`.
+    """
+
+    def __init__(self, cache=None, workers=None):
+        """
+        Default class constructor.
+
+        :param `cache`: if not ``None``, a :class:`ThumbnailCache` used to store the
+         thumbnails loaded, and to look them up before loading them;
+        :param `workers`: the number of worker processes. If defaulted to ``None``,
+         the number of processors of the machine.
+        """
+
+        ThumbnailLoader.__init__(self, cache)
+        self._workers = workers or multiprocessing.cpu_count()
+
+
+    def _Run(self):
+        """ The background thread, which feeds the worker processes. """
+
+        if futures is None:
+            return ThumbnailLoader._Run(self)
+
+        pool = futures.ProcessPoolExecutor(self._workers)
+        running = {}
+
+        try:
+            while True:
+                with self._condition:
+                    while not self._jobs and not running and not self._IsStopped():
+                        self._condition.wait()
+
+                    if self._IsStopped():
+                        return
+
+                    # only keep the workers busy, so that the jobs still in the
+                    # queue can be cancelled or prioritised
+                    while self._jobs and len(running) < 2*self._workers:
+                        key, filename = self._jobs.popleft()
+                        future = pool.submit(LoadPILThumbnailData, filename,
+                                             self._thumbnailsize, self._cache)
+                        running[future] = (self._generation, key, self._callback)
+
+                done, notdone = futures.wait(list(running), timeout=0.1,
+                                             return_when=futures.FIRST_COMPLETED)
+
+                for future in list(running):
+                    generation, key, callback = running[future]
+
+                    if not self.IsCurrent(generation):
+                        future.cancel()
+                        del running[future]
+
+                    elif future in done:
+                        del running[future]
+                        try:
+                            result = ThumbnailFromData(future.result())
+                        except Exception:
+                            result = GetBrokenThumbnail()
+
+                        wx.CallAfter(callback, generation, key, result)
+
+        finally:
+            pool.shutdown(wait=False)
+
+
 # ---------------------------------------------------------------------------- #
 # Class ThumbnailEvent
 # ---------------------------------------------------------------------------- #
@@ -612,8 +1125,8 @@ class Thumb(object):
         self._lastmod = lastmod
         self._parent = parent
         self._captionbreaks = []
-        self._bitmap = wx.Bitmap(1, 1)
-        self._image = wx.Image(1, 1)
+        self._bitmap = None
+        self._image = None
         self._rotation = 0
         self._alpha = None
 
@@ -632,6 +1145,9 @@ class Thumb(object):
     def GetImage(self):
         """ Returns the thumbnail image. """
 
+        if self._image is None:
+            return wx.Image(1, 1)
+
         return self._image
 
 
@@ -669,7 +1185,7 @@ class Thumb(object):
         """
 
         self._filename = filename
-        self._bitmap = wx.Bitmap(1, 1)
+        self._bitmap = None
 
 
     def GetId(self):
@@ -713,17 +1229,10 @@ class Thumb(object):
         """
 
         if self.GetRotation() % (2*pi) < 1e-6:
-            if not self._bitmap.IsOk():
-                if not hasattr(self, "_threadedimage"):
-                    img = GetMondrianImage()
-                else:
-                    img = self._threadedimage
-
+            if not hasattr(self, "_threadedimage"):
+                img = GetMondrianImage()
             else:
-                if not hasattr(self, "_threadedimage"):
-                    img = GetMondrianImage()
-                else:
-                    img = self._threadedimage
+                img = self._threadedimage
 
         else:
 
@@ -755,6 +1264,19 @@ class Thumb(object):
         return bmp
 
 
+    def ReleaseImage(self):
+        """
+        Throws away the loaded image, keeping the information about it (like its
+        original size). Used by :class:`ScrolledThumbnail` in virtual mode.
+        """
+
+        if hasattr(self, "_threadedimage"):
+            del self._threadedimage
+
+        self._bitmap = None
+        self._image = None
+
+
     def GetOriginalImage(self):
         """ Returns the bitmap associated to a thumbnail, as a file name. """
 
@@ -965,7 +1487,8 @@ class ThumbnailCtrl(wx.Panel):
                    "GetShowDir", "SetSelection", "GetSelection", "SetZoomFactor",
                    "GetZoomFactor", "SetCaptionFont", "GetCaptionFont", "GetItemIndex",
                    "InsertItem", "RemoveItemAt", "IsSelected", "Rotate", "ZoomIn", "ZoomOut",
-                   "EnableToolTips", "GetThumbInfo", "GetOriginalImage", "SetDropShadow", "GetDropShadow"]
+                   "EnableToolTips", "GetThumbInfo", "GetOriginalImage", "SetDropShadow", "GetDropShadow",
+                   "SetThumbnailLoader", "GetThumbnailLoader", "EnableVirtualMode", "GetVirtualMode"]
 
         for method in methods:
             setattr(self, method, getattr(self._scrolled, method))
@@ -1105,6 +1628,16 @@ class ScrolledThumbnail(wx.ScrolledWindow):
         self._tOutline = thumboutline
         self._filter = thumbfilter
         self._imageHandler = imagehandler()
+        self._loader = ThumbnailLoader()
+        self._loader.SetImageHandler(self._imageHandler)
+        self._visibleThumbs = set()
+        self._refreshPending = False
+        self._virtual = False
+        self._maxImages = 200
+        self._loadedThumbs = OrderedDict()
+        self._requested = set()
+        self._nearCount = 0
+        self._tCaptionLines = 1
         self._selected = -1
         self._pointed = -1
         self._labelcontrol = None
@@ -1155,6 +1688,7 @@ class ScrolledThumbnail(wx.ScrolledWindow):
         self.Bind(wx.EVT_SIZE, self.OnResize)
         self.Bind(wx.EVT_ERASE_BACKGROUND, lambda x: None)
         self.Bind(wx.EVT_PAINT, self.OnPaint)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.OnDestroy)
 
 
     def GetSelectedItem(self, index):
@@ -1459,6 +1993,9 @@ class ScrolledThumbnail(wx.ScrolledWindow):
     def Clear(self):
         """ Clears :class:`ThumbnailCtrl`. """
 
+        self._loader.Cancel()
+        self._loadedThumbs.clear()
+        self._requested.clear()
         self._items = []
         self._selected = -1
         self._selectedarray = []
@@ -1466,6 +2003,62 @@ class ScrolledThumbnail(wx.ScrolledWindow):
         self.Refresh()
 
 
+    def SetThumbnailLoader(self, loader):
+        """
+        Sets the object loading the thumbnails in the background.
+
+        :param `loader`: an instance of :class:`ThumbnailLoader` or of a class derived
+         from it, like :class:`ProcessThumbnailLoader`.
+        """
+
+        self._loader.Stop()
+        self._loader = loader
+        self._loader.SetImageHandler(self._imageHandler)
+
+        if self._items:
+            self.LoadThumbnails()
+
+
+    def GetThumbnailLoader(self):
+        """ Returns the object loading the thumbnails in the background, an instance of :class:`ThumbnailLoader`. """
+
+        return self._loader
+
+
+    def EnableVirtualMode(self, enable=True, maxImages=200):
+        """
+        Enables/disables the virtual mode, meant for folders with a great many images.
+
+        In virtual mode only the thumbnails in view and a few rows around them are
+        loaded, and at most `maxImages` loaded images are kept: the ones which have
+        not been in view for the longest time are thrown away, and loaded again when
+        they are scrolled back into view. The other thumbnails only keep the file
+        information. Every caption takes a single line of text, so that the layout
+        can be computed from the number of thumbnails without looking at each of them.
+
+        :param `enable`: ``True`` to enable the virtual mode, ``False`` to disable it;
+        :param `maxImages`: the maximum number of loaded images to keep. More are kept
+         if that many are in view.
+        """
+
+        self._virtual = enable
+        self._maxImages = maxImages
+
+        self.CountLoadedImages()
+
+        if self._items:
+            self.UpdateProp()
+            self.LoadThumbnails()
+            self.TrimImages()
+            self.Refresh()
+
+
+    def GetVirtualMode(self):
+        """ Returns whether the virtual mode is enabled. """
+
+        return self._virtual
+
+
     def ListDirectory(self, directory, fileExtList):
         """
         Returns list of file info objects for files of particular extensions.
@@ -1478,55 +2071,114 @@ class ScrolledThumbnail(wx.ScrolledWindow):
         return [f for f in os.listdir(directory) if lSplitExt(f)[1].lower() in fileExtList]
 
 
-    def ThreadImage(self, filenames):
+    def LoadThumbnails(self):
+        """
+        Starts loading the thumbnails of all the items in the background, those in
+        view first. Used internally.
         """
-        Threaded method to load images. Used internally.
 
-        :param `filenames`: a Python list of file names containing images.
+        first, last = self.GetVisibleRange()
+
+        if self._virtual:
+            # only the items in view, and a few rows below and above them
+            start, stop = self.GetNearbyRange()
+            order = self._items[first:last] + self._items[last:stop] + self._items[start:first][::-1]
+            order = [thumb for thumb in order if not hasattr(thumb, "_threadedimage")]
+            self._requested = set(order)
+            self._nearCount = stop - start
+        else:
+            # the items in view, then the ones below them, then the ones above
+            order = self._items[first:last] + self._items[last:] + self._items[:first][::-1]
+
+        jobs = [(thumb, thumb.GetFullFileName()) for thumb in order]
+
+        self._loader.Load(jobs, (300, 240), self.OnThumbnailLoaded)
+
+
+    def GetNearbyRange(self):
+        """
+        Returns a tuple `(first, last)` with the index of the first thumbnail loaded
+        in virtual mode and one past the index of the last one: the thumbnails in view
+        and two rows above and below them. Used internally.
         """
 
-        count = 0
+        first, last = self.GetVisibleRange()
+        margin = 2*self._cols
 
-        while count < len(filenames):
+        return max(first - margin, 0), min(last + margin, len(self._items))
 
-            if not self._isrunning:
-                self._isrunning = False
-                thread.exit()
-                return
 
-            self.LoadImages(filenames[count], count)
-            if count < 4:
-                self.Refresh()
-            elif count%4 == 0:
-                self.Refresh()
+    def CountLoadedImages(self):
+        """
+        Starts counting the images already loaded for the current items, in virtual
+        mode, for instance when thumbnails which have been shown before are shown
+        again. Used internally.
+        """
 
-            count = count + 1
+        self._requested.clear()
+        self._loadedThumbs.clear()
+
+        if self._virtual:
+            for thumb in self._items:
+                if hasattr(thumb, "_threadedimage"):
+                    self._loadedThumbs[thumb] = True
+
+
+    def TrimImages(self):
+        """
+        Throws away the images which have not been in view for the longest time, in
+        virtual mode, to keep only as many as asked by :meth:`~ScrolledThumbnail.EnableVirtualMode`.
+        Used internally.
+        """
+
+        maxImages = max(self._maxImages, self._nearCount, len(self._visibleThumbs))
 
-        self._isrunning = False
-        thread.exit()
+        while len(self._loadedThumbs) > maxImages:
+            thumb, dummy = self._loadedThumbs.popitem(last=False)
+            thumb.ReleaseImage()
+            self._requested.discard(thumb)
 
 
-    def LoadImages(self, newfile, imagecount):
+    def OnThumbnailLoaded(self, generation, thumb, result):
         """
-        Threaded method to load images. Used internally.
+        Called in the GUI thread by the :class:`ThumbnailLoader` when a thumbnail has been
+        loaded. Used internally.
 
-        :param `newfile`: a file name containing an image to thumbnail;
-        :param `imagecount`: the number of images loaded until now.
+        :param `generation`: the generation number of the loader job;
+        :param `thumb`: the :class:`Thumb` whose image has been loaded;
+        :param `result`: a tuple `(img, originalsize, alpha)`.
         """
 
-        if not self._isrunning:
-            thread.exit()
+        if not self or not self._loader.IsCurrent(generation):
             return
 
-        img, originalsize, alpha = self._imageHandler.LoadThumbnail(newfile, (300, 240))
-        try:
-            self._items[imagecount]._threadedimage = img
-            self._items[imagecount]._originalsize = originalsize
-            self._items[imagecount]._bitmap = img
-            self._items[imagecount]._alpha = alpha
-        except:
+        img, originalsize, alpha = result
+        thumb._threadedimage = img
+        thumb._originalsize = originalsize
+        thumb._bitmap = img
+        thumb._alpha = alpha
+
+        if self._virtual:
+            self._loadedThumbs.pop(thumb, None)
+            self._loadedThumbs[thumb] = True
+            self.TrimImages()
+
+        # many thumbnails are usually delivered at once, refresh only once for all
+        # of them, and only if one of them is in view
+        if thumb in self._visibleThumbs and not self._refreshPending:
+            self._refreshPending = True
+            wx.CallAfter(self.RefreshLoaded)
+
+
+    def RefreshLoaded(self):
+        """ Refreshes the thumbnails in view after some have been loaded. Used internally. """
+
+        if not self:
             return
 
+        self._refreshPending = False
+        self.Refresh()
+
 
     def ShowThumbs(self, thumbs, caption):
         """
@@ -1538,23 +2190,17 @@ class ScrolledThumbnail(wx.ScrolledWindow):
 
         self.SetCaption(caption)
 
-        self._isrunning = False
-
         # update items
         self._items = thumbs
-        myfiles = [thumb.GetFullFileName() for thumb in thumbs]
-
-        items = self._items[:]
         self._items.sort(key=KeyThumb)
 
-        newfiles = SortFiles(items, self._items, myfiles)
-        self._isrunning = True
-
-        thread.start_new_thread(self.ThreadImage, (newfiles,))
-        wx.MilliSleep(20)
+        self.CountLoadedImages()
 
         self._selectedarray = []
         self.UpdateProp()
+
+        self.LoadThumbnails()
+        self.TrimImages()
         self.Refresh()
 
 
@@ -1774,6 +2420,10 @@ class ScrolledThumbnail(wx.ScrolledWindow):
         :param `count`: the number of lines to measure.
         """
 
+        if self._virtual:
+            rows = max(min(begRow + count, self._rows) - max(begRow, 0), 0)
+            return rows*self._tCaptionLines*self._tTextHeight
+
         capHeight = 0
         for ii in range(begRow, begRow + count):
             if ii < len(self._tCaptionHeight):
@@ -1798,10 +2448,17 @@ class ScrolledThumbnail(wx.ScrolledWindow):
         row = -1
         y = y - self._tBorder
 
-        while y > 0:
+        if self._virtual:
+            # all the rows have the same height
+            if y > 0:
+                rowHeight = self._tHeight + self._tBorder + self.GetCaptionHeight(0)
+                row = int(ceil(y/float(rowHeight))) - 1
 
-            row = row + 1
-            y = y - (self._tHeight + self._tBorder + self.GetCaptionHeight(row))
+        else:
+            while y > 0:
+
+                row = row + 1
+                y = y - (self._tHeight + self._tBorder + self.GetCaptionHeight(row))
 
         if row < 0:
             row = 0
@@ -1833,7 +2490,11 @@ class ScrolledThumbnail(wx.ScrolledWindow):
 
         self._tCaptionHeight = []
 
-        for row in range(self._rows):
+        # in virtual mode every caption takes one line, see EnableVirtualMode
+        self._tCaptionLines = (self._showfilenames and [1] or [0])[0]
+        captionRows = (self._virtual and [0] or [self._rows])[0]
+
+        for row in range(captionRows):
 
             capHeight = 0
 
@@ -1900,6 +2561,40 @@ class ScrolledThumbnail(wx.ScrolledWindow):
         return paintRect
 
 
+    def GetVisibleRange(self):
+        """
+        Returns a tuple `(first, last)` with the index of the first thumbnail in view
+        and one past the index of the last one.
+        """
+
+        paintRect = self.GetPaintRect()
+        rowHeight = self._tHeight + self._tBorder
+
+        if self._virtual:
+            # all the rows have the same height
+            rowHeight = rowHeight + self.GetCaptionHeight(0)
+            first = int(floor((paintRect.GetTop() - self._tBorder/2.0)/rowHeight))
+            last = int(floor((paintRect.GetBottom() - self._tBorder/2.0)/rowHeight)) + 1
+            first = min(max(first, 0), self._rows)
+            last = min(max(last, first), self._rows)
+
+            return first*self._cols, min(last*self._cols, len(self._items))
+
+        first = last = self._rows
+        y = self._tBorder/2
+
+        for row in range(self._rows):
+            bottom = y + rowHeight + self.GetCaptionHeight(row)
+            if first == self._rows and bottom > paintRect.GetTop():
+                first = row
+            if y > paintRect.GetBottom():
+                last = row
+                break
+            y = bottom
+
+        return first*self._cols, min(last*self._cols, len(self._items))
+
+
     def IsSelected(self, indx):
         """
         Returns whether a thumbnail is selected or not.
@@ -2003,6 +2698,9 @@ class ScrolledThumbnail(wx.ScrolledWindow):
         dc.SetBrush(wx.Brush(self.GetBackgroundColour(), wx.BRUSHSTYLE_SOLID))
         dc.DrawRectangle(0, 0, bmp.GetWidth(), bmp.GetHeight())
 
+        # in virtual mode the captions are only broken when they are first shown
+        thumb.BreakCaption(self._tWidth - self._tCaptionBorder)
+
         # image
         img = thumb.GetBitmap(self._tWidth, self._tHeight)
         ww = img.GetWidth()
@@ -2123,16 +2821,17 @@ class ScrolledThumbnail(wx.ScrolledWindow):
         w, h = self.GetClientSize()
 
         # items
-        row = -1
         xwhite = self._tBorder
+        if self._items:
+            xwhite = ((w - self._cols*(self._tWidth + self._tBorder)))/(self._cols+1)
 
-        for ii in range(len(self._items)):
+        first, last = self.GetVisibleRange()
+        visible = []
 
-            col = ii%self._cols
-            if col == 0:
-                row = row + 1
+        # only look at the items in view
+        for ii in range(first, last):
 
-            xwhite = ((w - self._cols*(self._tWidth + self._tBorder)))/(self._cols+1)
+            row, col = divmod(ii, self._cols)
             tx = xwhite + col*(self._tWidth + self._tBorder)
 
             ty = self._tBorder/2 + row*(self._tHeight + self._tBorder) + \
@@ -2143,10 +2842,28 @@ class ScrolledThumbnail(wx.ScrolledWindow):
             if not paintRect.Intersects(wx.Rect(tx, ty, tw, th)):
                 continue
 
+            visible.append(self._items[ii])
             thmb = wx.Bitmap(tw, th)
             self.DrawThumbnail(thmb, self._items[ii], ii)
             dc.DrawBitmap(thmb, tx, ty)
 
+        self._visibleThumbs = set(visible)
+
+        if self._virtual:
+            # keep the images in view, and load the ones scrolled near the view
+            for thumb in visible:
+                if self._loadedThumbs.pop(thumb, None):
+                    self._loadedThumbs[thumb] = True
+
+            start, stop = self.GetNearbyRange()
+            missing = [thumb for thumb in self._items[start:stop] if not hasattr(thumb, "_threadedimage")]
+            if not self._requested.issuperset(missing):
+                self.LoadThumbnails()
+
+        elif self._loader.GetPendingCount():
+            # load the thumbnails scrolled into view before the others
+            self._loader.Prioritise([thumb for thumb in visible if not hasattr(thumb, "_threadedimage")])
+
         rect = wx.Rect(xwhite, self._tBorder/2,
                        self._cols*(self._tWidth + self._tBorder),
                        self._rows*(self._tHeight + self._tBorder) + \
@@ -2180,6 +2897,19 @@ class ScrolledThumbnail(wx.ScrolledWindow):
         self.Refresh()
 
 
+    def OnDestroy(self, event):
+        """
+        Handles the ``wx.EVT_WINDOW_DESTROY`` event for :class:`ThumbnailCtrl`.
+
+        :param `event`: a :class:`wx.WindowDestroyEvent` event to be processed.
+        """
+
+        if event.GetEventObject() is self:
+            self._loader.Stop()
+
+        event.Skip()
+
+
     def OnMouseDown(self, event):
         """
         Handles the ``wx.EVT_LEFT_DOWN`` and ``wx.EVT_RIGHT_DOWN`` events for :class:`ThumbnailCtrl`.
@@ -2460,6 +3190,12 @@ class ScrolledThumbnail(wx.ScrolledWindow):
                 img.SetData(pil.convert('RGB').tobytes())
                 thumb.SetRotation(newangle*pi/180)
             else:
+                if not hasattr(thumb, "_threadedimage"):
+                    # thrown away in virtual mode
+                    img, originalsize, alpha = self._loader.LoadThumbnail(thumb.GetFullFileName(), (300, 240))
+                    thumb._threadedimage = img
+                    if self._virtual:
+                        self._loadedThumbs[thumb] = True
                 img = thumb._threadedimage
                 newangle = thumb.GetRotation() + angle*pi/180
                 thumb.SetRotation(newangle)
@@ -13,14 +13,79 @@
 #----------------------------------------------------------------------
 
 import base64
+import mmap
+import struct
+import threading
+from collections import OrderedDict
 
 import wx
 from six import BytesIO
 
 try:
     b64decode = base64.b64decode
+    b64encode = base64.b64encode
 except AttributeError:
     b64decode = base64.decodestring
+    b64encode = base64.encodestring
+
+
+#----------------------------------------------------------------------
+# The cache of decoded images, shared by all the PyEmbeddedImage objects
+# which have caching enabled. The least recently used images are thrown
+# away first when the cache goes over its budget.
+
+_cacheLock = threading.Lock()
+_cache = OrderedDict()
+_cacheSize = 0
+_cacheBudget = 32 * 2**20
+_cacheByDefault = False
+
+
+def EnableCacheByDefault(enable=True):
+    """
+    Set whether the PyEmbeddedImage objects which have not been told
+    otherwise (with the cache parameter or EnableCache) cache the
+    objects they decode.
+    """
+    global _cacheByDefault
+    _cacheByDefault = enable
+
+
+def SetCacheBudget(budget):
+    """
+    Set the maximum memory, in bytes, used by the cache of decoded
+    images, throwing away the least recently used ones if needed.
+    """
+    global _cacheBudget
+    with _cacheLock:
+        _cacheBudget = budget
+        _trimCache()
+
+
+def GetCacheBudget():
+    """Return the maximum memory, in bytes, used by the cache."""
+    return _cacheBudget
+
+
+def GetCacheSize():
+    """Return an estimate of the memory, in bytes, used by the cache."""
+    return _cacheSize
+
+
+def ClearCache():
+    """Throw away all the decoded images in the cache."""
+    global _cacheSize
+    with _cacheLock:
+        _cache.clear()
+        _cacheSize = 0
+
+
+def _trimCache():
+    # called with the lock held
+    global _cacheSize
+    while _cacheSize > _cacheBudget and _cache:
+        key, (obj, size) = _cache.popitem(last=False)
+        _cacheSize -= size
 
 
 class PyEmbeddedImage(object):
@@ -39,29 +104,133 @@ class PyEmbeddedImage(object):
     from a database.  In this case pass False for isBase64 (unless the
     data actually is base64 encoded.)  Any image type that
     wx.Image can handle should be okay.
+
+    Decoding the image data takes a while, which adds up for images
+    that are fetched again and again, say each time a window is
+    painted. With cache=True (or EnableCache, or EnableCacheByDefault)
+    the decoded wx.Image, wx.Bitmap and wx.Icon are kept in a cache
+    shared by all the PyEmbeddedImage objects, whose memory is limited
+    by SetCacheBudget; the Get methods then return copies of the cached
+    objects. Caching also replaces the base64 data by the raw bytes
+    the first time they are decoded, as they take less memory.
     """
 
-    def __init__(self, data, isBase64=True):
-        self.data = data
+    def __init__(self, data, isBase64=True, cache=None):
+        self._data = data
+        self._raw = None
         self.isBase64 = isBase64
+        self._cacheEnabled = cache
+
+    def _getData(self):
+        if self._data is None:
+            # dropped in favour of the raw bytes, encode them again
+            self._data = b64encode(self._raw)
+        return self._data
+
+    def _setData(self, data):
+        self._data = data
+        self._raw = None
+        self.Evict()
+
+    # the data given to the constructor
+    data = property(_getData, _setData)
+
+    def EnableCache(self, enable=True):
+        """
+        Set whether the objects decoded from this image are cached,
+        overriding EnableCacheByDefault. Disabling the cache evicts them.
+        """
+        self._cacheEnabled = enable
+        if not enable:
+            self.Evict()
+
+    def IsCacheEnabled(self):
+        """Return whether the objects decoded from this image are cached."""
+        if self._cacheEnabled is None:
+            return _cacheByDefault
+        return self._cacheEnabled
+
+    def Evict(self):
+        """Throw away the objects decoded from this image from the cache."""
+        global _cacheSize
+        with _cacheLock:
+            for kind in ('image', 'bitmap', 'icon'):
+                entry = _cache.pop((self, kind), None)
+                if entry is not None:
+                    _cacheSize -= entry[1]
+
+    def _getCached(self, kind):
+        with _cacheLock:
+            entry = _cache.pop((self, kind), None)
+            if entry is None:
+                return None
+            _cache[(self, kind)] = entry # it's now the most recently used
+            return entry[0]
+
+    def _putCached(self, kind, obj, bytesPerPixel):
+        global _cacheSize
+        size = obj.GetWidth() * obj.GetHeight() * bytesPerPixel
+        with _cacheLock:
+            entry = _cache.pop((self, kind), None)
+            if entry is not None:
+                _cacheSize -= entry[1]
+            _cache[(self, kind)] = (obj, size)
+            _cacheSize += size
+            _trimCache()
+
+    def _decodeImage(self):
+        image = self._getCached('image')
+        if image is None:
+            image = wx.Image(BytesIO(self.GetData()))
+        return image
 
     def GetBitmap(self):
-        return wx.Bitmap(self.GetImage())
+        if not self.IsCacheEnabled():
+            return wx.Bitmap(self.GetImage())
+
+        bitmap = self._getCached('bitmap')
+        if bitmap is None:
+            bitmap = wx.Bitmap(self._decodeImage())
+            self._putCached('bitmap', bitmap, 4)
+        return wx.Bitmap(bitmap)
 
     def GetData(self):
+        if self._raw is not None:
+            return self._raw
+
         data = self.data
         if self.isBase64:
             data = b64decode(self.data)
+            if self.IsCacheEnabled():
+                # keep the raw bytes, they are smaller than the base64 data
+                self._raw = data
+                self._data = None
         return data
 
     def GetIcon(self):
+        if self.IsCacheEnabled():
+            icon = self._getCached('icon')
+            if icon is None:
+                icon = wx.Icon()
+                icon.CopyFromBitmap(self.GetBitmap())
+                self._putCached('icon', icon, 4)
+            return wx.Icon(icon)
+
         icon = wx.Icon()
         icon.CopyFromBitmap(self.GetBitmap())
         return icon
 
     def GetImage(self):
-        stream = BytesIO(self.GetData())
-        return wx.Image(stream)
+        if not self.IsCacheEnabled():
+            stream = BytesIO(self.GetData())
+            return wx.Image(stream)
+
+        image = self._getCached('image')
+        if image is None:
+            image = wx.Image(BytesIO(self.GetData()))
+            self._putCached('image', image, image.HasAlpha() and 4 or 3)
+        # images are often changed in place, so never hand out the cached one
+        return image.Copy()
 
     # added for backwards compatibility
     getBitmap = wx.deprecated(GetBitmap)
@@ -74,3 +243,144 @@ class PyEmbeddedImage(object):
     Data = property(GetData)
     Icon = property(GetIcon)
     Image = property(GetImage)
+
+
+
+#----------------------------------------------------------------------
+# Binary bundles of images, written by img2py -b. The file starts with a
+# header holding the number of images, followed by the index: the name,
+# offset and size of each image. The image data follows the index.
+
+_bundleMagic = b"WXIMGBDL"
+_bundleVersion = 1
+_bundleHeader = struct.Struct("<8sII")
+_bundleEntry = struct.Struct("<HQQ")
+
+
+def WriteImageBundle(fileName, images):
+    """
+    Write a bundle of images that can be loaded with ImageBundle. The
+    images are a sequence of (name, data) pairs, the data being the
+    contents of an image file of any type that wx.Image can handle.
+    """
+    images = [(name.encode('utf-8'), data) for name, data in images]
+
+    offset = _bundleHeader.size + sum(_bundleEntry.size + len(name)
+                                      for name, data in images)
+    index = []
+    for name, data in images:
+        index.append(_bundleEntry.pack(len(name), offset, len(data)) + name)
+        offset += len(data)
+
+    with open(fileName, 'wb') as f:
+        f.write(_bundleHeader.pack(_bundleMagic, _bundleVersion, len(images)))
+        f.write(b''.join(index))
+        for name, data in images:
+            f.write(data)
+
+
+class BundleImage(PyEmbeddedImage):
+    """
+    An image of an ImageBundle. It can be used like a PyEmbeddedImage,
+    its data is only read from the bundle when it is needed.
+    """
+
+    def __init__(self, bundle, name, cache=None):
+        PyEmbeddedImage.__init__(self, None, isBase64=False, cache=cache)
+        self._bundle = bundle
+        self._name = name
+
+    def GetData(self):
+        return self._bundle.GetData(self._name)
+
+    data = property(GetData)
+
+
+class ImageBundle(object):
+    """
+    The catalog of the images in a bundle written by img2py -b (or by
+    WriteImageBundle). It works like the catalog dictionary of the
+    modules written by img2py -c: bundle[name] is an image that can be
+    used like a PyEmbeddedImage, and bundle.index is the list of the
+    image names, in the order they were added.
+
+    The bundle file is memory-mapped, so opening it only reads the
+    index, and each image is read and decoded the first time it is
+    used. Pass cache=True to cache the decoded images, see
+    PyEmbeddedImage.
+    """
+
+    def __init__(self, fileName, cache=None):
+        self._cache = cache
+        self._file = open(fileName, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+        try:
+            self._readIndex(fileName)
+        except Exception:
+            self.Close()
+            raise
+
+    def _readIndex(self, fileName):
+        data = self._map
+        try:
+            magic, version, count = _bundleHeader.unpack_from(data, 0)
+        except struct.error:
+            magic = None
+        if magic != _bundleMagic or version != _bundleVersion:
+            raise ValueError("%s is not an image bundle" % fileName)
+
+        self.index = []
+        self._entries = {}
+        self._images = {}
+
+        pos = _bundleHeader.size
+        for i in range(count):
+            length, offset, size = _bundleEntry.unpack_from(data, pos)
+            pos += _bundleEntry.size
+            name = data[pos:pos + length].decode('utf-8')
+            pos += length
+            if offset + size > len(data):
+                raise ValueError("%s is truncated" % fileName)
+            if name not in self._entries:
+                self.index.append(name)
+            self._entries[name] = (offset, size)
+
+    def GetData(self, name):
+        """Return the contents of the image file called name."""
+        offset, size = self._entries[name]
+        return self._map[offset:offset + size]
+
+    def Close(self):
+        """Close the bundle file. Its images can no longer be used."""
+        self._map.close()
+        self._file.close()
+
+    def get(self, name, default=None):
+        if name in self._entries:
+            return self[name]
+        return default
+
+    def keys(self):
+        return list(self.index)
+
+    def __getitem__(self, name):
+        image = self._images.get(name)
+        if image is None:
+            if name not in self._entries:
+                raise KeyError(name)
+            image = self._images[name] = BundleImage(self, name, self._cache)
+        return image
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
@@ -15,6 +15,7 @@ This is where FloatCanvas defines its drawings objects.
 """
 
 import sys
+import math
 
 import wx
 import six
@@ -22,6 +23,7 @@ import six
 import numpy as N
 
 from .Utilities import BBox
+from .Utilities import FontCache
 from wx.lib.floatcanvas.Utilities import Colors
 
 mac = sys.platform.startswith("darwin")
@@ -99,7 +101,94 @@ def _colorGenerator():
     return _cycleidxs(indexcount=3, maxvalue=256, step=1)
 
 
-class DrawObject:
+def _PointInPolygon(xy, Points):
+    """
+    Utility function used by the geometric hit test: returns True if the
+    point xy is inside the polygon Points, using the same odd-even rule the
+    DC uses to fill polygons.
+    """
+    x, y = xy
+    X, Y = Points[:,0], Points[:,1]
+    X2, Y2 = N.roll(X, -1), N.roll(Y, -1)
+    Crosses = (Y > y) != (Y2 > y)
+    dY = N.where(Crosses, Y2 - Y, 1.0) # avoid dividing by zero
+    XCross = X + (y - Y) * (X2 - X) / dY
+    return bool(N.count_nonzero(Crosses & (x < XCross)) % 2)
+
+
+def _DistanceToPolyline(xy, Points):
+    """
+    Utility function used by the geometric hit test: returns the distance
+    from the point xy to the nearest segment of the polyline Points.
+    """
+    Points = N.asarray(Points, N.float)
+    if len(Points) == 1:
+        return N.hypot(*(Points[0] - xy))
+    A = Points[:-1]
+    AB = Points[1:] - A
+    Length2 = (AB**2).sum(1)
+    t = ((xy - A) * AB).sum(1) / N.where(Length2 == 0, 1.0, Length2)
+    t = N.clip(t, 0.0, 1.0)
+    d = A + t[:,N.newaxis] * AB - xy
+    return N.sqrt((d**2).sum(1).min())
+
+
+def _PointInRect(xy, XY, WH, Tolerance=0):
+    """
+    Utility function used by the geometric hit test: returns True if the
+    point xy is in the rectangle XY, WH (which may have a negative width or
+    height), grown by Tolerance on each side.
+    """
+    x0, x1 = sorted((XY[0], XY[0] + WH[0]))
+    y0, y1 = sorted((XY[1], XY[1] + WH[1]))
+    return (x0 - Tolerance <= xy[0] <= x1 + Tolerance and
+            y0 - Tolerance <= xy[1] <= y1 + Tolerance)
+
+
+def _DecimatePath(Points, CellSize):
+    """
+    Utility function used for the level of detail of lines: returns the
+    points of the path with only the first point of each run of consecutive
+    points that fall in the same CellSize square, and the last point.
+    """
+    Cells = N.floor(Points / CellSize)
+    Keep = N.ones(len(Points), bool)
+    Keep[1:] = (Cells[1:] != Cells[:-1]).any(1)
+    Keep[-1] = True
+    return Points[Keep]
+
+
+def _DecimatePolygon(Points, CellSize):
+    """
+    Utility function used for the level of detail of polygons: as
+    _DecimatePath, but always keeps at least three points.
+    """
+    Decimated = _DecimatePath(Points, CellSize)
+    if len(Decimated) < 3:
+        n = len(Points)
+        Decimated = Points[[0, n // 3, 2 * n // 3]]
+    return Decimated
+
+
+def _DecimatePointSet(Points, CellSize):
+    """
+    Utility function used for the level of detail of point sets: returns
+    the first point in each CellSize square, in the original order.
+    """
+    Cells = N.floor(Points / CellSize)
+    Index = N.unique(Cells, return_index=True, axis=0)[1]
+    return Points[N.sort(Index)]
+
+
+def _HitAbleMask(Objects):
+    """
+    Utility function used by the _DrawBatch methods: returns a boolean
+    array that is True for the objects that get drawn to the hit test bitmap.
+    """
+    return N.fromiter((obj.HitAble for obj in Objects), bool, len(Objects))
+
+
+class DrawObject(object):
     """
     This is the base class for all the objects that can be drawn.
 
@@ -145,6 +234,35 @@ class DrawObject:
 
         self.Visible = IsVisible
 
+    ## Set to False in subclasses whose drawing depends on the Canvas'
+    ## viewport, so they can't be drawn in the Canvas' background tiles.
+    Tileable = True
+
+    ## Set to False in subclasses that make wx objects (bitmaps...) or use
+    ## the Canvas' viewport when they are drawn, so they can't be drawn by
+    ## the Canvas' background rendering thread.
+    Threadable = True
+
+    ## BoundingBox is a property so that the Canvas' spatial index can be
+    ## kept up to date when an object is moved or changed.
+    @property
+    def BoundingBox(self):
+        """
+        getter for the BoundingBox property
+        """
+        return self._BoundingBox
+
+    @BoundingBox.setter
+    def BoundingBox(self, BB):
+        """
+        setter for the BoundingBox property
+        """
+        self._BoundingBox = BB
+        # this can get called before __init__ has set _Canvas
+        Canvas = getattr(self, "_Canvas", None)
+        if Canvas is not None:
+            Canvas._BoundingBoxChanged(self)
+
     # I pre-define all these as class variables to provide an easier
     # interface, and perhaps speed things up by caching all the Pens
     # and Brushes, although that may not help, as I think wx now
@@ -421,18 +539,82 @@ class DrawObject:
     def PutInBackground(self):
         """Put the object in the background."""
         if self._Canvas and self.InForeground:
-            self._Canvas._ForeDrawList.remove(self)
-            self._Canvas._DrawList.append(self)
-            self._Canvas._BackgroundDirty = True
+            self._Canvas.RemoveObject(self, ResetBB=False)
             self.InForeground = False
+            self._Canvas.AddObject(self)
 
     def PutInForeground(self):
         """Put the object in the foreground."""
         if self._Canvas and (not self.InForeground):
-            self._Canvas._ForeDrawList.append(self)
-            self._Canvas._DrawList.remove(self)
-            self._Canvas._BackgroundDirty = True
+            self._Canvas.RemoveObject(self, ResetBB=False)
             self.InForeground = True
+            self._Canvas.AddObject(self)
+
+    def _ToPixel(self, Fun, Coordinates, Key):
+        """
+        Returns Fun(Coordinates), where Fun is the WorldToPixel or
+        ScaleWorldToPixel function passed to _Draw.
+
+        If Fun can put its result in an array it is given (it has a true
+        ``TakesOut`` attribute, as the Canvas methods do) the result is put
+        in an array kept by the object under Key, so that re-drawing does not
+        make new arrays. The result is only good until the next call with the
+        same Key.
+
+        """
+        if not getattr(Fun, "TakesOut", False):
+            return Fun(Coordinates)
+        Shape = N.shape(Coordinates)
+        try:
+            out = self._PixelBuffers[Key]
+        except AttributeError:
+            self._PixelBuffers = {}
+            out = None
+        except KeyError:
+            out = None
+        if out is None or out.shape != Shape:
+            out = self._PixelBuffers[Key] = N.empty(Shape, 'i')
+        return Fun(Coordinates, out=out)
+
+    def _HitTestPixel(self, xy, WorldToPixel, ScaleWorldToPixel):
+        """
+        Returns True if the pixel xy is on the object, as drawn with the given
+        WorldToPixel and ScaleWorldToPixel functions.
+
+        This is used by the Canvas when its HitTestMethod is "Geometry". This
+        version tests the BoundingBox, subclasses override it to test their
+        actual shape.
+
+        """
+        if self.BoundingBox.IsNull():
+            return False
+        XY = WorldToPixel(self.BoundingBox[0])
+        WH = WorldToPixel(self.BoundingBox[1]) - XY
+        return _PointInRect(xy, XY, WH, self.HitLineWidth / 2.0)
+
+    def _BatchKey(self):
+        """
+        Returns a key that is the same for all the objects that can be drawn
+        together by this class's ``_DrawBatch`` method, or ``None`` if the
+        object has to be drawn on its own by ``_Draw``.
+
+        This is used by the Canvas when ``BatchDraw`` is turned on.
+
+        """
+        return None
+
+    def _GetDrawFonts(self, ScaleWorldToPixel, Fonts):
+        """
+        Adds the fonts that ``_Draw`` gets from the font cache, when drawing
+        with ScaleWorldToPixel, to the dict Fonts (see
+        :meth:`FontCache.SetThreadFonts`).
+
+        This is used by the Canvas to make the fonts on the GUI thread before
+        handing the objects to its render thread. Only objects that get a font
+        while drawing override it.
+
+        """
+        pass
 
     def Hide(self):
         """Hide the object."""
@@ -593,7 +775,14 @@ class PointsObjectMixin:
     A mixin class that provides some methods suitable for use
     with objects that have a set of (x, y) coordinate pairs.
 
+    Objects with more than LODMinPoints points can be drawn with fewer
+    points when they are zoomed out, see :meth:`_LODPoints`. Set
+    LODMinPoints to ``None`` to always draw all the points.
+
     """
+    LODMinPoints = 1000
+    ## the function used to make a simplified set of points
+    _Decimate = staticmethod(_DecimatePath)
 
     def Move(self, Delta):
         """
@@ -607,15 +796,57 @@ class PointsObjectMixin:
         Delta.shape = (2,)
         self.Points += Delta
         self.BoundingBox += Delta
+        self._LODCache = {}
         if self._Canvas:
             self._Canvas.BoundingBoxDirty = True
 
     def CalcBoundingBox(self):
         """Calculate the bounding box."""
         self.BoundingBox = BBox.fromPoints(self.Points)
+        self._LODCache = {} # the points may well have changed too
         if self._Canvas:
             self._Canvas.BoundingBoxDirty = True
 
+    def _LODPoints(self, ScaleWorldToPixel):
+        """
+        Returns the points to draw at the current scale.
+
+        When the object is zoomed out so far that there are fewer
+        quarter-pixel squares across it than it has points, the points are
+        decimated to one per square (or per run of points in the same square,
+        for lines and polygons), so the result is within about a pixel of
+        drawing them all. The simplified points are made when they are first
+        needed, and kept for each level of detail (a power of two squares
+        across the object) until the points change.
+
+        :param `ScaleWorldToPixel`: the function that converts a length from
+         world to pixel coordinates
+
+        """
+        Points = self.Points
+        if (ScaleWorldToPixel is None or self.LODMinPoints is None or
+            len(Points) < self.LODMinPoints):
+            return Points
+        WH = self.BoundingBox[1] - self.BoundingBox[0]
+        Extent = WH.max()
+        if not Extent > 0:
+            return Points
+        PixelWH = N.abs(ScaleWorldToPixel(WH))
+        OnScreen = PixelWH > 0
+        if OnScreen.any():
+            PixelSize = (WH[OnScreen] / PixelWH[OnScreen]).min()
+            Level = max(0, int(math.ceil(math.log(4 * Extent / PixelSize, 2))))
+        else:
+            Level = 0
+        if 2**Level >= len(Points):
+            return Points # not worth it, there are as many squares as points
+        try:
+            return self._LODCache[Level]
+        except KeyError:
+            LOD = self._Decimate(Points, Extent / 2**Level)
+            self._LODCache[Level] = LOD
+            return LOD
+
     def SetPoints(self, Points, copy=True):
         """
         Sets the coordinates of the points of the object to Points (NX2 array).
@@ -691,8 +922,10 @@ class Polygon(PointsObjectMixin, LineAndFillMixin, DrawObject):
         self.SetPen(LineColor,LineStyle,LineWidth)
         self.SetBrush(FillColor,FillStyle)
 
+    _Decimate = staticmethod(_DecimatePolygon)
+
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel = None, HTdc=None):
-        Points = WorldToPixel(self.Points)#.tolist()
+        Points = self._ToPixel(WorldToPixel, self._LODPoints(ScaleWorldToPixel), "Points")#.tolist()
         dc.SetPen(self.Pen)
         dc.SetBrush(self.Brush)
         dc.DrawPolygon(Points)
@@ -701,6 +934,13 @@ class Polygon(PointsObjectMixin, LineAndFillMixin, DrawObject):
             HTdc.SetBrush(self.HitBrush)
             HTdc.DrawPolygon(Points)
 
+    def _HitTestPixel(self, xy, WorldToPixel, ScaleWorldToPixel):
+        Points = WorldToPixel(self.Points)
+        if self.HitFill and _PointInPolygon(xy, Points):
+            return True
+        return bool(self.HitLine and
+                    _DistanceToPolyline(xy, N.vstack((Points, Points[:1]))) <= self.HitLineWidth / 2.0)
+
 class Line(PointsObjectMixin, LineOnlyMixin, DrawObject):
     """
     Draws a line
@@ -741,13 +981,38 @@ class Line(PointsObjectMixin, LineOnlyMixin, DrawObject):
 
 
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
-        Points = WorldToPixel(self.Points)
+        Points = self._ToPixel(WorldToPixel, self._LODPoints(ScaleWorldToPixel), "Points")
         dc.SetPen(self.Pen)
         dc.DrawLines(Points)
         if HTdc and self.HitAble:
             HTdc.SetPen(self.HitPen)
             HTdc.DrawLines(Points)
 
+    def _HitTestPixel(self, xy, WorldToPixel, ScaleWorldToPixel):
+        ## note: a Spline is tested as the Line through its points.
+        return bool(self.HitLine and
+                    _DistanceToPolyline(xy, WorldToPixel(self.Points)) <= self.HitLineWidth / 2.0)
+
+    def _BatchKey(self):
+        # only simple two point lines can be drawn with DrawLineList
+        if self.__class__ is not Line or len(self.Points) != 2:
+            return None
+        return (Line, id(self.Pen))
+
+    @staticmethod
+    def _DrawBatch(Objects, dc, WorldToPixel, ScaleWorldToPixel, HTdc=None):
+        """
+        Draws a list of two point Lines that all have the same Pen.
+        """
+        Lines = WorldToPixel(N.array([obj.Points for obj in Objects])).reshape(-1, 4)
+        dc.SetPen(Objects[0].Pen)
+        dc.DrawLineList(Lines)
+        if HTdc:
+            HitAble = _HitAbleMask(Objects)
+            if HitAble.any():
+                HitPens = [obj.HitPen for obj in Objects if obj.HitAble]
+                HTdc.DrawLineList(Lines[HitAble], HitPens)
+
 class Spline(Line):
     """Draws a spline"""
     def __init__(self, *args, **kwargs):
@@ -899,6 +1164,11 @@ class Arrow(XYObjectMixin, LineOnlyMixin, DrawObject):
             HTdc.SetPen(self.HitPen)
             HTdc.DrawLines(ArrowPoints)
 
+    def _HitTestPixel(self, xy, WorldToPixel, ScaleWorldToPixel):
+        ArrowPoints = WorldToPixel(self.XY) + self.ArrowPoints
+        return bool(self.HitLine and
+                    _DistanceToPolyline(xy, ArrowPoints) <= self.HitLineWidth / 2.0)
+
 
 class ArrowLine(PointsObjectMixin, LineOnlyMixin, DrawObject):
     """
@@ -970,7 +1240,7 @@ class ArrowLine(PointsObjectMixin, LineOnlyMixin, DrawObject):
         self.ArrowPoints *= S
 
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
-        Points = WorldToPixel(self.Points)
+        Points = self._ToPixel(WorldToPixel, self.Points, "Points")
         ArrowPoints = Points[1:,N.newaxis,:] + self.ArrowPoints
         dc.SetPen(self.Pen)
         dc.DrawLines(Points)
@@ -982,6 +1252,11 @@ class ArrowLine(PointsObjectMixin, LineOnlyMixin, DrawObject):
             for arrow in ArrowPoints:
                 HTdc.DrawLines(arrow)
 
+    def _HitTestPixel(self, xy, WorldToPixel, ScaleWorldToPixel):
+        # the arrow heads are not tested, they are small, and on the line.
+        return bool(self.HitLine and
+                    _DistanceToPolyline(xy, WorldToPixel(self.Points)) <= self.HitLineWidth / 2.0)
+
 
 class PointSet(PointsObjectMixin, ColorOnlyMixin, DrawObject):
     """
@@ -1024,6 +1299,8 @@ class PointSet(PointsObjectMixin, ColorOnlyMixin, DrawObject):
         self.HitLineWidth = min(self.MinHitLineWidth, Diameter)
         self.SetColor(Color)
 
+    _Decimate = staticmethod(_DecimatePointSet)
+
     def SetDiameter(self, Diameter):
         """
         Sets the diameter
@@ -1060,7 +1337,7 @@ class PointSet(PointsObjectMixin, ColorOnlyMixin, DrawObject):
 
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
         dc.SetPen(self.Pen)
-        Points = WorldToPixel(self.Points)
+        Points = self._ToPixel(WorldToPixel, self._LODPoints(ScaleWorldToPixel), "Points")
         if self.Diameter <= 1:
             dc.DrawPointList(Points)
         elif self.Diameter <= 2:
@@ -1092,6 +1369,11 @@ class PointSet(PointsObjectMixin, ColorOnlyMixin, DrawObject):
                     for xy in Points:
                         HTdc.DrawCircle(xy[0],xy[1], radius)
 
+    def _HitTestPixel(self, xy, WorldToPixel, ScaleWorldToPixel):
+        d = WorldToPixel(self.Points) - xy
+        radius = max(self.Diameter, self.MinHitLineWidth) / 2.0
+        return bool((d**2).sum(1).min() <= radius**2)
+
 class Point(XYObjectMixin, ColorOnlyMixin, DrawObject):
     """
     A point DrawObject
@@ -1151,6 +1433,46 @@ class Point(XYObjectMixin, ColorOnlyMixin, DrawObject):
                 HTdc.SetBrush(self.HitBrush)
                 HTdc.DrawCircle(xy[0],xy[1], radius)
 
+    def _HitTestPixel(self, xy, WorldToPixel, ScaleWorldToPixel):
+        d = WorldToPixel(self.XY) - xy
+        radius = max(self.Diameter, self.HitLineWidth) / 2.0
+        return bool((d**2).sum() <= radius**2)
+
+    def _BatchKey(self):
+        if self.__class__ is not Point:
+            return None
+        return (Point, id(self.Pen), id(self.Brush), self.Diameter)
+
+    @staticmethod
+    def _DrawBatch(Objects, dc, WorldToPixel, ScaleWorldToPixel, HTdc=None):
+        """
+        Draws a list of Points that all have the same Pen, Brush and Diameter.
+        """
+        First = Objects[0]
+        XY = WorldToPixel(N.array([obj.XY for obj in Objects]))
+        dc.SetPen(First.Pen)
+        if First.Diameter <= 1:
+            Shapes = XY
+            dc.DrawPointList(Shapes)
+        else:
+            # DrawCircle(x, y, r) is DrawEllipse(x-r, y-r, 2r, 2r)
+            radius = int(round(First.Diameter/2))
+            Shapes = N.empty((len(XY), 4), N.int32)
+            Shapes[:,:2] = XY - radius
+            Shapes[:,2:] = 2 * radius
+            dc.SetBrush(First.Brush)
+            dc.DrawEllipseList(Shapes)
+        if HTdc:
+            HitAble = _HitAbleMask(Objects)
+            if HitAble.any():
+                HitObjects = [obj for obj in Objects if obj.HitAble]
+                HitPens = [obj.HitPen for obj in HitObjects]
+                if First.Diameter <= 1:
+                    HTdc.DrawPointList(Shapes[HitAble], HitPens)
+                else:
+                    HitBrushes = [obj.HitBrush for obj in HitObjects]
+                    HTdc.DrawEllipseList(Shapes[HitAble], HitPens, HitBrushes)
+
 class SquarePoint(XYObjectMixin, ColorOnlyMixin, DrawObject):
     """
     Draws a square point
@@ -1211,6 +1533,10 @@ class SquarePoint(XYObjectMixin, ColorOnlyMixin, DrawObject):
                 HTdc.SetBrush(self.HitBrush)
                 HTdc.DrawRectangle(x, y, Size, Size)
 
+    def _HitTestPixel(self, xy, WorldToPixel, ScaleWorldToPixel):
+        d = N.abs(WorldToPixel(self.XY) - xy)
+        return bool(d.max() <= max(self.Size, self.HitLineWidth) / 2.0)
+
 class RectEllipse(XYObjectMixin, LineAndFillMixin, DrawObject):
     """A RectEllipse draw object."""
     def __init__(self, XY, WH,
@@ -1276,9 +1602,44 @@ class RectEllipse(XYObjectMixin, LineAndFillMixin, DrawObject):
         if self._Canvas:
             self._Canvas.BoundingBoxDirty = True
 
+    def _BatchKey(self):
+        if self.__class__ not in (Rectangle, Ellipse):
+            return None
+        return (self.__class__, id(self.Pen), id(self.Brush),
+                self.MinSize, self.DisappearWhenSmall)
+
+    @staticmethod
+    def _DrawBatch(Objects, dc, WorldToPixel, ScaleWorldToPixel, HTdc=None):
+        """
+        Draws a list of Rectangles, or of Ellipses, that all have the same
+        Pen, Brush, MinSize and DisappearWhenSmall.
+        """
+        First = Objects[0]
+        Shapes = N.empty((len(Objects), 4), N.int32)
+        Shapes[:,:2] = WorldToPixel(N.array([obj.XY for obj in Objects]))
+        WH = ScaleWorldToPixel(N.array([obj.WH for obj in Objects]))
+        WH[N.abs(WH) < First.MinSize] = First.MinSize
+        Shapes[:,2:] = WH
+        if First.DisappearWhenSmall: # don't try to draw them too tiny
+            Shown = N.abs(WH).min(1) > First.MinSize
+        else:
+            Shown = N.ones((len(Objects),), bool)
+        dc.SetPen(First.Pen)
+        dc.SetBrush(First.Brush)
+        getattr(dc, First._DrawListMethod)(Shapes[Shown])
+        if HTdc:
+            HitAble = _HitAbleMask(Objects) & Shown
+            if HitAble.any():
+                HitObjects = [obj for obj, hit in zip(Objects, HitAble) if hit]
+                getattr(HTdc, First._DrawListMethod)(Shapes[HitAble],
+                                           [obj.HitPen for obj in HitObjects],
+                                           [obj.HitBrush for obj in HitObjects])
+
 
 class Rectangle(RectEllipse):
     """Draws a rectangle see :class:`~lib.floatcanvas.FloatCanvas.RectEllipse`"""
+    _DrawListMethod = "DrawRectangleList" # used by _DrawBatch
+
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
         ( XY, WH ) = self.SetUpDraw(dc,
                                     WorldToPixel,
@@ -1290,9 +1651,22 @@ class Rectangle(RectEllipse):
             if HTdc and self.HitAble:
                 HTdc.DrawRectangle(XY, WH)
 
+    def _HitTestPixel(self, xy, WorldToPixel, ScaleWorldToPixel):
+        XY = WorldToPixel(self.XY)
+        WH = ScaleWorldToPixel(self.WH)
+        Tolerance = self.HitLineWidth / 2.0
+        if not _PointInRect(xy, XY, WH, Tolerance):
+            return False
+        elif self.HitFill:
+            return True
+        # just the outline: it must not be well inside.
+        return bool(self.HitLine and not _PointInRect(xy, XY, WH, -Tolerance))
+
 
 class Ellipse(RectEllipse):
     """Draws an ellipse see :class:`~lib.floatcanvas.FloatCanvas.RectEllipse`"""
+    _DrawListMethod = "DrawEllipseList" # used by _DrawBatch
+
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
         ( XY, WH ) = self.SetUpDraw(dc,
                                     WorldToPixel,
@@ -1304,6 +1678,22 @@ class Ellipse(RectEllipse):
             if HTdc and self.HitAble:
                 HTdc.DrawEllipse(XY, WH)
 
+    def _HitTestPixel(self, xy, WorldToPixel, ScaleWorldToPixel):
+        XY = WorldToPixel(self.XY)
+        WH = ScaleWorldToPixel(self.WH)
+        Center = XY + WH / 2.0
+        a, b = N.abs(WH) / 2.0
+        dx, dy = N.asarray(xy, N.float) - Center
+        Tolerance = self.HitLineWidth / 2.0
+        def Inside(a, b):
+            return a > 0 and b > 0 and (dx/a)**2 + (dy/b)**2 <= 1.0
+        if not Inside(a + Tolerance, b + Tolerance):
+            return False
+        elif self.HitFill:
+            return True
+        # just the outline: it must not be well inside.
+        return bool(self.HitLine and not Inside(a - Tolerance, b - Tolerance))
+
 class Circle(XYObjectMixin, LineAndFillMixin, DrawObject):
     """Draws a circle"""
     def __init__(self, XY, Diameter,
@@ -1376,6 +1766,50 @@ class Circle(XYObjectMixin, LineAndFillMixin, DrawObject):
             if HTdc and self.HitAble:
                 HTdc.DrawCircle(XY, WH[0])
 
+    def _HitTestPixel(self, xy, WorldToPixel, ScaleWorldToPixel):
+        Radius = abs(ScaleWorldToPixel(self.WH)[0])
+        Distance = N.hypot(*(WorldToPixel(self.XY) - xy))
+        Tolerance = self.HitLineWidth / 2.0
+        if self.HitFill:
+            return bool(Distance <= Radius + Tolerance)
+        return bool(self.HitLine and abs(Distance - Radius) <= Tolerance)
+
+    def _BatchKey(self):
+        if self.__class__ is not Circle:
+            return None
+        return (Circle, id(self.Pen), id(self.Brush),
+                self.MinSize, self.DisappearWhenSmall)
+
+    @staticmethod
+    def _DrawBatch(Objects, dc, WorldToPixel, ScaleWorldToPixel, HTdc=None):
+        """
+        Draws a list of Circles that all have the same Pen, Brush, MinSize
+        and DisappearWhenSmall.
+        """
+        First = Objects[0]
+        XY = WorldToPixel(N.array([obj.XY for obj in Objects]))
+        WH = ScaleWorldToPixel(N.array([obj.WH for obj in Objects]))
+        WH[N.abs(WH) < First.MinSize] = First.MinSize
+        if First.DisappearWhenSmall: # don't try to draw them too tiny
+            Shown = N.abs(WH).min(1) > First.MinSize
+        else:
+            Shown = N.ones((len(Objects),), bool)
+        # DrawCircle(x, y, r) is DrawEllipse(x-r, y-r, 2r, 2r)
+        Radius = WH[:,0:1]
+        Shapes = N.empty((len(Objects), 4), N.int32)
+        Shapes[:,:2] = XY - Radius
+        Shapes[:,2:] = 2 * Radius
+        dc.SetPen(First.Pen)
+        dc.SetBrush(First.Brush)
+        dc.DrawEllipseList(Shapes[Shown])
+        if HTdc:
+            HitAble = _HitAbleMask(Objects) & Shown
+            if HitAble.any():
+                HitObjects = [obj for obj, hit in zip(Objects, HitAble) if hit]
+                HTdc.DrawEllipseList(Shapes[HitAble],
+                                     [obj.HitPen for obj in HitObjects],
+                                     [obj.HitBrush for obj in HitObjects])
+
 
 class TextObjectMixin(XYObjectMixin):
     """
@@ -1385,27 +1819,50 @@ class TextObjectMixin(XYObjectMixin):
     """
 
     ## I'm caching fonts, because on GTK, getting a new font can take a
-    ## while. However, it gets cleared after every full draw as hanging
-    ## on to a bunch of large fonts takes a massive amount of memory.
+    ## while. However, hanging on to a bunch of large fonts takes a massive
+    ## amount of memory, so the cache is limited by the number of fonts and
+    ## by an estimate of their memory, the least recently used go first.
 
-    FontList = {}
+    FontList = FontCache.FontCache()
 
     LayoutFontSize = 16 # font size used for calculating layout
 
     def SetFont(self, Size, Family, Style, Weight, Underlined, FaceName):
-        self.Font = self.FontList.setdefault( (Size,
-                                               Family,
-                                               Style,
-                                               Weight,
-                                               Underlined,
-                                               FaceName),
-                                               #wx.FontFromPixelSize((0.45*Size,Size), # this seemed to give a decent height/width ratio on Windows
-                                               wx.Font(Size,
-                                                       Family,
-                                                       Style,
-                                                       Weight,
-                                                       Underlined,
-                                                       FaceName) )
+        self.Font = self.FontList.GetFont(Size,
+                                          Family,
+                                          Style,
+                                          Weight,
+                                          Underlined,
+                                          FaceName)
+
+    def _ScaledFontSize(self, ScaleWorldToPixel):
+        """
+        Returns the point size the text is drawn at with ScaleWorldToPixel,
+        or ``None`` if it is too small to be drawn.
+
+        Only for the text objects that scale with the zoom.
+        """
+        Size = abs( self._ToPixel(ScaleWorldToPixel, (self.Size, self.Size), "Size")[1] ) # only need a y coordinate length
+        ## Check to see if the font size is large enough to blow up the X font server
+        ## If so, limit it. Would it be better just to not draw it?
+        ## note that this limit is dependent on how much memory you have, etc.
+        Size = min(Size, self.MaxFontSize)
+        Size = max(Size, self.MinFontSize) # smallest size you want - default to 1
+        if self.DisappearWhenSmall and Size <= self.MinFontSize: # don't try to draw a zero sized font!
+            return None
+        return Size
+
+    def _GetScaledFont(self, Size):
+        """Returns the font to draw the text at Size points."""
+        return self.FontList.GetFont(Size, self.Family, self.Style,
+                                     self.Weight, self.Underlined, self.FaceName)
+
+    def _AddScaledFont(self, ScaleWorldToPixel, Fonts):
+        """Adds the font the text is drawn with to Fonts, see _GetDrawFonts."""
+        Size = self._ScaledFontSize(ScaleWorldToPixel)
+        if Size is not None:
+            Fonts[(Size, self.Family, self.Style, self.Weight,
+                   self.Underlined, self.FaceName)] = self._GetScaledFont(Size)
 
     def SetColor(self, Color):
         self.Color = Color
@@ -1557,6 +2014,13 @@ class Text(TextObjectMixin, DrawObject):
             HTdc.SetBrush(self.HitBrush)
             HTdc.DrawRectangle(XY, (self.TextWidth, self.TextHeight) )
 
+    def _HitTestPixel(self, xy, WorldToPixel, ScaleWorldToPixel):
+        if self.TextWidth is None or self.TextHeight is None:
+            return False # it hasn't been drawn yet
+        XY = WorldToPixel(self.XY)
+        XY = self.ShiftFun(XY[0], XY[1], self.TextWidth, self.TextHeight)
+        return _PointInRect(xy, XY, (self.TextWidth, self.TextHeight))
+
 class ScaledText(TextObjectMixin, DrawObject):
     """
     ##fixme: this can be depricated and jsut use ScaledTextBox with different defaults.
@@ -1688,21 +2152,18 @@ class ScaledText(TextObjectMixin, DrawObject):
         x, y = self.ShiftFun(self.XY[0], self.XY[1], w, h, world = 1)
         self.BoundingBox = BBox.asBBox(((x, y-h ),(x + w, y)))
 
+    def _GetDrawFonts(self, ScaleWorldToPixel, Fonts):
+        self._AddScaledFont(ScaleWorldToPixel, Fonts)
+
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
-        (X,Y) = WorldToPixel( (self.XY) )
+        (X,Y) = self._ToPixel(WorldToPixel, self.XY, "XY")
 
         # compute the font size:
-        Size = abs( ScaleWorldToPixel( (self.Size, self.Size) )[1] ) # only need a y coordinate length
-        ## Check to see if the font size is large enough to blow up the X font server
-        ## If so, limit it. Would it be better just to not draw it?
-        ## note that this limit is dependent on how much memory you have, etc.
-        Size = min(Size, self.MaxFontSize)
-        Size = max(Size, self.MinFontSize) # smallest size you want - default to 0
+        Size = self._ScaledFontSize(ScaleWorldToPixel)
 
         # Draw the Text
-        if not( self.DisappearWhenSmall and Size <=  self.MinFontSize) : # don't try to draw a zero sized font!
-            self.SetFont(Size, self.Family, self.Style, self.Weight, self.Underlined, self.FaceName)
-            dc.SetFont(self.Font)
+        if Size is not None:
+            dc.SetFont(self._GetScaledFont(Size))
             dc.SetTextForeground(self.Color)
             if self.BackgroundColor:
                 dc.SetBackgroundMode(wx.SOLID)
@@ -1968,6 +2429,7 @@ class ScaledTextBox(TextObjectMixin, DrawObject):
         #(x,y) = self.ShiftFun(self.XY[0], self.XY[1], BoxWidth, BoxHeight, world=1)
         Points += (0, -self.PadSize)
         self.Points = Points
+        self._WorldPoints = N.empty_like(Points) # scratch array for _Draw
         self.BoxWidth = BoxWidth
         self.BoxHeight = BoxHeight
         self.CalcBoundingBox()
@@ -1984,22 +2446,20 @@ class ScaledTextBox(TextObjectMixin, DrawObject):
 
         return (xy, wh)
 
+    def _GetDrawFonts(self, ScaleWorldToPixel, Fonts):
+        self._AddScaledFont(ScaleWorldToPixel, Fonts)
+
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
         xy, wh = self.GetBoxRect()
 
-        Points = self.Points + xy
-        Points = WorldToPixel(Points)
-        xy = WorldToPixel(xy)
-        wh = ScaleWorldToPixel(wh) * (1,-1)
+        Points = N.add(self.Points, xy, out=self._WorldPoints)
+        Points = self._ToPixel(WorldToPixel, Points, "Points")
+        xy = self._ToPixel(WorldToPixel, xy, "XY")
+        wh = self._ToPixel(ScaleWorldToPixel, wh, "WH")
+        wh[1] = -wh[1]
 
         # compute the font size:
-        Size = abs( ScaleWorldToPixel( (self.Size, self.Size) )[1] ) # only need a y coordinate length
-        ## Check to see if the font size is large enough to blow up the X font server
-        ## If so, limit it. Would it be better just to not draw it?
-        ## note that this limit is dependent on how much memory you have, etc.
-        Size = min(Size, self.MaxFontSize)
-
-        Size = max(Size, self.MinFontSize) # smallest size you want - default to 1
+        Size = self._ScaledFontSize(ScaleWorldToPixel)
 
         # Draw The Box
         if (self.LineStyle and self.LineColor) or self.BackgroundColor:
@@ -2008,9 +2468,8 @@ class ScaledTextBox(TextObjectMixin, DrawObject):
             dc.DrawRectangle(xy , wh)
 
         # Draw the Text
-        if not( self.DisappearWhenSmall and Size <=  self.MinFontSize) : # don't try to draw a zero sized font!
-            self.SetFont(Size, self.Family, self.Style, self.Weight, self.Underlined, self.FaceName)
-            dc.SetFont(self.Font)
+        if Size is not None:
+            dc.SetFont(self._GetScaledFont(Size))
             dc.SetTextForeground(self.Color)
             dc.SetBackgroundMode(wx.TRANSPARENT)
             dc.DrawTextList(self.Words, Points)
@@ -2085,6 +2544,11 @@ class Bitmap(TextObjectMixin, DrawObject):
             HTdc.SetBrush(self.HitBrush)
             HTdc.DrawRectangle(XY, (self.Width, self.Height) )
 
+    def _HitTestPixel(self, xy, WorldToPixel, ScaleWorldToPixel):
+        XY = WorldToPixel(self.XY)
+        XY = self.ShiftFun(XY[0], XY[1], self.Width, self.Height)
+        return _PointInRect(xy, XY, (self.Width, self.Height))
+
 class ScaledBitmap(TextObjectMixin, DrawObject):
     """
     Draws a scaled bitmap
@@ -2093,6 +2557,9 @@ class ScaledBitmap(TextObjectMixin, DrawObject):
 
     """
 
+    # it makes and caches the scaled wx.Bitmap when it is drawn
+    Threadable = False
+
     def __init__(self,
                  Bitmap,
                  XY,
@@ -2180,6 +2647,11 @@ class ScaledBitmap2(TextObjectMixin, DrawObject, ):
 
     """
 
+    # it draws just the part of the bitmap in the Canvas' viewport
+    Tileable = False
+    # and makes the wx.Bitmap of that part when it is drawn
+    Threadable = False
+
     def __init__(self,
                  Bitmap,
                  XY,
@@ -2747,6 +3219,20 @@ class Group(DrawObject):
         for obj in self.ObjectList:
             obj._Canvas = canvas
 
+    @property
+    def Tileable(self):
+        """
+        A Group can be drawn in tiles if all of its objects can be.
+        """
+        return all(obj.Tileable for obj in self.ObjectList)
+
+    @property
+    def Threadable(self):
+        """
+        A Group can be drawn by the rendering thread if all of its objects can be.
+        """
+        return all(obj.Threadable for obj in self.ObjectList)
+
     def AddObject(self, obj):
         """
         Add an object to the group.
@@ -2756,6 +3242,8 @@ class Group(DrawObject):
         """
         self.ObjectList.append(obj)
         self.BoundingBox.Merge(obj.BoundingBox)
+        if self._Canvas:
+            self._Canvas._BoundingBoxChanged(self)
 
     def AddObjects(self, Objects):
         """
@@ -2917,3 +3405,13 @@ class Group(DrawObject):
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel = None, HTdc=None):
         for obj in self.ObjectList:
             obj._Draw(dc, WorldToPixel, ScaleWorldToPixel, HTdc)
+
+    def _GetDrawFonts(self, ScaleWorldToPixel, Fonts):
+        for obj in self.ObjectList:
+            obj._GetDrawFonts(ScaleWorldToPixel, Fonts)
+
+    def _HitTestPixel(self, xy, WorldToPixel, ScaleWorldToPixel):
+        for obj in self.ObjectList:
+            if obj.Visible and obj._HitTestPixel(xy, WorldToPixel, ScaleWorldToPixel):
+                return True
+        return False
@@ -55,6 +55,9 @@ import six
 from .FCObjects import *
 
 from .Utilities import BBox
+from .Utilities import SpatialIndex
+from .Utilities import TileCache
+from .Utilities import RenderThread
 from . import GUIMode
 
 
@@ -192,15 +195,34 @@ class FloatCanvas(wx.Panel):
 
         self.HitColorGenerator = None
         self.UseHitTest = False
+        ## "Bitmap" or "Geometry", see SetHitTestMethod()
+        self.HitTestMethod = "Bitmap"
+        self.HitTestMargin = 32
 
         self.NumBetweenBlits = 500
 
+        ## draw runs of similar objects with the DC.Draw*List methods
+        self.BatchDraw = False
+
         ## create the Hit Test Dicts:
         self.HitDict = None
         self._HTdc = None
 
         self._DrawList = []
         self._ForeDrawList = []
+        ## spatial indexes of the draw lists, see SetSpatialIndex()
+        self._DrawIndex = None
+        self._ForeDrawIndex = None
+        ## cache of rendered background tiles, see SetTileCache()
+        self._TileCache = None
+        self.TileSize = 256
+        self.TileMargin = 32
+        ## scratch array for the projections, see _GetScratch()
+        self._Scratch = None
+        ## worker thread for the background, see SetThreadedDraw()
+        if getattr(self, "_Renderer", None) is not None:
+            self._Renderer.Stop()
+        self._Renderer = None
         self.InitializePanel()
         self.MakeNewBuffers()
         self.BoundingBox = BBox.NullBBox()
@@ -243,6 +265,224 @@ class FloatCanvas(wx.Panel):
                                    '(function, for instance) that takes the '
                                    'ViewPortCenter and returns a MapProjectionVector')
 
+    def SetSpatialIndex(self, UseIndex=True, CellSize=None):
+        """
+        Turn on (or off) a spatial index of the objects on the Canvas.
+
+        By default, every time the Canvas is drawn, every object is checked
+        to see if it is in the viewport. With the spatial index on, only
+        the objects near the viewport are checked, which makes panning and
+        zooming much faster when there are a lot of objects, most of which
+        are off screen.
+
+        The index is kept up to date as objects are added, removed or moved
+        with the DrawObject methods. If you change the draw lists directly,
+        call this method again to rebuild the index.
+
+        :param boolean `UseIndex`: ``True`` to use a spatial index
+        :param float `CellSize`: the size, in world coordinates, of the
+         smallest cell of the index grid. It should be roughly the size of the
+         smaller objects on the canvas. If ``None``, it is computed from the
+         extent of the objects when the canvas is first drawn.
+
+        """
+        if UseIndex:
+            self._DrawIndex = SpatialIndex.GridIndex(CellSize)
+            for obj in self._DrawList:
+                self._DrawIndex.Insert(obj)
+            self._ForeDrawIndex = SpatialIndex.GridIndex(CellSize)
+            for obj in self._ForeDrawList:
+                self._ForeDrawIndex.Insert(obj)
+        else:
+            self._DrawIndex = None
+            self._ForeDrawIndex = None
+
+    def _GetSpatialIndex(self, InForeground):
+        """
+        Returns the spatial index for the foreground or background, or
+        ``None`` if the index is not in use.
+        """
+        if InForeground:
+            return self._ForeDrawIndex
+        else:
+            return self._DrawIndex
+
+    def _BoundingBoxChanged(self, Object):
+        """
+        Called by a DrawObject when its BoundingBox changes.
+        """
+        Index = self._GetSpatialIndex(Object.InForeground)
+        if Index is not None:
+            Index.Update(Object)
+        if not Object.InForeground:
+            self._InvalidateTiles()
+
+    def SetTileCache(self, UseTiles=True, TileSize=256, MaxTiles=128, Margin=32):
+        """
+        Turn on (or off) caching of the rendered background in tiles.
+
+        With the tile cache on, the background is rendered in square tiles
+        that are kept for as long as the scale and the objects on the canvas
+        do not change. Panning then only needs to render the tiles that have
+        just come into view, which makes dragging with
+        :class:`~lib.floatcanvas.GUIMode.GUIMove` smooth on large drawings.
+
+        The cache is thrown away whenever a background object is added,
+        removed or moved, or a draw is forced with ``Draw(Force=True)`` -- so
+        call that after changing the look of an object.
+
+        The tiles are not used while the hit test bitmap is in use, or when
+        there is a ``GridUnder``, as those are drawn for the whole window.
+
+        :param boolean `UseTiles`: ``True`` to use a tile cache
+        :param integer `TileSize`: width and height of a tile in pixels
+        :param integer `MaxTiles`: the maximum number of tiles kept, the least
+         recently used ones are thrown away first
+        :param integer `Margin`: extra space, in pixels, around each tile in
+         which objects are looked for, so that objects drawn bigger than their
+         bounding box (text, points, wide lines) are not cut off at the tile
+         edges
+
+        """
+        if UseTiles:
+            self._TileCache = TileCache.TileCache(MaxTiles)
+            self.TileSize = TileSize
+            self.TileMargin = Margin
+        else:
+            self._TileCache = None
+        self._BackgroundDirty = True
+
+    def SetThreadedDraw(self, Threaded=True):
+        """
+        Turn on (or off) drawing the background in a worker thread.
+
+        When it is on, :meth:`Draw` does not draw the background objects
+        itself: it hands a copy of the view (and the list of objects in it) to
+        a worker thread, which draws them into a :class:`wx.Image` through a
+        :class:`wx.GCDC` on a :class:`wx.GraphicsContext`. Meanwhile the last
+        background is shown, with the foreground drawn on top of it, so the
+        GUI does not freeze on big drawings. When the thread is done, the
+        image is swapped in as the background buffer on the GUI thread and
+        the Canvas is re-drawn.
+
+        Only the latest request is rendered: calling ``Draw`` again (after a
+        zoom or move, say) throws away a render that hasn't started yet, and
+        makes one that is running give up.
+
+        The thread is not used while the hit test bitmap is in use (see
+        :meth:`SetHitTestMethod`), or when there is a ``GridUnder``, as those
+        have to be drawn on the GUI thread. Note that the objects are drawn
+        with a GraphicsContext, so they are anti-aliased.
+
+        :param boolean `Threaded`: ``True`` to draw in a worker thread
+
+        """
+        if Threaded and self._Renderer is None:
+            self._Renderer = RenderThread.RenderThread(self._RenderBackground)
+            self.Bind(wx.EVT_WINDOW_DESTROY, self._OnDestroyRenderer)
+        elif not Threaded and self._Renderer is not None:
+            self._Renderer.Stop()
+            self._Renderer = None
+            self.Unbind(wx.EVT_WINDOW_DESTROY, handler=self._OnDestroyRenderer)
+        self._BackgroundDirty = True
+
+    def _OnDestroyRenderer(self, event):
+        if event.GetEventObject() is self and self._Renderer is not None:
+            self._Renderer.Stop()
+            self._Renderer = None
+        event.Skip()
+
+    def _UseThread(self):
+        """
+        Returns True if the background should be drawn by the worker thread.
+        """
+        return (self._Renderer is not None and
+                self._HTBitmap is None and
+                self.GridUnder is None)
+
+    def _StartBackgroundRender(self):
+        """
+        Hands the current view over to the worker thread to be drawn.
+
+        The fonts of the text objects are made here, on the GUI thread, and
+        handed over with the objects, so that the worker thread only draws.
+
+        Returns False, without starting anything, if one of the objects to draw
+        isn't Threadable, then the background has to be drawn here instead.
+        """
+        RedrawList = list(self._ObjectsInBB(self._DrawList, self.ViewPortBB))
+        for Object in RedrawList:
+            if Object.Visible and not Object.Threadable:
+                return False
+        Fonts = {}
+        for Object in RedrawList:
+            if Object.Visible:
+                Object._GetDrawFonts(self.ScaleWorldToPixel, Fonts)
+        Job = (tuple(self.PanelSize),
+               self.ViewPortCenter.copy(),
+               self.TransformVector.copy(),
+               RedrawList,
+               self.BackgroundBrush,
+               Fonts)
+        self._Renderer.Submit(Job)
+        return True
+
+    def _RenderBackground(self, Job, Generation):
+        """
+        Draws the background for Job, this is run in the worker thread.
+
+        It checks every NumBetweenBlits objects to see if the render is still
+        wanted, and hands the result to the GUI thread if it is.
+        """
+        PanelSize, ViewPortCenter, TransformVector, RedrawList, BackgroundBrush, Fonts = Job
+        HalfPanelSize = N.array(PanelSize, N.float) / 2
+
+        def WorldToPixel(Coordinates):
+            return (((N.asarray(Coordinates, N.float) - ViewPortCenter) *
+                     TransformVector) + HalfPanelSize).astype('i')
+
+        def ScaleWorldToPixel(Lengths):
+            return (N.asarray(Lengths, N.float) * TransformVector).astype('i')
+
+        Image = wx.Image(*PanelSize)
+        dc = wx.GCDC(wx.GraphicsContext.Create(Image))
+        dc.SetBackground(BackgroundBrush)
+        dc.Clear()
+        NumBetweenBlits = self.NumBetweenBlits
+        TextObjectMixin.FontList.SetThreadFonts(Fonts)
+        try:
+            for i in range(0, len(RedrawList), NumBetweenBlits):
+                if not self._Renderer or not self._Renderer.IsCurrent(Generation):
+                    return # a newer render has been asked for
+                self._DrawObjectList(dc,
+                                     RedrawList[i:i + NumBetweenBlits],
+                                     None,
+                                     WorldToPixel=WorldToPixel,
+                                     ScaleWorldToPixel=ScaleWorldToPixel)
+        finally:
+            TextObjectMixin.FontList.SetThreadFonts(None)
+        del dc # the drawing gets to the Image when the context is destroyed
+        wx.CallAfter(self._SwapInBackground, Generation, Image)
+
+    def _SwapInBackground(self, Generation, Image):
+        """
+        Puts a background rendered by the worker thread into the buffer, and
+        re-draws, on the GUI thread.
+        """
+        if (not self or self._Renderer is None or
+            not self._Renderer.IsCurrent(Generation) or
+            tuple(Image.GetSize()) != tuple(self.PanelSize)):
+            return # the Canvas is gone, or this render is out of date
+        self._Buffer = wx.Bitmap(Image)
+        self.Draw()
+
+    def _InvalidateTiles(self):
+        """
+        Throws away the cached background tiles.
+        """
+        if self._TileCache is not None:
+            self._TileCache.Clear()
+
     def FlatEarthProjection(self, CenterPoint):
         """
         Compute the scaling array for the flat-earth projection
@@ -335,6 +575,78 @@ class FloatCanvas(wx.Panel):
             hitcolor = dc.GetPixel( xy )
             return hitcolor.Get()
 
+    def SetHitTestMethod(self, Method):
+        """
+        Set how the Canvas finds the object under the mouse.
+
+        :param string `Method`: one of:
+
+         ================= ======================================================
+         Method            Description
+         ================= ======================================================
+         ``"Bitmap"``      the default: every HitAble object is drawn a second
+                           time, in a unique colour, into an off-screen bitmap
+                           the size of the Canvas, and the colour under the
+                           mouse is looked up.
+         ``"Geometry"``    no hit test bitmaps are used: the objects near the
+                           mouse are tested against their shape, in pixel
+                           coordinates. This saves the memory and drawing time
+                           of the bitmaps, which matters on big Canvases.
+         ================= ======================================================
+
+        With ``"Geometry"`` only the objects whose bounding box is within
+        ``HitTestMargin`` pixels of the mouse are tested, found with the
+        spatial index (see :meth:`SetSpatialIndex`) if there is one. Objects
+        that extend more than ``HitTestMargin`` pixels past their bounding box
+        (like :class:`~lib.floatcanvas.FCObjects.Text` and
+        :class:`~lib.floatcanvas.FCObjects.Bitmap`) will not be hit on the
+        part outside of it.
+
+        """
+        if Method not in ("Bitmap", "Geometry"):
+            raise FloatCanvasError('HitTestMethod must be either "Bitmap" or "Geometry"')
+        self.HitTestMethod = Method
+        if hasattr(self, "PanelSize"): # the buffers have been made already
+            self.MakeNewBuffers()
+
+    def _GetHitColor(self, xy):
+        """
+        Returns the hit colour of the object at the pixel xy, using the
+        current HitTestMethod.
+        """
+        if self.HitTestMethod == "Geometry":
+            Object = self._GeometricHitObject(xy)
+            if Object is None:
+                return None
+            return Object.HitColor
+        else:
+            return self.GetHitTestColor(xy)
+
+    def _GeometricHitObject(self, xy):
+        """
+        Returns the top HitAble object at the pixel xy, or None.
+
+        The foreground is tested first, then the background, each from the
+        last object drawn to the first.
+        """
+        xy = N.asarray(xy, N.float)
+        Margin = N.array((self.HitTestMargin, -self.HitTestMargin), N.float)
+        BB = BBox.fromPoints( (self.PixelToWorld(xy - Margin),
+                           self.PixelToWorld(xy + Margin)) )
+        for InForeground in (True, False):
+            Index = self._GetSpatialIndex(InForeground)
+            if Index is not None:
+                Candidates = Index.Query(BB)
+            elif InForeground:
+                Candidates = self._ShouldRedraw(self._ForeDrawList, BB)
+            else:
+                Candidates = self._ShouldRedraw(self._DrawList, BB)
+            for Object in reversed(Candidates):
+                if (Object.HitAble and Object.Visible and
+                    Object._HitTestPixel(xy, self.WorldToPixel, self.ScaleWorldToPixel)):
+                    return Object
+        return None
+
     def UnBindAll(self):
         """Removes all bindings to Objects."""
         self.HitDict = None
@@ -352,7 +664,7 @@ class FloatCanvas(wx.Panel):
         if self.HitDict:
             if HitEvent in self.HitDict:
                 xy = event.GetPosition()
-                color = self.GetHitTestColor( xy )
+                color = self._GetHitColor( xy )
                 if color in self.HitDict[ HitEvent ]:
                     Object = self.HitDict[ HitEvent ][color]
                     self._CallHitCallback(Object, xy, HitEvent)
@@ -368,7 +680,7 @@ class FloatCanvas(wx.Panel):
              self.HitDict[EVT_FC_LEAVE_OBJECT ]    )
             ):
             xy = event.GetPosition()
-            color = self.GetHitTestColor( xy )
+            color = self._GetHitColor( xy )
             OldObject = self.ObjectUnderMouse
             ObjectCallbackCalled = False
             if color in self.HitDict[ EVT_FC_ENTER_OBJECT ]:
@@ -500,6 +812,8 @@ class FloatCanvas(wx.Panel):
         """Make a new buffer."""
         ##fixme: this looks like tortured logic!
         self._BackgroundDirty = True
+        if self._Renderer is not None:
+            self._Renderer.Cancel()
         # Make new offscreen bitmap:
         self._Buffer = wx.Bitmap(*self.PanelSize)
         if self._ForeDrawList:
@@ -523,6 +837,9 @@ class FloatCanvas(wx.Panel):
         Off screen Bitmap used for Hit tests on background objects
 
         """
+        if self.HitTestMethod != "Bitmap":
+            self._HTBitmap = None
+            return
         self._HTBitmap = wx.Bitmap(self.PanelSize[0],
                                         self.PanelSize[1],
                                         depth=self.HitTestBitmapDepth)
@@ -535,6 +852,9 @@ class FloatCanvas(wx.Panel):
         Off screen Bitmap used for Hit tests on foreground objects
 
         """
+        if self.HitTestMethod != "Bitmap":
+            self._ForegroundHTBitmap = None
+            return
         self._ForegroundHTBitmap = wx.Bitmap(self.PanelSize[0],
                                                   self.PanelSize[1],
                                                   depth=self.HitTestBitmapDepth)
@@ -611,7 +931,15 @@ class FloatCanvas(wx.Panel):
 
         dc = wx.MemoryDC()
         dc.SelectObject(self._Buffer)
-        if self._BackgroundDirty or Force:
+        if Force:
+            self._InvalidateTiles()
+        if (self._BackgroundDirty or Force) and self._UseTiles() and self._DrawTiles(dc):
+            self._BackgroundDirty = False
+        elif ((self._BackgroundDirty or Force) and self._UseThread() and
+              self._StartBackgroundRender()):
+            ## the old background is shown until the new one is done
+            self._BackgroundDirty = False
+        elif self._BackgroundDirty or Force:
             dc.SetBackground(self.BackgroundBrush)
             dc.Clear()
             if self._HTBitmap is not None:
@@ -663,11 +991,9 @@ class FloatCanvas(wx.Panel):
             if self._HTBitmap is not None:
                 self._HTBitmap.SaveFile('junk.png', wx.BITMAP_TYPE_PNG)
 
-        ## Clear the font cache. If you don't do this, the X font server
-        ## starts to take up Massive amounts of memory This is mostly a
-        ## problem with very large fonts, that you get with scaled text
-        ## when zoomed in.
-        DrawObject.FontList = {}
+        ## Note: the font cache (TextObjectMixin.FontList) limits its own
+        ## size, so it no longer needs to be cleared here to keep the X font
+        ## server from taking up Massive amounts of memory.
 
     def _ShouldRedraw(DrawList, ViewPortBB):
         # lrk: Returns the objects that should be redrawn
@@ -837,6 +1163,9 @@ class FloatCanvas(wx.Panel):
 
         """
         ##fixme: Using the list.remove method is kind of slow
+        Index = self._GetSpatialIndex(Object.InForeground)
+        if Index is not None:
+            Index.Remove(Object)
         if Object.InForeground:
             self._ForeDrawList.remove(Object)
             if not self._ForeDrawList:
@@ -845,6 +1174,7 @@ class FloatCanvas(wx.Panel):
         else:
             self._DrawList.remove(Object)
             self._BackgroundDirty = True
+            self._InvalidateTiles()
         if ResetBB:
             self.BoundingBoxDirty = True
 
@@ -859,6 +1189,10 @@ class FloatCanvas(wx.Panel):
         """
         self._DrawList = []
         self._ForeDrawList = []
+        if self._DrawIndex is not None:
+            self._DrawIndex.Clear()
+            self._ForeDrawIndex.Clear()
+        self._InvalidateTiles()
         self._BackgroundDirty = True
         self.HitColorGenerator = None
         self.UseHitTest = False
@@ -902,27 +1236,57 @@ class FloatCanvas(wx.Panel):
                    (self.PanelSize/2))/self.TransformVector) +
                  self.ViewPortCenter)
 
-    def WorldToPixel(self,Coordinates):
+    def WorldToPixel(self,Coordinates, out=None):
         """
         This function will get passed to the drawing functions of the objects,
         to transform from world to pixel coordinates.
         Coordinates should be a NX2 array of (x,y) coordinates, or
         a 2-tuple, or sequence of 2-tuples.
-        """
-        #Note: this can be called by users code for various reasons, so N.asarray is needed.
-        return  (((N.asarray(Coordinates,N.float) -
-                   self.ViewPortCenter)*self.TransformVector)+
-                 (self.HalfPanelSize)).astype('i')
 
-    def ScaleWorldToPixel(self,Lengths):
+        If out, an integer array of the same shape as Coordinates, is given,
+        the result is put in it, and no new arrays are made.
+        """
+        if out is None:
+            #Note: this can be called by users code for various reasons, so N.asarray is needed.
+            return  (((N.asarray(Coordinates,N.float) -
+                       self.ViewPortCenter)*self.TransformVector)+
+                     (self.HalfPanelSize)).astype('i')
+        Scratch = self._GetScratch(out.shape)
+        N.subtract(Coordinates, self.ViewPortCenter, out=Scratch)
+        Scratch *= self.TransformVector
+        Scratch += self.HalfPanelSize
+        N.copyto(out, Scratch, casting='unsafe')
+        return out
+    WorldToPixel.TakesOut = True
+
+    def ScaleWorldToPixel(self,Lengths, out=None):
         """
         This function will get passed to the drawing functions of the objects,
         to Change a length from world to pixel coordinates.
 
         Lengths should be a NX2 array of (x,y) coordinates, or
         a 2-tuple, or sequence of 2-tuples.
+
+        If out, an integer array of the same shape as Lengths, is given, the
+        result is put in it, and no new arrays are made.
+        """
+        if out is None:
+            return  ( (N.asarray(Lengths, N.float)*self.TransformVector) ).astype('i')
+        Scratch = self._GetScratch(out.shape)
+        N.multiply(Lengths, self.TransformVector, out=Scratch)
+        N.copyto(out, Scratch, casting='unsafe')
+        return out
+    ScaleWorldToPixel.TakesOut = True
+
+    def _GetScratch(self, Shape):
+        """
+        Returns a float array of the given shape to do projections in. It is
+        a view on an array that is kept, and grown as needed, by the Canvas.
         """
-        return  ( (N.asarray(Lengths, N.float)*self.TransformVector) ).astype('i')
+        Size = int(N.prod(Shape))
+        if self._Scratch is None or self._Scratch.size < Size:
+            self._Scratch = N.empty(Size, N.float)
+        return self._Scratch[:Size].reshape(Shape)
 
     def ScalePixelToWorld(self,Lengths):
         """
@@ -951,6 +1315,10 @@ class FloatCanvas(wx.Panel):
         else:
             self._DrawList.append(obj)
             self._BackgroundDirty = True
+            self._InvalidateTiles()
+        Index = self._GetSpatialIndex(obj.InForeground)
+        if Index is not None:
+            Index.Insert(obj)
         self.BoundingBoxDirty = True
         return obj
 
@@ -971,18 +1339,199 @@ class FloatCanvas(wx.Panel):
         This function takes the list of objects and draws them to specified
         device context.
         """
+        self._DrawObjectList(dc, self._ObjectsInBB(DrawList, ViewPortBB),
+                             ScreenDC, HTdc)
+
+    def _ObjectsInBB(self, DrawList, BB):
+        """
+        Returns the objects in DrawList that overlap BB, in drawing order.
+
+        The spatial index is used, if there is one.
+        """
+        if DrawList is self._DrawList and self._DrawIndex is not None:
+            return self._DrawIndex.Query(BB)
+        elif DrawList is self._ForeDrawList and self._ForeDrawIndex is not None:
+            return self._ForeDrawIndex.Query(BB)
+        else:
+            return self._ShouldRedraw(DrawList, BB)
+
+    def _DrawObjectList(self, dc, RedrawList, ScreenDC, HTdc=None,
+                        WorldToPixel=None, ScaleWorldToPixel=None):
+        """
+        Draws all the visible objects in RedrawList to dc.
+
+        The work so far is blitted to ScreenDC every NumBetweenBlits objects,
+        unless ScreenDC is None. WorldToPixel and ScaleWorldToPixel can be
+        passed in to draw to a DC that is not the size and position of the
+        Canvas, or with a view other than the current one.
+        """
         dc.SetBackground(self.BackgroundBrush)
         #i = 0
         PanelSize0, PanelSize1 = self.PanelSize # for speed
-        WorldToPixel = self.WorldToPixel # for speed
-        ScaleWorldToPixel = self.ScaleWorldToPixel # for speed
-        Blit = ScreenDC.Blit # for speed
+        if WorldToPixel is None:
+            WorldToPixel = self.WorldToPixel # for speed
+        if ScaleWorldToPixel is None:
+            ScaleWorldToPixel = self.ScaleWorldToPixel # for speed
         NumBetweenBlits = self.NumBetweenBlits # for speed
-        for i, Object in enumerate(self._ShouldRedraw(DrawList, ViewPortBB)):
+        if self.BatchDraw:
+            self._DrawObjectsBatched(dc, RedrawList, ScreenDC, HTdc,
+                                     WorldToPixel, ScaleWorldToPixel)
+            return
+        for i, Object in enumerate(RedrawList):
             if Object.Visible:
                 Object._Draw(dc, WorldToPixel, ScaleWorldToPixel, HTdc)
-                if (i+1) % NumBetweenBlits == 0:
-                    Blit(0, 0, PanelSize0, PanelSize1, dc, 0, 0)
+                if ScreenDC is not None and (i+1) % NumBetweenBlits == 0:
+                    ScreenDC.Blit(0, 0, PanelSize0, PanelSize1, dc, 0, 0)
+
+    def _DrawObjectsBatched(self, dc, RedrawList, ScreenDC, HTdc,
+                            WorldToPixel, ScaleWorldToPixel):
+        """
+        Draws the objects in RedrawList, drawing each run of consecutive
+        objects with the same batch key (same class, pen, brush, etc.) with a
+        single call to the class's _DrawBatch method.
+
+        The drawing order is not changed, so the result is the same as
+        drawing each object on its own.
+        """
+        PanelSize0, PanelSize1 = self.PanelSize # for speed
+        NumBetweenBlits = self.NumBetweenBlits # for speed
+        def DrawBatch(Batch):
+            if len(Batch) == 1:
+                Batch[0]._Draw(dc, WorldToPixel, ScaleWorldToPixel, HTdc)
+            elif Batch:
+                Batch[0]._DrawBatch(Batch, dc, WorldToPixel, ScaleWorldToPixel, HTdc)
+            return len(Batch)
+
+        Batch = []
+        BatchKey = None
+        NumDrawn = 0
+        for Object in RedrawList:
+            if not Object.Visible:
+                continue
+            Key = Object._BatchKey()
+            if Key is not None and Key == BatchKey:
+                Batch.append(Object)
+                continue
+            NumDrawn += DrawBatch(Batch)
+            if NumDrawn >= NumBetweenBlits:
+                if ScreenDC is not None:
+                    ScreenDC.Blit(0, 0, PanelSize0, PanelSize1, dc, 0, 0)
+                NumDrawn = 0
+            Batch = [Object]
+            BatchKey = Key
+        DrawBatch(Batch)
+
+    def _UseTiles(self):
+        """
+        Returns True if the background should be drawn from the tile cache.
+        """
+        return (self._TileCache is not None and
+                self._HTBitmap is None and
+                self.GridUnder is None)
+
+    def _TilePixelToWorldBB(self, TopLeft, BottomRight):
+        """
+        Converts a box in tile pixel coordinates (world coordinates times the
+        TransformVector) to a world coordinate BBox.
+        """
+        Corners = N.array((TopLeft, BottomRight), N.float) / self.TransformVector
+        return BBox.fromPoints(Corners)
+
+    def _DrawTiles(self, dc):
+        """
+        Draws the background to dc from the tile cache, rendering any tiles
+        that are not in the cache.
+
+        Tiles are on a grid that is fixed in world coordinates for a given
+        TransformVector, so they can be re-used as the image is moved.
+
+        Returns False, without drawing anything, if there are objects to be
+        drawn that can not be drawn in tiles.
+        """
+        Cache = self._TileCache
+        TileSize = self.TileSize
+        ScaleKey = tuple(self.TransformVector)
+        # The tile pixel coordinates of the top left corner of the window
+        OffsetX, OffsetY = N.round(self.ViewPortCenter * self.TransformVector -
+                                   self.HalfPanelSize).astype(int).tolist()
+        i0 = OffsetX // TileSize
+        j0 = OffsetY // TileSize
+        i1 = (OffsetX + int(self.PanelSize[0]) - 1) // TileSize
+        j1 = (OffsetY + int(self.PanelSize[1]) - 1) // TileSize
+
+        # find the tiles we have, and collect runs of the missing ones.
+        Tiles = []
+        Missing = []
+        for j in range(j0, j1+1):
+            Run = []
+            for i in range(i0, i1+1):
+                Tile = Cache.Get((ScaleKey, i, j))
+                if Tile is None:
+                    Run.append(i)
+                    continue
+                if Run:
+                    Missing.append((j, Run))
+                    Run = []
+                Tiles.append((Tile, i, j))
+            if Run:
+                Missing.append((j, Run))
+
+        if Missing:
+            # look up the objects once, for all of the missing tiles
+            Margin = self.TileMargin
+            Top = min(j for j, Run in Missing) * TileSize
+            Bottom = (max(j for j, Run in Missing) + 1) * TileSize
+            Left = min(Run[0] for j, Run in Missing) * TileSize
+            Right = (max(Run[-1] for j, Run in Missing) + 1) * TileSize
+            BB = self._TilePixelToWorldBB((Left - Margin, Top - Margin),
+                                          (Right + Margin, Bottom + Margin))
+            Candidates = self._ObjectsInBB(self._DrawList, BB)
+            for obj in Candidates:
+                if not obj.Tileable:
+                    return False
+
+        dc.SetBackground(self.BackgroundBrush)
+        dc.Clear()
+        for Tile, i, j in Tiles:
+            dc.DrawBitmap(Tile, i*TileSize - OffsetX, j*TileSize - OffsetY)
+        # render each run of missing tiles as one strip, then cut it up
+        for j, Run in Missing:
+            Strip = self._RenderTileStrip(Candidates, Run[0], j, len(Run))
+            for k, i in enumerate(Run):
+                Tile = Strip.GetSubBitmap(wx.Rect(k*TileSize, 0, TileSize, TileSize))
+                Cache.Put((ScaleKey, i, j), Tile)
+            dc.DrawBitmap(Strip, Run[0]*TileSize - OffsetX, j*TileSize - OffsetY)
+        return True
+
+    def _RenderTileStrip(self, Candidates, i, j, NumTiles):
+        """
+        Renders a horizontal strip of NumTiles tiles, starting with tile (i, j),
+        and returns it as a wx.Bitmap.
+        """
+        TileSize = self.TileSize
+        Margin = self.TileMargin
+        TransformVector = self.TransformVector
+        Origin = N.array((i * TileSize, j * TileSize), N.float)
+        StripBB = self._TilePixelToWorldBB(Origin - Margin,
+                                           Origin + (NumTiles * TileSize + Margin,
+                                                     TileSize + Margin))
+        # floor, not astype alone, which rounds towards zero, so that the
+        # tiles each side of pixel zero line up
+        def WorldToPixel(Coordinates):
+            return N.floor((N.asarray(Coordinates, N.float) * TransformVector) -
+                           Origin).astype('i')
+
+        Strip = wx.Bitmap(NumTiles * TileSize, TileSize)
+        dc = wx.MemoryDC()
+        dc.SelectObject(Strip)
+        dc.SetBackground(self.BackgroundBrush)
+        dc.Clear()
+        self._DrawObjectList(dc,
+                             [obj for obj in Candidates if obj.BoundingBox.Overlaps(StripBB)],
+                             None,
+                             WorldToPixel=WorldToPixel)
+        dc.SelectObject(wx.NullBitmap)
+        return Strip
 
     def SaveAsImage(self, filename, ImageType=wx.BITMAP_TYPE_PNG):
         """
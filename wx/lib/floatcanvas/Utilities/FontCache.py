@@ -0,0 +1,123 @@
+#----------------------------------------------------------------------------
+# Name:         FontCache.py
+# Purpose:      A size limited cache of the fonts used by FloatCanvas text
+#
+# Author:
+#
+# Created:
+# Version:
+# Date:
+# Licence:
+# Tags:         phoenix-port
+#----------------------------------------------------------------------------
+"""
+A least-recently-used cache of :class:`wx.Font` objects, used by the
+FloatCanvas text objects.
+
+Getting a new font can take a while (on GTK in particular), so they are worth
+keeping, but scaled text that is zoomed in uses very large fonts, and hanging
+on to a bunch of those takes a massive amount of memory (in the X font server,
+for instance). So the cache is limited both in the number of fonts it holds
+and in an estimate of the memory they use, which grows with the square of the
+font size.
+
+The cache can be used from more than one thread, but wx fonts should only be
+made on the GUI thread: a thread that draws can be handed the fonts it needs,
+made beforehand, with :meth:`FontCache.SetThreadFonts`.
+
+"""
+
+from collections import OrderedDict
+import threading
+
+import wx
+
+
+class FontCache(object):
+    """
+    A least-recently-used cache of fonts, limited by count and by memory.
+
+    """
+
+    ## rough number of glyphs rendered for each font, used to estimate memory
+    GlyphsPerFont = 128
+
+    def __init__(self, MaxFonts=128, MaxMemory=64 * 2**20):
+        """
+        Default class constructor.
+
+        :param integer `MaxFonts`: the maximum number of fonts to keep
+        :param integer `MaxMemory`: the maximum estimated memory, in bytes, of
+         the fonts kept. A font that is bigger than this on its own is only
+         kept until the next font is made.
+
+        """
+        self.MaxFonts = MaxFonts
+        self.MaxMemory = MaxMemory
+        self._Lock = threading.RLock()
+        self._Local = threading.local()
+        self.Clear()
+
+    def __len__(self):
+        return len(self._Fonts)
+
+    def __contains__(self, key):
+        return key in self._Fonts
+
+    def EstimateMemory(self, Size):
+        """
+        Returns the estimated memory, in bytes, used by a font of Size points.
+
+        :param integer `Size`: the point size of the font
+
+        """
+        return self.GlyphsPerFont * Size * Size
+
+    def GetFont(self, Size, Family, Style, Weight, Underlined, FaceName):
+        """
+        Returns a :class:`wx.Font` with these attributes, making it if it is
+        not in the cache.
+
+        The parameters are passed on to :class:`wx.Font`.
+
+        """
+        key = (Size, Family, Style, Weight, Underlined, FaceName)
+        ThreadFonts = getattr(self._Local, "Fonts", None)
+        if ThreadFonts is not None and key in ThreadFonts:
+            return ThreadFonts[key]
+        with self._Lock:
+            try:
+                Font = self._Fonts.pop(key)
+            except KeyError:
+                Font = wx.Font(Size, Family, Style, Weight, Underlined, FaceName)
+                self.Memory += self.EstimateMemory(Size)
+                self._Fonts[key] = Font
+                self._Trim()
+            else:
+                self._Fonts[key] = Font # it's now the most recently used
+        return Font
+
+    def SetThreadFonts(self, Fonts):
+        """
+        Makes :meth:`GetFont`, in the calling thread only, return the fonts in
+        Fonts rather than look in the cache.
+
+        :param `Fonts`: a dict of :class:`wx.Font`, with ``(Size, Family,
+         Style, Weight, Underlined, FaceName)`` keys, or ``None`` to go back
+         to using the cache
+
+        """
+        self._Local.Fonts = Fonts
+
+    def Clear(self):
+        """Throw away all the fonts."""
+        with self._Lock:
+            self._Fonts = OrderedDict()
+            self.Memory = 0
+
+    def _Trim(self):
+        # the newest font is always kept, it's about to be used
+        while len(self._Fonts) > 1 and (len(self._Fonts) > self.MaxFonts or
+                                        self.Memory > self.MaxMemory):
+            key, Font = self._Fonts.popitem(last=False)
+            self.Memory -= self.EstimateMemory(key[0])
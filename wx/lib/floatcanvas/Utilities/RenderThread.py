@@ -0,0 +1,109 @@
+#----------------------------------------------------------------------------
+# Name:         RenderThread.py
+# Purpose:      A worker thread that renders only the latest request
+#
+# Author:
+#
+# Created:
+# Version:
+# Date:
+# Licence:
+# Tags:         phoenix-port
+#----------------------------------------------------------------------------
+"""
+A worker thread used by the :class:`~lib.floatcanvas.FloatCanvas.FloatCanvas`
+to render the background off the GUI thread.
+
+Only the most recently submitted job is ever run: submitting a job replaces
+any job that is still waiting, and makes the job that is running out of
+date. Every job gets a generation number, which the render function checks
+with :meth:`RenderThread.IsCurrent` every so often, so that it can give up
+as soon as its work is no longer wanted.
+
+"""
+
+import itertools
+import threading
+import traceback
+
+## generation numbers are unique across all the threads, so a render from a
+## thread that has been replaced can never be taken for a current one.
+_Generations = itertools.count(1)
+
+
+class RenderThread(object):
+    """
+    A daemon thread that runs a render function on the latest job submitted.
+
+    """
+
+    def __init__(self, RenderFun):
+        """
+        Default class constructor.
+
+        :param `RenderFun`: the function to run in the thread, it is called as
+         ``RenderFun(Job, Generation)``
+
+        """
+        self.RenderFun = RenderFun
+        self._Condition = threading.Condition()
+        self._Job = None
+        self._Generation = next(_Generations)
+        self._Stopped = False
+        self._Thread = threading.Thread(target=self._Run, name="FloatCanvasRender")
+        self._Thread.daemon = True
+        self._Thread.start()
+
+    def Submit(self, Job):
+        """
+        Ask for Job to be rendered, in place of anything asked for before.
+
+        Returns the generation number of the job.
+
+        :param `Job`: whatever the render function needs, it is passed on
+         untouched
+
+        """
+        with self._Condition:
+            self._Generation = next(_Generations)
+            self._Job = (self._Generation, Job)
+            self._Condition.notify()
+            return self._Generation
+
+    def Cancel(self):
+        """Throw away the waiting job, and make the running one out of date."""
+        with self._Condition:
+            self._Generation = next(_Generations)
+            self._Job = None
+
+    def IsCurrent(self, Generation):
+        """
+        Returns True if the job with this generation number is still wanted.
+
+        :param integer `Generation`: the number returned by :meth:`Submit`
+
+        """
+        return Generation == self._Generation and not self._Stopped
+
+    def Stop(self):
+        """Cancel any jobs, and let the thread finish."""
+        with self._Condition:
+            self._Stopped = True
+            self._Generation = next(_Generations)
+            self._Job = None
+            self._Condition.notify()
+
+    def _Run(self):
+        while True:
+            with self._Condition:
+                while self._Job is None and not self._Stopped:
+                    self._Condition.wait()
+                if self._Stopped:
+                    return
+                Generation, Job = self._Job
+                self._Job = None
+            try:
+                self.RenderFun(Job, Generation)
+            except Exception:
+                # don't let one bad render stop all the ones after it
+                traceback.print_exc()
@@ -0,0 +1,214 @@
+#----------------------------------------------------------------------------
+# Name:         SpatialIndex.py
+# Purpose:      A spatial index for culling FloatCanvas DrawObjects
+#
+# Author:
+#
+# Created:
+# Version:
+# Date:
+# Licence:
+# Tags:         phoenix-port
+#----------------------------------------------------------------------------
+"""
+A hierarchical grid spatial index, used by the
+:class:`~lib.floatcanvas.FloatCanvas.FloatCanvas` to find the objects that
+overlap the viewport without testing every object on the canvas.
+
+Objects are put in a "loose" grid: each object is stored in exactly one cell,
+the one holding the minimum corner of its bounding box, on the level whose
+cell size is at least as large as the object. A query then only has to look
+at the cells that cover the query box, plus one row and column of cells on
+the low side, on each level that has objects in it.
+
+Any object with a ``BoundingBox`` attribute (a :class:`~lib.floatcanvas.Utilities.BBox.BBox`)
+can be indexed.
+
+"""
+
+import math
+
+import numpy as N
+
+
+class GridIndex(object):
+    """
+    A hierarchical grid of buckets holding objects by their bounding box.
+
+    Query results are returned in the order in which the objects were
+    inserted, so that the index can stand in for a FloatCanvas draw list.
+
+    """
+
+    ## the number of cells across the extent of the data used when the
+    ## CellSize is computed automatically.
+    AutoCellsAcross = 256
+
+    def __init__(self, CellSize=None):
+        """
+        Default class constructor.
+
+        :param float `CellSize`: the size, in world coordinates, of the
+         smallest grid cell. If ``None`` it is computed from the extent of the
+         objects in the index the first time it is queried.
+
+        """
+        self.CellSize = CellSize
+        self.Clear()
+
+    def Clear(self):
+        """Remove all the objects from the index."""
+        self._Levels = {}       # level -> {(ix, iy): {id(obj): (seq, obj)}}
+        self._Unbounded = {}    # id(obj) -> (seq, obj) for infinite BBs
+        self._Entries = {}      # id(obj) -> (seq, obj, level, cell)
+        self._Unplaced = {}     # id(obj) -> (seq, obj), waiting for a CellSize
+        self._Counter = 0
+
+    def __len__(self):
+        return len(self._Entries)
+
+    def __contains__(self, obj):
+        return id(obj) in self._Entries
+
+    def Insert(self, obj):
+        """
+        Add an object to the index.
+
+        :param `obj`: the object to add, it must have a ``BoundingBox``
+
+        """
+        if id(obj) in self._Entries:
+            self.Remove(obj)
+        seq = self._Counter
+        self._Counter += 1
+        self._Place(seq, obj)
+
+    def Remove(self, obj):
+        """
+        Remove an object from the index, does nothing if it is not in there.
+
+        :param `obj`: the object to remove
+
+        """
+        entry = self._Entries.pop(id(obj), None)
+        if entry is None:
+            return
+        seq, obj, level, cell = entry
+        if level is None:
+            self._Unbounded.pop(id(obj), None)
+            self._Unplaced.pop(id(obj), None)
+        else:
+            cells = self._Levels[level]
+            bucket = cells[cell]
+            del bucket[id(obj)]
+            if not bucket:
+                del cells[cell]
+                if not cells:
+                    del self._Levels[level]
+
+    def Update(self, obj):
+        """
+        Re-file an object whose bounding box has changed.
+
+        The object keeps its place in the drawing order. Objects that are
+        not in the index are ignored.
+
+        :param `obj`: the object that has changed
+
+        """
+        entry = self._Entries.get(id(obj))
+        if entry is None:
+            return
+        seq = entry[0]
+        self.Remove(obj)
+        self._Place(seq, obj)
+
+    def Query(self, BB):
+        """
+        Returns a list of the objects whose bounding box overlaps BB, in the
+        order they were inserted.
+
+        :param `BB`: a :class:`~lib.floatcanvas.Utilities.BBox.BBox`, or a 2x2
+         array of ((MinX, MinY), (MaxX, MaxY))
+
+        """
+        if self._Unplaced:
+            self._PlaceAll()
+        found = list(self._Unbounded.values())
+        if self._Levels:
+            (x0, y0), (x1, y1) = BB[0], BB[1]
+            if not N.isfinite((x0, y0, x1, y1)).all():
+                # an infinite query box: everything is a candidate
+                for cells in self._Levels.values():
+                    for bucket in cells.values():
+                        found.extend(bucket.values())
+            else:
+                for level, cells in self._Levels.items():
+                    size = self._LevelSize(level)
+                    # one extra cell on the low side, as objects can stick
+                    # out of their cell by up to one cell size.
+                    ix0 = int(math.floor(x0 / size)) - 1
+                    iy0 = int(math.floor(y0 / size)) - 1
+                    ix1 = int(math.floor(x1 / size))
+                    iy1 = int(math.floor(y1 / size))
+                    if (ix1 - ix0 + 1) * (iy1 - iy0 + 1) > len(cells):
+                        # fewer occupied cells than cells in range
+                        for (ix, iy), bucket in cells.items():
+                            if ix0 <= ix <= ix1 and iy0 <= iy <= iy1:
+                                found.extend(bucket.values())
+                    else:
+                        get = cells.get
+                        for ix in range(ix0, ix1 + 1):
+                            for iy in range(iy0, iy1 + 1):
+                                bucket = get((ix, iy))
+                                if bucket:
+                                    found.extend(bucket.values())
+        found.sort(key=lambda item: item[0])
+        return [obj for seq, obj in found if obj.BoundingBox.Overlaps(BB)]
+
+    def _LevelSize(self, level):
+        return self.CellSize * 2.0**level
+
+    def _Place(self, seq, obj):
+        BB = obj.BoundingBox
+        if N.isnan(BB).any():
+            # a Null BB is never visible, but we need to remember it's here.
+            self._Entries[id(obj)] = (seq, obj, None, None)
+            return
+        if not N.isfinite(BB).all():
+            self._Unbounded[id(obj)] = (seq, obj)
+            self._Entries[id(obj)] = (seq, obj, None, None)
+            return
+        if self.CellSize is None:
+            self._Unplaced[id(obj)] = (seq, obj)
+            self._Entries[id(obj)] = (seq, obj, None, None)
+            return
+        extent = max(BB[1, 0] - BB[0, 0], BB[1, 1] - BB[0, 1])
+        if extent <= self.CellSize:
+            level = 0
+        else:
+            level = int(math.ceil(math.log(extent / self.CellSize, 2)))
+            # guard against round-off in the log
+            while self._LevelSize(level) < extent:
+                level += 1
+        size = self._LevelSize(level)
+        cell = (int(math.floor(BB[0, 0] / size)),
+                int(math.floor(BB[0, 1] / size)))
+        cells = self._Levels.setdefault(level, {})
+        cells.setdefault(cell, {})[id(obj)] = (seq, obj)
+        self._Entries[id(obj)] = (seq, obj, level, cell)
+
+    def _PlaceAll(self):
+        """Compute the CellSize from the data, and file everything waiting for it."""
+        pending = sorted(self._Unplaced.values(), key=lambda item: item[0])
+        self._Unplaced = {}
+        if self.CellSize is None:
+            BBs = N.array([obj.BoundingBox for seq, obj in pending], N.float)
+            extent = max(BBs[:, 1, 0].max() - BBs[:, 0, 0].min(),
+                         BBs[:, 1, 1].max() - BBs[:, 0, 1].min())
+            if extent > 0:
+                self.CellSize = extent / self.AutoCellsAcross
+            else:
+                self.CellSize = 1.0
+        for seq, obj in pending:
+            self._Place(seq, obj)
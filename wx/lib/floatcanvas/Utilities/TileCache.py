@@ -0,0 +1,79 @@
+#----------------------------------------------------------------------------
+# Name:         TileCache.py
+# Purpose:      A least-recently-used cache of rendered FloatCanvas tiles
+#
+# Author:
+#
+# Created:
+# Version:
+# Date:
+# Licence:
+# Tags:         phoenix-port
+#----------------------------------------------------------------------------
+"""
+A small least-recently-used cache, used by the
+:class:`~lib.floatcanvas.FloatCanvas.FloatCanvas` to hold rendered tiles of
+the background, so that panning only has to render the parts of the
+background that have not been seen before at the current scale.
+
+"""
+
+from collections import OrderedDict
+
+
+class TileCache(object):
+    """
+    A least-recently-used cache of tiles.
+
+    The keys are whatever the caller wants them to be; the FloatCanvas uses
+    the transform vector (which holds the scale) and the tile coordinates.
+
+    """
+
+    def __init__(self, MaxTiles=128):
+        """
+        Default class constructor.
+
+        :param integer `MaxTiles`: the maximum number of tiles to keep, the
+         least recently used tiles are thrown away first.
+
+        """
+        self.MaxTiles = MaxTiles
+        self._Tiles = OrderedDict()
+
+    def __len__(self):
+        return len(self._Tiles)
+
+    def __contains__(self, key):
+        return key in self._Tiles
+
+    def Get(self, key):
+        """
+        Returns the tile stored under key, or ``None`` if there isn't one.
+
+        :param `key`: the key of the tile
+
+        """
+        try:
+            Tile = self._Tiles.pop(key)
+        except KeyError:
+            return None
+        self._Tiles[key] = Tile # it's now the most recently used
+        return Tile
+
+    def Put(self, key, Tile):
+        """
+        Stores a tile, throwing away the oldest ones if there are too many.
+
+        :param `key`: the key of the tile
+        :param `Tile`: the tile, usually a :class:`wx.Bitmap`
+
+        """
+        self._Tiles.pop(key, None)
+        self._Tiles[key] = Tile
+        while len(self._Tiles) > self.MaxTiles:
+            self._Tiles.popitem(last=False)
+
+    def Clear(self):
+        """Throw away all the tiles."""
+        self._Tiles.clear()
@@ -123,6 +123,9 @@ class PlotCanvas(wx.Panel):
         self._pointShift = 0
         self._xSpec = 'auto'
         self._ySpec = 'auto'
+        # the axes, labels and legend of the last Draw, used by RedrawData
+        self._layer = None
+        self._layerState = None
 
         # Initial Plot Options
         self._dragEnabled = False
@@ -1775,12 +1778,20 @@ class PlotCanvas(wx.Panel):
         """
 
         if dc is None:
-            # sets new dc and clears it
-            dc = wx.BufferedDC(wx.ClientDC(self.canvas), self._Buffer)
+            # everything but the data goes in a layer of its own, which is
+            # then copied to the buffer; RedrawData re-uses it when only the
+            # data has changed.
+            self._layer = wx.Bitmap(self._Buffer.GetWidth(),
+                                    self._Buffer.GetHeight())
+            layerDC = dc = wx.MemoryDC(self._layer)
             bbr = wx.Brush(self.GetBackgroundColour(), wx.BRUSHSTYLE_SOLID)
             dc.SetBackground(bbr)
             dc.SetBackgroundMode(wx.SOLID)
             dc.Clear()
+        else:
+            # printing: the scale is not the one on the screen
+            layerDC = None
+            self._layer = self._layerState = None
         if self._antiAliasingEnabled:
             if not isinstance(dc, wx.GCDC):
                 try:
@@ -1913,6 +1924,84 @@ class PlotCanvas(wx.Panel):
         self._pointShift = shift / self._pointSize
         self._drawPlotAreaItems(dc, p1, p2, scale, shift, xticks, yticks)
 
+        if layerDC is not None:
+            # finish the layer (a GCDC draws when it is destroyed), then draw
+            # the data over it in the buffer
+            dc = None
+            layerDC.SelectObject(wx.NullBitmap)
+            self._layerState = (graphics, p1, p2, scale, shift)
+            self._drawData()
+        else:
+            self._drawGraphics(dc, graphics, p1, p2, scale, shift)
+
+        self._adjustScrollbars()
+
+    def RedrawData(self, rescale=True):
+        """
+        Redraw the data of the last plot drawn, after its points have
+        changed, for instance with
+        :meth:`~wx.lib.plot.polyobjects.PolyPoints.extend`.
+
+        The axes, ticks, labels and legend are not drawn again: they are
+        copied from a bitmap kept by the last :meth:`Draw`, and only the data
+        is drawn over them. This makes it much cheaper to update a live plot
+        many times a second than calling :meth:`Draw` each time.
+
+        :param bool `rescale`: If ``True`` and the data has gone outside the
+                               current range of an axis, the range of that
+                               axis is worked out again from the
+                               :attr:`xSpec` or :attr:`ySpec` and the whole
+                               plot is drawn. If ``False`` the axes are kept
+                               as they are, and the data outside them is
+                               not seen.
+
+        .. seealso::
+
+           :meth:`~wx.lib.plot.polyobjects.PolyPoints.append`
+        """
+        if self.last_draw is None:
+            return
+        self.last_PointLabel = None  # reset pointLabel
+        graphics, xAxis, yAxis = self.last_draw
+        if rescale:
+            p1, p2 = graphics.boundingBox()
+            # keep any axis the data is still inside of
+            if p1[0] < min(xAxis) or p2[0] > max(xAxis):
+                xAxis = None
+            if p1[1] < min(yAxis) or p2[1] > max(yAxis):
+                yAxis = None
+            if xAxis is None or yAxis is None:
+                self._Draw(graphics, xAxis, yAxis)
+                return
+        if self._layerState is None or self._layerState[0] is not graphics:
+            # the layer was not drawn for this plot (it was printed, say)
+            self._Draw(graphics, xAxis, yAxis)
+            return
+        self._drawData()
+
+    def _drawData(self):
+        """
+        Copies the layer of the last Draw into the buffer, and draws the data
+        over it.
+        """
+        graphics, p1, p2, scale, shift = self._layerState
+        dc = wx.BufferedDC(wx.ClientDC(self.canvas), self._Buffer)
+        dc.DrawBitmap(self._layer, 0, 0)
+        if self._antiAliasingEnabled:
+            try:
+                dc = wx.GCDC(dc)
+            except Exception:
+                pass
+            else:
+                if self._hiResEnabled:
+                    dc.SetMapMode(wx.MM_TWIPS)
+        graphics._pointSize = self._pointSize
+        self._drawGraphics(dc, graphics, p1, p2, scale, shift)
+
+    def _drawGraphics(self, dc, graphics, p1, p2, scale, shift):
+        """
+        Draws the lines and markers, clipped to the plot area.
+        """
         graphics.scaleAndShift(scale, shift)
         # thicken up lines and markers if printing
         graphics.printerScale = self.printerScale
@@ -1932,8 +2021,6 @@ class PlotCanvas(wx.Panel):
         # remove the clipping region
         dc.DestroyClippingRegion()
 
-        self._adjustScrollbars()
-
     def Redraw(self, dc=None):
         """Redraw the existing plot."""
         if self.last_draw is not None:
@@ -1956,6 +2043,7 @@ class PlotCanvas(wx.Panel):
         dc.SetTextForeground(self.GetForegroundColour())
         dc.SetTextBackground(self.GetBackgroundColour())
         self.last_draw = None
+        self._layer = self._layerState = None
 
     def Zoom(self, Center, Ratio):
         """
@@ -1991,8 +2079,8 @@ class PlotCanvas(wx.Panel):
         graphics, xAxis, yAxis = self.last_draw
         l = []
         for curveNum, obj in enumerate(graphics):
-            # check there are points in the curve
-            if len(obj.points) == 0:
+            # check there are points in the curve, without copying them
+            if len(obj._transformedPoints()) == 0:
                 continue  # go to next obj
             #[curveNum, legend, closest pt index, pointXY, scaledXY, dist]
             cn = ([curveNum] +
@@ -17,6 +17,7 @@ import time as _time
 import wx
 import warnings
 from collections import namedtuple
+from collections import OrderedDict
 
 # Third-Party
 try:
@@ -34,6 +35,7 @@ except:
 from .utils import pendingDeprecation
 from .utils import TempStyle
 from .utils import pairwise
+from .utils import PointIndex
 
 
 class PolyPoints(object):
@@ -49,15 +51,22 @@ class PolyPoints(object):
        All methods are private.
     """
 
+    # curves with fewer points than this are searched point by point in
+    # getClosestPoint, rather than with an index
+    _indexMinPoints = 1000
+
     def __init__(self, points, attr):
         self._points = np.array(points).astype(np.float64)
+        self._store = None
+        self._maxLen = None
         self._logscale = (False, False)
         self._absScale = (False, False)
         self._symlogscale = (False, False)
         self._pointSize = (1.0, 1.0)
         self.currentScale = (1, 1)
         self.currentShift = (0, 0)
-        self.scaled = self.points
+        self._pointsChanged()
+        self.maxLen = attr.pop('maxLen', None)
         self.attributes = {}
         self.attributes.update(self._attributes)
         for name, value in attr.items():
@@ -83,7 +92,9 @@ class PolyPoints(object):
     def logScale(self, logscale):
         if not isinstance(logscale, tuple) or len(logscale) != 2:
             raise ValueError("`logscale` must be a 2-tuple of bools")
-        self._logscale = logscale
+        if logscale != self._logscale:
+            self._logscale = logscale
+            self._pointsChanged()
 
     def setLogScale(self, logscale):
         """
@@ -98,6 +109,7 @@ class PolyPoints(object):
         """
         pendingDeprecation("self.logScale property")
         self._logscale = logscale
+        self._pointsChanged()
 
     @property
     def symLogScale(self):
@@ -209,7 +221,9 @@ class PolyPoints(object):
 
         if not isinstance(absscale, tuple) and len(absscale) == 2:
             raise ValueError("`absscale` must be a 2-tuple of bools")
-        self._absScale = absscale
+        if absscale != self._absScale:
+            self._absScale = absscale
+            self._pointsChanged()
 
     @property
     def points(self):
@@ -226,6 +240,139 @@ class PolyPoints(object):
            Only set unscaled points - do not perform the log, abs, or symlog
            adjustments yourself.
         """
+        return np.array(self._transformedPoints(), copy=True)
+
+    @points.setter
+    def points(self, points):
+        self._points = points
+        self._store = None
+        self._pointsChanged()
+
+    @property
+    def maxLen(self):
+        """
+        The largest number of points kept by :meth:`append` and
+        :meth:`extend`, or ``None`` to keep them all. When there are more
+        points than this the oldest ones are dropped, so that a live plot
+        shows a window of the most recent data.
+
+        It can also be given as the ``maxLen`` keyword when the object is
+        created.
+
+        :getter: Returns the current value of maxLen
+        :setter: Sets the value of maxLen, dropping the oldest points if
+                 there are too many
+        :type: int or None
+        :raises ValueError: when setting an invalid value
+        """
+        return self._maxLen
+
+    @maxLen.setter
+    def maxLen(self, maxLen):
+        if maxLen is not None and maxLen < 1:
+            raise ValueError("`maxLen` must be None or a positive integer")
+        self._maxLen = maxLen
+        if maxLen is not None and len(self._points) > maxLen:
+            self.points = np.array(self._points[-maxLen:])
+
+    def append(self, point):
+        """
+        Add a point to the end of the data.
+
+        :param point: The point to add
+        :type point: ``(x, y)`` pair
+
+        .. seealso::
+
+           :meth:`extend`, :attr:`maxLen` and
+           :meth:`~wx.lib.plot.plotcanvas.PlotCanvas.RedrawData`.
+        """
+        self.extend((point, ))
+
+    def extend(self, points):
+        """
+        Add points to the end of the data.
+
+        The points are kept in a buffer with room to grow, so adding a few
+        points at a time does not copy all of the data each time. If
+        :attr:`maxLen` is set the buffer is a ring of twice that size, and
+        the oldest points are dropped.
+
+        :param points: The points to add
+        :type points: list of ``(x, y)`` pairs
+
+        .. seealso::
+
+           :meth:`append`, :attr:`maxLen` and
+           :meth:`~wx.lib.plot.plotcanvas.PlotCanvas.RedrawData`.
+        """
+        new = np.array(points, dtype=np.float64).reshape(-1, 2)
+        old = np.asarray(self._points, dtype=np.float64).reshape(-1, 2)
+        maxLen = self._maxLen
+        if maxLen is not None:
+            new = new[max(0, len(new) - maxLen):]
+            old = old[max(0, len(old) + len(new) - maxLen):]
+        count = len(old) + len(new)
+
+        store = self._store
+        if store is None:
+            start = 0
+        else:
+            # the points dropped from the front of the window
+            start = self._start + len(self._points) - len(old)
+        if store is None or start + count > len(store):
+            if maxLen is not None:
+                size = 2 * maxLen
+            else:
+                size = max(2 * count, 64)
+            if store is None or size > len(store):
+                store = np.empty((size, 2), dtype=np.float64)
+            # move the points we keep to the front of the buffer
+            store[:len(old)] = old
+            start = 0
+        store[start + len(old):start + count] = new
+
+        self._store = store
+        self._start = start
+        self._points = store[start:start + count]
+        self._pointsChanged()
+
+    @property
+    def scaled(self):
+        """
+        The points scaled and shifted to screen coordinates by the last call
+        to :meth:`scaleAndShift`. They are only computed when needed.
+        """
+        if self._scaled is None:
+            self._scaled = (self.currentScale * self._transformedPoints()
+                            + self.currentShift)
+        return self._scaled
+
+    @scaled.setter
+    def scaled(self, scaled):
+        self._scaled = scaled
+
+    def _pointsChanged(self):
+        """
+        Throw away everything computed from the points: call this after
+        changing the points, or the scales applied to them.
+        """
+        self._transformed = None
+        self._scaled = None
+        self._indexes = {}
+
+    def _transformedPoints(self):
+        """
+        Returns the points adjusted for the various scale options, as the
+        :attr:`points` property does, but without a copy: the array is kept
+        until the points or scales change, and must not be modified.
+        """
+        if self._transformed is None:
+            self._transformed = self._transformPoints()
+        return self._transformed
+
+    def _transformPoints(self):
+        """ Apply the Log, Abs, or SymLog adjustments to the points """
         data = np.array(self._points, copy=True)    # need the copy
                                                     # TODO: get rid of the
                                                     # need for copy
@@ -255,10 +402,6 @@ class PolyPoints(object):
 
         return data
 
-    @points.setter
-    def points(self, points):
-        self._points = points
-
     def _log10(self, data, index):
         """ Take the Log10 of the data, dropping any negative values """
         data = np.compress(data[:, index] > 0, data, 0)
@@ -280,14 +423,15 @@ class PolyPoints(object):
         :returns: boundingbox
         :rtype: numpy array of ``[[minX, minY], [maxX, maxY]]``
         """
-        if len(self.points) == 0:
+        data = self._transformedPoints()
+        if len(data) == 0:
             # no curves to draw
             # defaults to (-1,-1) and (1,1) but axis can be set in Draw
             minXY = np.array([-1.0, -1.0])
             maxXY = np.array([1.0, 1.0])
         else:
-            minXY = np.minimum.reduce(self.points)
-            maxXY = np.maximum.reduce(self.points)
+            minXY = np.minimum.reduce(data)
+            maxXY = np.maximum.reduce(data)
         return minXY, maxXY
 
     def scaleAndShift(self, scale=(1, 1), shift=(0, 0)):
@@ -301,7 +445,7 @@ class PolyPoints(object):
         :type shift: list of floats: ``[x_shift, y_shift]``
         :returns: None
         """
-        if len(self.points) == 0:
+        if len(self._transformedPoints()) == 0:
             # no curves to draw
             return
 
@@ -312,8 +456,10 @@ class PolyPoints(object):
         # cast everything to list: some might be np.ndarray objects
         if (list(scale) != list(self.currentScale)
                 or list(shift) != list(self.currentShift)):
-            # update point scaling
-            self.scaled = scale * self.points + shift
+            # update point scaling, it's computed when it's needed
+            self._scaled = None
+            if list(scale) != list(self.currentScale):
+                self._indexes.pop('scaled', None)
             self.currentScale = scale
             self.currentShift = shift
         # else unchanged use the current scaling
@@ -329,23 +475,53 @@ class PolyPoints(object):
         if pointScaled == True, then based on screen coords
         if pointScaled == False, then based on user coords
         """
+        data = self._transformedPoints()
         if pointScaled:
             # Using screen coords
             p = self.scaled
             pxy = self.currentScale * np.array(pntXY) + self.currentShift
         else:
             # Using user coords
-            p = self.points
+            p = data
             pxy = np.array(pntXY)
-        # determine distance for each point
-        d = np.sqrt(np.add.reduce((p - pxy) ** 2, 1))  # sqrt(dx^2+dy^2)
-        pntIndex = np.argmin(d)
-        dist = d[pntIndex]
+        closest = None
+        if len(p) >= self._indexMinPoints:
+            closest = self._closestIndexed(pxy, pointScaled)
+        if closest is None:
+            # determine distance for each point
+            d = np.sqrt(np.add.reduce((p - pxy) ** 2, 1))  # sqrt(dx^2+dy^2)
+            pntIndex = np.argmin(d)
+            dist = d[pntIndex]
+        else:
+            pntIndex, dist = closest
         return [pntIndex,
-                self.points[pntIndex],
+                np.array(data[pntIndex]),
                 self.scaled[pntIndex] / self._pointSize,
                 dist]
 
+    def _closestIndexed(self, pxy, pointScaled):
+        """
+        Find the closest point with a
+        :class:`~wx.lib.plot.utils.PointIndex`, which is built the first time
+        it is needed after the points or the scale change.
+
+        The screen coords index holds the points scaled but not shifted, so
+        it is still good after the plot has been dragged.
+
+        Returns ``(index, distance)``, or ``None`` if there are no finite
+        points.
+        """
+        key = 'scaled' if pointScaled else 'user'
+        index = self._indexes.get(key)
+        if index is None:
+            data = self._transformedPoints()
+            if pointScaled:
+                data = self.currentScale * data
+            index = self._indexes[key] = PointIndex(data)
+        if pointScaled:
+            pxy = pxy - self.currentShift
+        return index.closest(pxy)
+
 
 class PolyLine(PolyPoints):
     """
@@ -363,6 +539,7 @@ class PolyLine(PolyPoints):
     ``style=wx.PENSTYLE_SOLID``  Line style     :class:`wx.PenStyle`
     ``legend=''``                Legend string  str
     ``drawstyle='line'``         see below      str
+    ``decimate=False``           see below      bool
     ===========================  =============  ====================
 
     ==================  ==================================================
@@ -382,6 +559,15 @@ class PolyLine(PolyPoints):
                         *Note: This typically does not look very good*
     ==================  ==================================================
 
+    If ``decimate`` is ``True`` and the drawstyle is ``'line'``, a line whose
+    x values never decrease (a time series, say) is drawn from only the
+    first, last, lowest and highest points in each pixel column of the
+    visible part of the plot (M4 decimation). This looks the same as drawing
+    every point, but takes a time that depends on the width of the plot
+    rather than on the number of points, once the columns are found. The
+    points kept are cached for the last few zoom levels, and when the plot is
+    dragged only the newly visible columns are computed.
+
     .. warning::
 
        All methods except ``__init__`` are private.
@@ -392,13 +578,22 @@ class PolyLine(PolyPoints):
                    'style': wx.PENSTYLE_SOLID,
                    'legend': '',
                    'drawstyle': 'line',
+                   'decimate': False,
                    }
     _drawstyles = ("line", "steps-pre", "steps-post",
                    "steps-mid-x", "steps-mid-y")
 
+    # the number of zoom levels for which decimated points are kept
+    _envelopeCacheSize = 8
+
     def __init__(self, points, **attr):
         PolyPoints.__init__(self, points, attr)
 
+    def _pointsChanged(self):
+        PolyPoints._pointsChanged(self)
+        self._envelopes = OrderedDict()
+        self._xIsSorted = None
+
     def draw(self, dc, printerScale, coord=None):
         """
         Draw the lines.
@@ -421,12 +616,130 @@ class PolyLine(PolyPoints):
         pen.SetCap(wx.CAP_BUTT)
         dc.SetPen(pen)
         if coord is None:
-            if len(self.scaled):  # bugfix for Mac OS X
+            if (self.attributes['decimate'] and drawstyle == 'line'
+                    and self._canDecimate()):
+                self._drawDecimated(dc)
+            elif len(self.scaled):  # bugfix for Mac OS X
                 for c1, c2 in zip(self.scaled, self.scaled[1:]):
                     self._path(dc, c1, c2, drawstyle)
         else:
             dc.DrawLines(coord)  # draw legend line
 
+    def _canDecimate(self):
+        """
+        Returns True if the line can be drawn decimated: its x values must
+        be finite and never decrease, the y values finite, and the x axis
+        must not be flipped.
+        """
+        if self._xIsSorted is None:
+            data = self._transformedPoints()
+            self._xIsSorted = bool(len(data) > 1
+                                   and np.isfinite(data).all()
+                                   and (np.diff(data[:, 0]) >= 0).all())
+        return self._xIsSorted and self.currentScale[0] > 0
+
+    def _drawDecimated(self, dc):
+        """
+        Draws the visible part of the line from the first, last, lowest and
+        highest points of each pixel column.
+
+        :param dc: The DC to draw on.
+        :type dc: :class:`wx.DC`
+        """
+        data = self._transformedPoints()
+        x = data[:, 0]
+        xScale = self.currentScale[0]
+        xShift = self.currentShift[0]
+        # Columns are counted from a grid that only depends on the scale and
+        # the fractional part of the shift, so that it stays the same when
+        # the plot is dragged by whole pixels.
+        frac = xShift % 1.0
+        offset = xShift - frac
+        cx, cy, cw, ch = dc.GetClippingBox()
+        if cw > 0:
+            first = int(np.floor(cx - offset))
+            last = int(np.floor(cx + cw - offset))
+        else:
+            first = int(np.floor(x[0] * xScale + frac))
+            last = int(np.floor(x[-1] * xScale + frac))
+
+        key = (xScale, round(frac, 6) % 1.0)
+        idx = self._getEnvelope(key, x, data[:, 1], first, last)
+
+        # add the points just outside, so that lines run off the plot edges
+        lo = np.searchsorted(x, (first - frac) / xScale)
+        hi = np.searchsorted(x, (last + 1 - frac) / xScale)
+        idx = np.concatenate((np.arange(max(lo - 1, 0), lo),
+                              idx,
+                              np.arange(hi, min(hi + 1, len(x)))))
+        if len(idx) > 1:
+            dc.DrawLines(self.currentScale * data[idx] + self.currentShift)
+
+    def _getEnvelope(self, key, x, y, first, last):
+        """
+        Returns the indices of the points to draw for the pixel columns
+        ``first`` to ``last`` at the zoom level ``key``, using and extending
+        the cached ones.
+        """
+        xScale, frac = key
+        try:
+            cFirst, cLast, cIdx = self._envelopes.pop(key)
+        except KeyError:
+            cFirst, cLast, cIdx = first, last, None
+
+        if cIdx is None or first > cLast + 1 or last < cFirst - 1:
+            # nothing useful cached
+            cFirst, cLast = first, last
+            cIdx = self._envelopeIndices(x, y, first, last, xScale, frac)
+        else:
+            if first < cFirst:
+                left = self._envelopeIndices(x, y, first, cFirst - 1,
+                                             xScale, frac)
+                cIdx = np.concatenate((left, cIdx))
+                cFirst = first
+            if last > cLast:
+                right = self._envelopeIndices(x, y, cLast + 1, last,
+                                              xScale, frac)
+                cIdx = np.concatenate((cIdx, right))
+                cLast = last
+
+        self._envelopes[key] = (cFirst, cLast, cIdx)
+        while len(self._envelopes) > self._envelopeCacheSize:
+            self._envelopes.popitem(last=False)
+
+        # only the visible columns
+        lo = np.searchsorted(cIdx, np.searchsorted(x, (first - frac) / xScale))
+        hi = np.searchsorted(cIdx, np.searchsorted(x, (last + 1 - frac) / xScale))
+        return cIdx[lo:hi]
+
+    @staticmethod
+    def _envelopeIndices(x, y, first, last, xScale, frac):
+        """
+        Returns the sorted indices of the first, lowest, highest and last
+        point in each of the pixel columns ``first`` to ``last``.
+        """
+        lo = np.searchsorted(x, (first - frac) / xScale)
+        hi = np.searchsorted(x, (last + 1 - frac) / xScale)
+        if hi <= lo:
+            return np.zeros(0, np.intp)
+        cols = np.floor(x[lo:hi] * xScale + frac)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(cols)) + 1))
+        ends = np.append(starts[1:], hi - lo) - 1
+        ySlice = y[lo:hi]
+        counts = ends - starts + 1
+        positions = np.arange(hi - lo)
+        # the first position of the min and max in each column
+        mins = np.repeat(np.minimum.reduceat(ySlice, starts), counts)
+        maxs = np.repeat(np.maximum.reduceat(ySlice, starts), counts)
+        iMin = np.minimum.reduceat(
+            np.where(ySlice == mins, positions, hi - lo), starts)
+        iMax = np.minimum.reduceat(
+            np.where(ySlice == maxs, positions, hi - lo), starts)
+        idx = np.sort(np.column_stack((starts, iMin, iMax, ends)), axis=1)
+        idx = idx.ravel()
+        idx = idx[np.concatenate(([True], idx[1:] != idx[:-1]))]
+        return idx + lo
+
     def getSymExtent(self, printerScale):
         """
         Get the Width and Height of the symbol.
@@ -243,6 +243,179 @@ class TempStyle(object):
         dc.SetBrush(self.prevBrush)
 
 
+class PointIndex(object):
+    """
+    An index of 2D points, used to find the point closest to a position
+    without measuring the distance to every point.
+
+    If the x values never decrease (a time series, say) the search starts
+    with a binary search on x and works outwards until the points are
+    further away in x than the closest point found. Otherwise the points are
+    put in a grid of square cells, which is searched in rings of cells
+    around the cell of the position (or the cell of the grid nearest to it,
+    if the position is off the grid), until the cells left are further away
+    than the closest point found.
+
+    Of points at the same distance, the one with the lowest index is found,
+    as :func:`numpy.argmin` would.
+
+    :param points: The points to index. They are not copied, so they must
+                   not be changed while the index is in use.
+    :type points: numpy array of ``[x, y]`` values
+    """
+    # the average number of points in a cell of the grid
+    pointsPerCell = 4
+
+    def __init__(self, points):
+        self.points = points
+        x = points[:, 0]
+        finite = np.isfinite(points).all(axis=1)
+        self.isSorted = bool(finite.all() and np.all(x[1:] >= x[:-1]))
+        if not self.isSorted:
+            self._buildGrid(np.flatnonzero(finite))
+
+    def closest(self, pxy):
+        """
+        Find the point closest to a position.
+
+        :param pxy: The position
+        :type pxy: ``(x, y)`` pair
+        :returns: ``(index, distance)``, or ``None`` if none of the points
+                  are finite.
+        """
+        px, py = pxy
+        if self.isSorted:
+            return self._closestSorted(px, py)
+        return self._closestGrid(px, py)
+
+    def _distances(self, idx, px, py):
+        p = self.points[idx]
+        return np.sqrt((p[:, 0] - px) ** 2 + (p[:, 1] - py) ** 2)
+
+    def _closestSorted(self, px, py):
+        x = self.points[:, 0]
+        n = len(x)
+        lo = hi = int(np.searchsorted(x, px))
+        best = (np.inf, n)
+        block = 16
+        while True:
+            grew = False
+            if lo > 0 and px - x[lo - 1] <= best[0]:
+                start = max(0, lo - block)
+                best = self._better(best, np.arange(start, lo), px, py)
+                lo = start
+                grew = True
+            if hi < n and x[hi] - px <= best[0]:
+                stop = min(n, hi + block)
+                best = self._better(best, np.arange(hi, stop), px, py)
+                hi = stop
+                grew = True
+            if not grew:
+                break
+            block *= 2
+        if best[1] == n:
+            return None
+        return best[1], best[0]
+
+    def _better(self, best, idx, px, py):
+        """ The closer of best and the closest of the points idx """
+        d = self._distances(idx, px, py)
+        dist = d.min()
+        index = idx[d == dist].min()
+        if dist < best[0] or (dist == best[0] and index < best[1]):
+            return (dist, index)
+        return best
+
+    def _buildGrid(self, idx):
+        self._count = len(idx)
+        if not len(idx):
+            return
+        p = self.points[idx]
+        self._origin = p.min(axis=0)
+        self._corner = p.max(axis=0)
+        extent = self._corner - self._origin
+        nCells = max(1.0, len(idx) / float(self.pointsPerCell))
+        size = max(np.sqrt(extent[0] * extent[1] / nCells),
+                   extent.max() / nCells)
+        if not size > 0:
+            # all the points are in the same place
+            size = 1.0
+        self._size = size
+        cells = np.floor((p - self._origin) / size).astype(np.int64)
+        self._shape = cells.max(axis=0) + 1
+        keys = cells[:, 0] * self._shape[1] + cells[:, 1]
+        # stable, so the points in a cell stay in index order
+        order = np.argsort(keys, kind='mergesort')
+        self._order = idx[order]
+        self._keys, self._starts = np.unique(keys[order], return_index=True)
+        self._ends = np.append(self._starts[1:], len(order))
+
+    def _closestGrid(self, px, py):
+        if not self._count:
+            return None
+        nx, ny = self._shape
+        cx, cy = np.floor((np.array([px, py]) - self._origin) / self._size)
+        # start from the cell of the grid nearest to the position
+        cx = int(min(max(cx, 0), nx - 1))
+        cy = int(min(max(cy, 0), ny - 1))
+        best = (np.inf, len(self.points))
+        # search rings r0 to r1, twice as many each time round
+        r0 = r1 = 0
+        while True:
+            xs = np.arange(max(cx - r1, 0), min(cx + r1, nx - 1) + 1)
+            ys = np.arange(max(cy - r1, 0), min(cy + r1, ny - 1) + 1)
+            ix = np.repeat(xs, len(ys))
+            iy = np.tile(ys, len(xs))
+            keep = np.maximum(abs(ix - cx), abs(iy - cy)) >= r0
+            if best[0] < np.inf:
+                # leave out the cells further away than the closest point
+                left = self._origin[0] + ix * self._size
+                bottom = self._origin[1] + iy * self._size
+                dx = np.maximum(np.maximum(left - px, px - left - self._size), 0)
+                dy = np.maximum(np.maximum(bottom - py, py - bottom - self._size), 0)
+                keep &= np.hypot(dx, dy) <= best[0]
+            keys = ix[keep] * ny + iy[keep]
+            pos = np.searchsorted(self._keys, keys)
+            found = pos < len(self._keys)
+            pos, keys = pos[found], keys[found]
+            pos = pos[self._keys[pos] == keys]
+            if len(pos):
+                idx = np.concatenate([self._order[s:e] for s, e in
+                                      zip(self._starts[pos], self._ends[pos])])
+                best = self._better(best, idx, px, py)
+            # the cells not searched yet are at least this far away
+            dist = self._ringDistance(cx, cy, r1, px, py)
+            if dist is None or best[0] < dist:
+                break
+            r0, r1 = r1 + 1, 2 * r1 + 1
+        return best[1], best[0]
+
+    def _ringDistance(self, cx, cy, r, px, py):
+        """
+        The distance from the position to the cells of the grid outside of
+        the rings 0 to r around cell (cx, cy), or None if there are none.
+        """
+        nx, ny = self._shape
+        x0, y0 = self._origin
+        x1, y1 = self._corner
+        size = self._size
+        # the parts of the grid left, right, below and above the rings
+        rects = []
+        if cx - r > 0:
+            rects.append((x0, x0 + (cx - r) * size, y0, y1))
+        if cx + r < nx - 1:
+            rects.append((x0 + (cx + r + 1) * size, x1, y0, y1))
+        if cy - r > 0:
+            rects.append((x0, x1, y0, y0 + (cy - r) * size))
+        if cy + r < ny - 1:
+            rects.append((x0, x1, y0 + (cy + r + 1) * size, y1))
+        if not rects:
+            return None
+        return min(np.hypot(max(left - px, 0, px - right),
+                            max(bottom - py, 0, py - top))
+                   for left, right, bottom, top in rects)
+
+
 def pendingDeprecation(new_func):
     """
     Raise `PendingDeprecationWarning` and display a message.
@@ -29,6 +29,10 @@ class PublisherMixin:
         checking, set iterState, etc"""
         return None
 
+    def _mix_needsArgsFilter(self, topicObj):
+        """The data is sent as is to the listeners of every topic"""
+        return False
+
     def _mix_callListener(self, listener, data, iterState):
         """Send the data to given listener."""
         listener(self, data)
@@ -13,6 +13,7 @@ CallArgsInfo regarding its autoTopicArgName data member.
 """
 
 from inspect import getargspec, ismethod, isfunction
+from weakref import WeakKeyDictionary
 
 from .. import py2and3
 
@@ -175,9 +176,18 @@ class CallArgsInfo:
                 break
 
 
+# CallArgsInfo of the functions already inspected: function -> {firstArgIdx: info}
+_argsInfoCache = WeakKeyDictionary()
+
+
 def getArgs(callable_):
     """Returns an instance of CallArgsInfo for the given callable_.
-    Raises ListenerMismatchError if callable_ is not a callable."""
+    Raises ListenerMismatchError if callable_ is not a callable.
+
+    The CallArgsInfo is cached for the function underlying callable_, so
+    that the bound methods of all the instances of a class (or all the
+    instances of a functor class) share the same one, and the signature
+    is only inspected once. The CallArgsInfo returned must not be modified."""
     # figure out what is the actual function object to inspect:
     try:
         func, firstArgIdx = getRawFunction(callable_)
@@ -186,6 +196,18 @@ def getArgs(callable_):
         exc = py2and3.getexcobj()
         raise ListenerMismatchError(str(exc), callable_)
 
-    return CallArgsInfo(func, firstArgIdx)
+    rawFunc = getattr(func, '__func__', func)
+    try:
+        infos = _argsInfoCache.get(rawFunc)
+    except TypeError:
+        # can't be weakly referenced, so can't be cached
+        return CallArgsInfo(func, firstArgIdx)
+
+    if infos is None:
+        infos = _argsInfoCache[rawFunc] = {}
+    info = infos.get(firstArgIdx)
+    if info is None:
+        info = infos[firstArgIdx] = CallArgsInfo(func, firstArgIdx)
+    return info
 
 
@@ -56,6 +56,18 @@ class PublisherMixin:
         assert iterState is not None
         return iterState
 
+    def _mix_needsArgsFilter(self, topicObj):
+        """Return True if the message data sent to self must go through
+        _mix_prePublish before it is sent to the listeners of topicObj, an
+        ancestor of self. It need not if topicObj has the same message args
+        as self, since there is nothing to filter out. This is called once
+        per dispatch plan of self, not for every message."""
+        if not self.hasMDS():
+            # the args are checked by the first ancestor
+            return True
+        return (topicObj._getListenerSpec().allArgNames !=
+                self._getListenerSpec().allArgNames)
+
     def _mix_callListener(self, listener, msgKwargs, iterState):
         """Send the message for given topic with data in msgKwargs.
         This sends message to listeners of parent topics as well.
@@ -69,6 +69,7 @@ class ArgsInfo:
         self.allOptional = () # topic message optional arg names
         self.allDocs     = {} # doc for each arg
         self.allRequired = () # topic message required arg names
+        self.allArgNames = frozenset() # all of the above
         self.argsSpecType = self.SPEC_MISSING
         self.parentAI = WeakNone()
         if parentArgsInfo is not None:
@@ -144,7 +145,7 @@ class ArgsInfo:
         #newKwargs = dict( (key, val) for (key, val) in msgKwargs.iteritems() if key in argNames )
 
         # method 3: FASTEST:
-        argNames = set(self.getArgs()).intersection(msgKwargs)
+        argNames = self.allArgNames.intersection(msgKwargs)
         newKwargs = dict( (k,msgKwargs[k]) for k in argNames )
 
         return newKwargs
@@ -205,6 +206,7 @@ class ArgsInfo:
         self.allOptional = tuple( specGiven.getOptional() )
         self.allRequired = specGiven.reqdArgs
         self.allDocs     = specGiven.argsDocs.copy() # doc for each arg
+        self.allArgNames = frozenset(self.getArgs())
         self.argsSpecType= self.SPEC_COMPLETE
 
         if self.parentAI() is not None:
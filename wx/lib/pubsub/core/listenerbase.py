@@ -3,6 +3,8 @@
 :license: BSD, see LICENSE_BSD_Simple.txt for details.
 """
 
+from weakref import WeakKeyDictionary
+
 from . import weakmethod
 
 from .callables import (
@@ -147,6 +149,9 @@ class ValidatorBase:
         when sending a message to listener. The list is unordered. """
         self._topicArgs   = set(topicArgs)
         self._topicKwargs = set(topicKwargs)
+        # the CallArgsInfo that passed validation: they are shared by all the
+        # listeners with the same underlying function (see callables.getArgs)
+        self.__validArgsInfos = WeakKeyDictionary()
 
 
     def validate(self, listener):
@@ -163,7 +168,9 @@ class ValidatorBase:
         would cause a False to be returned. 
         """
         paramsInfo = getArgs( listener )
-        self._validateArgs(listener, paramsInfo)
+        if paramsInfo not in self.__validArgsInfos:
+            self._validateArgs(listener, paramsInfo)
+            self.__validArgsInfos[paramsInfo] = True
         return paramsInfo
 
 
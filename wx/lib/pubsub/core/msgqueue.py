@@ -0,0 +1,129 @@
+"""
+Queue of messages sent from any thread, to be delivered in batches by the
+thread that owns the listeners (the GUI thread, in a wxPython application).
+
+:copyright: Copyright since 2006 by Oliver Schoenborn, all rights reserved.
+:license: BSD, see LICENSE_BSD_Simple.txt for details.
+"""
+
+from collections import deque
+from threading import Lock
+
+from .topicutils import stringize
+
+
+def callAfter(func):
+    """Default scheduler of a MessageQueue: get func called once by the
+    wx main loop, via wx.CallAfter (which can be used from any thread)."""
+    import wx
+    wx.CallAfter(func)
+
+
+class MessageQueue:
+    """
+    Hold messages sent with Publisher.sendMessageAsync() until the thread
+    that owns the listeners calls send().
+
+    Putting a message in the queue only uses operations that are atomic in
+    Python (deque.append), so no lock is needed except for coalesced topics,
+    and the scheduler is called only when the queue goes from empty to not empty:
+    a thread sending many messages gets one call to send() for all of them,
+    rather than one call per message.
+
+    Messages of a "coalesced" topic replace the message of the same topic
+    that is still in the queue, if there is one, so that listeners only get
+    the latest data (say, the progress of a long task), and the queue doesn't
+    grow however fast they are sent.
+    """
+
+    def __init__(self, sendMessage, scheduler=callAfter):
+        """The sendMessage is called as sendMessage(topicName, *args, **kwargs)
+        for each message in the queue when send() is called. The scheduler
+        is called with send as its only argument, from the sending thread,
+        whenever send() needs to be called."""
+        self.__sendMessage = sendMessage
+        self.__scheduler = scheduler
+        self.__queue = deque()
+        # messages of coalesced topics, by topic name: the queue only holds
+        # the topic name for those
+        self.__latest = {}
+        self.__latestLock = Lock()
+        self.__coalesced = set()
+        self.__scheduled = False
+
+    def setScheduler(self, scheduler):
+        """Set the function called to get send() called later, by the
+        thread that owns the listeners. """
+        self.__scheduler = scheduler
+
+    def setCoalesce(self, topicName, coalesce=True):
+        """Set whether messages of topicName replace the message of that
+        topic still in the queue. Only the given topic is affected, not
+        its subtopics."""
+        topicName = stringize(topicName)
+        if coalesce:
+            self.__coalesced.add(topicName)
+        else:
+            self.__coalesced.discard(topicName)
+
+    def put(self, topicName, args, kwargs):
+        """Put a message in the queue. Can be called from any thread."""
+        topicName = stringize(topicName)
+        if topicName in self.__coalesced:
+            with self.__latestLock:
+                if topicName not in self.__latest:
+                    self.__queue.append( (topicName, None, None) )
+                self.__latest[topicName] = (args, kwargs)
+        else:
+            self.__queue.append( (topicName, args, kwargs) )
+
+        if not self.__scheduled:
+            self.__scheduled = True
+            self.__scheduler(self.send)
+
+    def send(self, maxMessages=None):
+        """Send the messages in the queue, in the order they were put, up
+        to maxMessages of them if not None; any more are left for another
+        call to send(), which is scheduled. Only messages that were in the
+        queue when the method was called are sent, so that listeners that
+        queue more messages can't keep it going forever.
+        Returns the number of messages sent."""
+        # clear this before looking at the queue: a message put from now on
+        # schedules another send if this one doesn't get it
+        self.__scheduled = False
+
+        count = len(self.__queue)
+        if maxMessages is not None:
+            count = min(count, maxMessages)
+
+        queue = self.__queue
+        latest = self.__latest
+        sent = 0
+        try:
+            for dummy in range(count):
+                topicName, args, kwargs = queue.popleft()
+                if args is None:
+                    with self.__latestLock:
+                        msg = latest.pop(topicName, None)
+                    if msg is None:
+                        continue # thrown away by clear()
+                    args, kwargs = msg
+                self.__sendMessage(topicName, *args, **kwargs)
+                sent += 1
+
+        finally:
+            # a listener raised, or some messages were left: send them later
+            if queue and not self.__scheduled:
+                self.__scheduled = True
+                self.__scheduler(self.send)
+
+        return sent
+
+    def __len__(self):
+        return len(self.__queue)
+
+    def clear(self):
+        """Throw away the messages in the queue."""
+        self.__queue.clear()
+        with self.__latestLock:
+            self.__latest.clear()
@@ -61,6 +61,11 @@ class NotificationMgr:
             for handler in self.__handlers:
                 handler.notifyUnsubscribe(*args, **kwargs)
 
+    def hasSendHandlers(self):
+        """Return True only if notifySend() would call any handlers, so
+        that the send loop can skip it altogether when it would not."""
+        return self.__notifyOnSend and bool(self.__handlers)
+
     def notifySend(self, *args, **kwargs):
         if self.__notifyOnSend and self.__handlers:
             for handler in self.__handlers:
@@ -0,0 +1,87 @@
+"""
+Collect statistics about the messages sent and the time taken by each
+listener. Profiling is turned on with pub.setProfilingFlags(enabled=True),
+and the statistics are obtained from pub.getProfiler().
+
+:copyright: Copyright since 2006 by Oliver Schoenborn, all rights reserved.
+:license: BSD, see LICENSE_BSD_Simple.txt for details.
+"""
+
+from timeit import default_timer as timer
+
+from .topicutils import stringize
+
+from .. import py2and3
+
+
+class Profiler:
+    """
+    Count the messages sent for each topic, and the number of calls, total
+    time and longest time of each listener. When profiling is off the topics
+    don't call the profiler at all, so it costs nothing.
+
+    Listeners are identified by their callable, as in Topic.hasListener(), so
+    a callable subscribed to several topics gets the total of all its calls.
+    """
+
+    def __init__(self):
+        self.slowThreshold = None
+        self.slowListenerHandler = None
+        self.reset()
+
+    def reset(self):
+        """Forget all the statistics collected so far."""
+        self.__topicCounts = {}
+        self.__listenerStats = {}
+
+    def countMessage(self, topicObj):
+        """Called by topicObj each time a message of that topic is sent."""
+        nameTuple = topicObj.getNameTuple()
+        self.__topicCounts[nameTuple] = self.__topicCounts.get(nameTuple, 0) + 1
+
+    def addCall(self, listener, topicObj, seconds):
+        """Called by topicObj after calling listener, which took the given
+        number of seconds."""
+        stats = self.__listenerStats.get(listener)
+        if stats is None:
+            stats = self.__listenerStats[listener] = [listener.name(), 0, 0.0, 0.0]
+        stats[1] += 1
+        stats[2] += seconds
+        if seconds > stats[3]:
+            stats[3] = seconds
+
+        if (self.slowThreshold is not None and seconds > self.slowThreshold
+            and self.slowListenerHandler is not None):
+            self.slowListenerHandler(listener, topicObj, seconds)
+
+    def getTopicCounts(self):
+        """Get a dict of the number of messages sent, by topic name."""
+        return dict( (stringize(name), count)
+            for name, count in py2and3.iteritems(self.__topicCounts) )
+
+    def getListenerStats(self):
+        """Get a dict of statistics by listener name (see Listener.name()).
+        Each item is a dict with the keys 'calls', 'totalTime' and
+        'maxTime', the times being in seconds."""
+        return dict( (name, dict(calls=calls, totalTime=total, maxTime=longest))
+            for name, calls, total, longest in py2and3.itervalues(self.__listenerStats) )
+
+    def getStats(self):
+        """Get all the statistics, as a dict with the keys 'topics' (see
+        getTopicCounts()) and 'listeners' (see getListenerStats())."""
+        return dict(topics=self.getTopicCounts(), listeners=self.getListenerStats())
+
+    def exportCSV(self, fileObj):
+        """Write the statistics to fileObj in CSV format: one row per topic
+        and per listener, with the columns kind ('topic' or 'listener'),
+        name, count, totalTime and maxTime (empty for topics). The listeners
+        are sorted by total time, longest first."""
+        import csv
+        writer = csv.writer(fileObj)
+        writer.writerow(['kind', 'name', 'count', 'totalTime', 'maxTime'])
+        for name, count in sorted(py2and3.iteritems(self.getTopicCounts())):
+            writer.writerow(['topic', name, count, '', ''])
+        stats = sorted(py2and3.itervalues(self.__listenerStats),
+                       key=lambda item: item[2], reverse=True)
+        for name, calls, total, longest in stats:
+            writer.writerow(['listener', name, calls, '%.6f' % total, '%.6f' % longest])
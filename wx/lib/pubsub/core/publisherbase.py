@@ -7,6 +7,8 @@ from .topicmgr import (
     TopicManager, 
     TreeConfig
 )
+from .msgqueue import MessageQueue
+from .profiler import Profiler
 
 from .. import py2and3 
 
@@ -23,6 +25,8 @@ class PublisherBase:
         instance of TreeConfig."""
         self.__treeConfig = treeConfig or TreeConfig()
         self.__topicMgr = TopicManager(self.__treeConfig)
+        self.__msgQueue = MessageQueue(self.sendMessage)
+        self.__profiler = Profiler()
 
     def getTopicMgr(self):
         """Get the topic manager created for this publisher."""
@@ -76,6 +80,49 @@ class PublisherBase:
         """Return a dictionary with the notification flag states."""
         return self.__treeConfig.notificationMgr.getFlagStates()
 
+    def setProfilingFlags(self, enabled=None, slowThreshold=None,
+        slowListenerHandler=None):
+        """Set the profiling options. The kwargs that are None are left at
+        their current value:
+
+        - enabled:             if True, count the messages sent for each topic
+                               and time each call of each listener (see
+                               getProfiler());
+        - slowThreshold:       a time in seconds, or False for none: a listener
+                               call that takes longer than this is reported to
+                               the slowListenerHandler;
+        - slowListenerHandler: a function called as handler(listener, topicObj,
+                               seconds) for each slow listener call, or False
+                               for none.
+
+        When profiling is off (the default), sending messages costs the same
+        as if there were no profiler. Turning it off keeps the statistics
+        collected so far. E.g.
+
+            pub.setProfilingFlags(enabled=True, slowThreshold=0.05,
+                                  slowListenerHandler=reportSlowListener)
+        """
+        if slowThreshold is not None:
+            self.__profiler.slowThreshold = slowThreshold or None
+        if slowListenerHandler is not None:
+            self.__profiler.slowListenerHandler = slowListenerHandler or None
+        if enabled is not None:
+            self.__treeConfig.profiler = self.__profiler if enabled else None
+
+    def getProfilingFlags(self):
+        """Return a dictionary with the profiling options."""
+        return dict(
+            enabled             = self.__treeConfig.profiler is not None,
+            slowThreshold       = self.__profiler.slowThreshold,
+            slowListenerHandler = self.__profiler.slowListenerHandler,
+            )
+
+    def getProfiler(self):
+        """Get the pubsub.core.profiler.Profiler that collects statistics when
+        profiling is on. Use its getStats() or exportCSV() methods to get the
+        statistics, and its reset() method to start again."""
+        return self.__profiler
+
     def setTopicUnspecifiedFatal(self, newVal=True, checkExisting=True):
         """Changes the creation policy for topics.
 
@@ -130,6 +177,58 @@ class PublisherBase:
         parameters may be accepted."""
         raise NotImplementedError
 
+    def sendMessageAsync(self, topicName, *args, **kwargs):
+        """Queue a message for topicName, to be sent later by the thread that
+        owns the listeners, by a call to sendQueuedMessages(). Unlike
+        sendMessage(), this can be called from any thread: the listeners are
+        always called from the thread that calls sendQueuedMessages().
+
+        The arguments are the same as those of sendMessage(), and the
+        messages are delivered exactly as sendMessage() would, in the order
+        they were queued (except for coalesced topics, see
+        setAsyncCoalesce()). By default the first message put in an empty
+        queue calls wx.CallAfter(sendQueuedMessages), so all the messages
+        queued until then are sent in one go by the wx main loop; see
+        setAsyncScheduler() to change that. """
+        self.__msgQueue.put(topicName, args, kwargs)
+
+    def sendQueuedMessages(self, maxMessages=None):
+        """Send the messages queued by sendMessageAsync(), in the calling
+        thread. If maxMessages is not None, at most that many are sent and
+        another call is scheduled for the rest. Returns the number of
+        messages sent. Any exception raised by a listener (and not handled
+        by the listener exception handler) propagates as with sendMessage(),
+        and the messages not sent yet stay queued."""
+        return self.__msgQueue.send(maxMessages)
+
+    def getNumQueuedMessages(self):
+        """Get the number of messages queued by sendMessageAsync() that
+        have not been sent yet."""
+        return len(self.__msgQueue)
+
+    def clearQueuedMessages(self):
+        """Throw away the messages queued by sendMessageAsync() that have
+        not been sent yet."""
+        self.__msgQueue.clear()
+
+    def setAsyncScheduler(self, scheduler):
+        """Set the function that sendMessageAsync() calls, from the sending
+        thread, when sendQueuedMessages() needs to be called: it gets
+        sendQueuedMessages as its only argument, and must arrange for it to
+        be called in the thread that owns the listeners. The default is
+        wx.CallAfter. A scheduler that does nothing can be given if the
+        application calls sendQueuedMessages() itself, from a wx.Timer or
+        an idle handler say."""
+        self.__msgQueue.setScheduler(scheduler)
+
+    def setAsyncCoalesce(self, topicName, coalesce=True):
+        """Set whether a message of topicName sent with sendMessageAsync()
+        replaces the one of that topic still waiting in the queue, if
+        there is one, rather than being queued after it. This is useful
+        for messages that only report the latest state of something, such
+        as the progress of a task. """
+        self.__msgQueue.setCoalesce(topicName, coalesce)
+
     def subscribe(self, listener, topicName):
         """Subscribe listener to named topic. Raises ListenerMismatchError
         if listener isn't compatible with the topic's MDS. Returns
@@ -7,6 +7,7 @@ Provide the Topic class.
 
 
 from weakref import ref as weakref
+from timeit import default_timer as timer
 
 from .listener import (
     Listener, 
@@ -90,6 +91,9 @@ class Topic(PublisherMixin):
         # Listener instance which satisfies Listener == callable, and will return
         # the Listener. 
         self.__listeners = dict()
+        # (dispatchVersion, listeners of self, [(topic, listeners, filterArgs),
+        # ...] for the ancestors that have listeners), see __getDispatchPlan()
+        self.__dispatchPlan = None
 
         # specification:
         self.__description  = None
@@ -302,6 +306,7 @@ class Topic(PublisherMixin):
             weakListener = Listener(
                 listener, argsInfo, onDead=self.__onDeadListener)
             self.__listeners[weakListener] = weakListener
+            self.__listenersChanged()
             subdLisnr, newSub = weakListener, True
 
         # notify of subscription
@@ -319,6 +324,7 @@ class Topic(PublisherMixin):
         unsubdLisnr = self.__listeners.pop(listener, None)
         if unsubdLisnr is None: 
             return None
+        self.__listenersChanged()
 
         unsubdLisnr._unlinkFromTopic_()
         assert listener == unsubdLisnr.getCallable()
@@ -346,6 +352,8 @@ class Topic(PublisherMixin):
                     unsubd.append(listener)
                     listener._unlinkFromTopic_()
                     del self.__listeners[listener]
+        if unsubd:
+            self.__listenersChanged()
 
         # send notification regarding all listeners actually unsubscribed
         notificationMgr = self._treeConfig.notificationMgr
@@ -369,32 +377,88 @@ class Topic(PublisherMixin):
         If an exception is raised in a listener, the publish is
         aborted, except if there is a handler (see
         pub.setListenerExcHandler)."""
-        self._treeConfig.notificationMgr.notifySend('pre', self)
+        notificationMgr = self._treeConfig.notificationMgr
+        notify = notificationMgr.hasSendHandlers()
+        if notify:
+            notificationMgr.notifySend('pre', self)
+        profiler = self._treeConfig.profiler
+        if profiler is not None:
+            profiler.countMessage(self)
+
+        version, listeners, ancestors = self.__getDispatchPlan()
 
         # send to ourself
         iterState = self._mix_prePublish(data)
-        self.__sendMessage(data, self, iterState)
+        self.__sendMessage(data, self, iterState, listeners, notify, profiler)
 
         # send up the chain
-        topicObj = self.getParent()
-        while topicObj is not None:
-            if topicObj.hasListeners():
+        lastTopic = self
+        for topicObj, listeners, filterArgs in ancestors:
+            if self._treeConfig.dispatchVersion != version:
+                # a listener changed subscriptions: the plan is out of date
+                break
+            if filterArgs:
                 iterState = self._mix_prePublish(data, topicObj, iterState)
-                self.__sendMessage(data, topicObj, iterState)
-
-            # done for this topic, continue up branch to parent towards root
-            topicObj = topicObj.getParent()
-
-        self._treeConfig.notificationMgr.notifySend('post', self)
-
-    def __sendMessage(self, data, topicObj, iterState):
+            self.__sendMessage(data, topicObj, iterState, listeners, notify, profiler)
+            lastTopic = topicObj
+
+        if self._treeConfig.dispatchVersion != version:
+            # finish the send from the topic tree as it is now
+            topicObj = lastTopic.getParent()
+            while topicObj is not None:
+                if topicObj.hasListeners():
+                    iterState = self._mix_prePublish(data, topicObj, iterState)
+                    self.__sendMessage(data, topicObj, iterState,
+                                       topicObj.getListeners(), notify, profiler)
+
+                # done for this topic, continue up branch to parent towards root
+                topicObj = topicObj.getParent()
+
+        if notify:
+            notificationMgr.notifySend('post', self)
+
+    def __getDispatchPlan(self):
+        """Get the listeners of self, and of each of the ancestors that have
+        any, in the order a message is sent to them, along with whether the
+        message data must be filtered for the ancestor (see
+        _mix_needsArgsFilter). The plan is kept until the listeners of any
+        topic in the tree change (see TreeConfig.dispatchVersion), which
+        saves walking up the tree, copying the listeners of each topic and
+        filtering data that needs none on every message."""
+        version = self._treeConfig.dispatchVersion
+        plan = self.__dispatchPlan
+        if plan is None or plan[0] != version:
+            ancestors = []
+            topicObj = self.getParent()
+            while topicObj is not None:
+                if topicObj.hasListeners():
+                    ancestors.append( (topicObj, topicObj.getListeners(),
+                                       self._mix_needsArgsFilter(topicObj)) )
+                topicObj = topicObj.getParent()
+            plan = (version, self.getListeners(), ancestors)
+            self.__dispatchPlan = plan
+        return plan
+
+    def __listenersChanged(self):
+        """Make the dispatch plans of all topics of the tree out of date."""
+        self._treeConfig.dispatchVersion += 1
+
+    def __sendMessage(self, data, topicObj, iterState, listeners, notify, profiler):
         # now send message data to each listener for current topic;
-        # use list of listeners rather than iterator, so that if listeners added/removed during
-        # send loop, no runtime exception:
-        for listener in topicObj.getListeners():
+        # the listeners are a list rather than an iterator, so that if listeners
+        # added/removed during send loop, no runtime exception:
+        for listener in listeners:
             try:
-                self._treeConfig.notificationMgr.notifySend('in', topicObj, pubListener=listener)
-                self._mix_callListener(listener, data, iterState)
+                if notify:
+                    self._treeConfig.notificationMgr.notifySend('in', topicObj, pubListener=listener)
+                if profiler is None:
+                    self._mix_callListener(listener, data, iterState)
+                else:
+                    start = timer()
+                    try:
+                        self._mix_callListener(listener, data, iterState)
+                    finally:
+                        profiler.addCall(listener, topicObj, timer() - start)
 
             except Exception:
                 # if exception handling is on, handle, otherwise re-raise
@@ -447,6 +511,7 @@ class Topic(PublisherMixin):
             subObj.__undefineBranch(topicsMap)
 
         self.__subTopics = {}
+        self.__listenersChanged()
         del topicsMap[self.getName()]
 
     def __adoptSubtopic(self, topicObj):
@@ -463,6 +528,7 @@ class Topic(PublisherMixin):
     def __onDeadListener(self, weakListener):
         """One of our subscribed listeners has died, so remove it and notify"""
         pubListener = self.__listeners.pop(weakListener)
+        self.__listenersChanged()
         # notify:
         self._treeConfig.notificationMgr.notifyDeadListener(pubListener, self)
 
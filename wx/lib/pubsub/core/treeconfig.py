@@ -17,5 +17,10 @@ class TreeConfig:
         self.notificationMgr = NotificationMgr(notificationHandler)
         self.listenerExcHandler = listenerExcHandler
         self.raiseOnTopicUnspecified = False
+        # incremented whenever listeners are added to or removed from any
+        # topic of the tree, so topics know when their dispatch plan is stale
+        self.dispatchVersion = 0
+        # the Profiler collecting statistics, None when profiling is off
+        self.profiler = None
 
 
@@ -107,6 +107,12 @@ __all__ = [
     # publisher stuff:
 
     'sendMessage', 
+    'sendMessageAsync',
+    'sendQueuedMessages',
+    'getNumQueuedMessages',
+    'clearQueuedMessages',
+    'setAsyncScheduler',
+    'setAsyncCoalesce',
     'SenderMissingReqdMsgDataError', 
     'SenderUnknownMsgDataError',
 
@@ -116,6 +122,9 @@ __all__ = [
     'setNotificationFlags', 
     'getNotificationFlags',
     'clearNotificationHandlers',
+    'setProfilingFlags',
+    'getProfilingFlags',
+    'getProfiler',
     
     'TopicTreeTraverser',
 
@@ -131,6 +140,13 @@ unsubscribe = _publisher.unsubscribe
 unsubAll    = _publisher.unsubAll
 sendMessage = _publisher.sendMessage
 
+sendMessageAsync     = _publisher.sendMessageAsync
+sendQueuedMessages   = _publisher.sendQueuedMessages
+getNumQueuedMessages = _publisher.getNumQueuedMessages
+clearQueuedMessages  = _publisher.clearQueuedMessages
+setAsyncScheduler    = _publisher.setAsyncScheduler
+setAsyncCoalesce     = _publisher.setAsyncCoalesce
+
 getListenerExcHandler     = _publisher.getListenerExcHandler
 setListenerExcHandler     = _publisher.setListenerExcHandler
 
@@ -139,6 +155,10 @@ clearNotificationHandlers = _publisher.clearNotificationHandlers
 setNotificationFlags      = _publisher.setNotificationFlags
 getNotificationFlags      = _publisher.getNotificationFlags
 
+setProfilingFlags         = _publisher.setProfilingFlags
+getProfilingFlags         = _publisher.getProfilingFlags
+getProfiler               = _publisher.getProfiler
+
 setTopicUnspecifiedFatal  = _publisher.setTopicUnspecifiedFatal
 
 getMsgProtocol            = _publisher.getMsgProtocol
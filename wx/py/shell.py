@@ -12,8 +12,10 @@ from six import PY3
 
 import keyword
 import os
+import re
 import sys
 import time
+from collections import deque
 from functools import cmp_to_key
 
 from .buffer import Buffer
@@ -31,6 +33,11 @@ sys.ps3 = '<-- '  # Input prompt.
 USE_MAGIC=True
 # Force updates from long-running commands after this many seconds
 PRINT_UPDATE_MAX_TIME=2
+# Lines of output kept in the shell, the oldest ones are deleted when there
+# are more. None keeps them all.
+MAX_SCROLLBACK_LINES=100000
+
+LINE_ENDINGS_RE = re.compile('\r\n|\r|\n')
 
 NAVKEYS = (wx.WXK_END, wx.WXK_LEFT, wx.WXK_RIGHT,
            wx.WXK_UP, wx.WXK_DOWN, wx.WXK_PAGEUP, wx.WXK_PAGEDOWN)
@@ -284,6 +291,12 @@ class Shell(editwindow.EditWindow):
         # For use with forced updates during long-running scripts
         self.lastUpdate=None
 
+        # Text written to stdout and stderr, waiting to be displayed, see
+        # bufferOutput.
+        self.outputBuffer = deque()
+        self.outputScheduled = False
+        self.maxScrollback = MAX_SCROLLBACK_LINES
+
         # Create the command history.  Commands are added into the
         # front of the list (ie. at index 0) as they are entered.
         # self.historyIndex is the current position in the history; it
@@ -382,6 +395,8 @@ class Shell(editwindow.EditWindow):
 
     def OnIdle(self, event):
         """Free the CPU to do other things."""
+        if self.outputBuffer:
+            self.flushOutput()
         if self.waiting:
             time.sleep(0.05)
         event.Skip()
@@ -1016,32 +1031,90 @@ class Shell(editwindow.EditWindow):
         """Display text in the shell.
 
         Replace line endings with OS-specific endings."""
+        # anything printed before goes first
+        if self.outputBuffer:
+            self.flushOutput()
+        self.addOutput(text)
+        self.updateWhileWaiting()
+
+    def addOutput(self, text):
+        """Add text at the current position, and trim the scrollback."""
         text = self.fixLineEndings(text)
         self.AddText(text)
+        self.trimScrollback()
         self.EnsureCaretVisible()
 
+    def updateWhileWaiting(self):
+        """Repaint the shell if a command has been running for more than
+        PRINT_UPDATE_MAX_TIME since the last time."""
         if self.waiting:
             if self.lastUpdate==None:
                 self.lastUpdate=time.time()
             if time.time()-self.lastUpdate > PRINT_UPDATE_MAX_TIME:
+                self.flushOutput()
                 self.Update()
                 self.lastUpdate=time.time()
 
+    def bufferOutput(self, text):
+        """Add text to the output waiting to be displayed.
+
+        This can be called from any thread. The output is displayed in one
+        go at idle time, or before anything else is written to the shell,
+        and every PRINT_UPDATE_MAX_TIME while a command is running, so that
+        printing lots of small strings doesn't slow everything down."""
+        # deque.append is atomic, no lock is needed
+        self.outputBuffer.append(text)
+        if wx.IsMainThread():
+            self.updateWhileWaiting()
+        elif not self.outputScheduled:
+            self.outputScheduled = True
+            wx.CallAfter(self.flushOutput)
+
+    def flushOutput(self):
+        """Display the output waiting in the buffer now."""
+        self.outputScheduled = False
+        if not self:
+            # the shell has been destroyed
+            return
+        chunks = []
+        while self.outputBuffer:
+            chunks.append(self.outputBuffer.popleft())
+        if chunks:
+            self.addOutput(''.join(chunks))
+
+    def trimScrollback(self):
+        """Delete the oldest lines if there are more than maxScrollback.
+
+        The command being edited is never deleted."""
+        if not self.maxScrollback:
+            return
+        extra = self.GetLineCount() - self.maxScrollback
+        if extra <= 0:
+            return
+        end = self.PositionFromLine(extra)
+        if not self.waiting:
+            end = min(end, self.promptPosStart)
+        if end <= 0:
+            return
+        self.SetTargetStart(0)
+        self.SetTargetEnd(end)
+        self.ReplaceTarget('')
+        self.EmptyUndoBuffer()
+        # the prompt positions are set again by the next prompt if a
+        # command is running
+        self.promptPosStart = max(self.promptPosStart - end, 0)
+        self.promptPosEnd = max(self.promptPosEnd - end, 0)
+
     def fixLineEndings(self, text):
         """Return text with line endings replaced by OS-specific endings."""
-        lines = text.split('\r\n')
-        for l in range(len(lines)):
-            chunks = lines[l].split('\r')
-            for c in range(len(chunks)):
-                chunks[c] = os.linesep.join(chunks[c].split('\n'))
-            lines[l] = os.linesep.join(chunks)
-        text = os.linesep.join(lines)
-        return text
+        return LINE_ENDINGS_RE.sub(os.linesep, text)
 
     def prompt(self):
         """Display proper prompt for the context: ps1, ps2 or ps3.
 
         If this is a continuation line, autoindent as necessary."""
+        # the prompt goes after anything printed, and on a new line
+        self.flushOutput()
         isreading = self.reader.isreading
         skip = False
         if isreading:
@@ -1097,6 +1170,7 @@ class Shell(editwindow.EditWindow):
 
     def readline(self):
         """Replacement for stdin.readline()."""
+        self.flushOutput()
         input = ''
         reader = self.reader
         reader.isreading = True
@@ -1142,6 +1216,7 @@ class Shell(editwindow.EditWindow):
 
     def clear(self):
         """Delete all text from the shell."""
+        self.outputBuffer.clear()
         self.ClearAll()
 
     def run(self, command, prompt=True, verbose=True):
@@ -1259,11 +1334,11 @@ class Shell(editwindow.EditWindow):
 
     def writeOut(self, text):
         """Replacement for stdout."""
-        self.write(text)
+        self.bufferOutput(text)
 
     def writeErr(self, text):
         """Replacement for stderr."""
-        self.write(text)
+        self.bufferOutput(text)
 
     def redirectStdin(self, redirect=True):
         """If redirect is true then sys.stdin will come from the shell."""
@@ -45,6 +45,11 @@ img2py.py  --  Convert an image to PNG format and embed it in a Python
 Usage:
 
     img2py.py [options] image_file python_file
+    img2py.py [options] image_file_or_folder ... output_file
+
+    Several image files, or folders whose images are all converted, can
+    be given at once: they all go in output_file, and are named after
+    their file names.
 
 Options:
 
@@ -75,6 +80,13 @@ Options:
     -f             Generate code compatible with the old function interface.
                    (This option is ON by default in 2.8, use -f to turn off.)
 
+    -b             Write the images to a binary bundle file instead of a
+                   Python module.  A bundle takes less memory and time to
+                   load than a module, its images are only read when they
+                   are used.  It is loaded with wx.lib.embeddedimage.ImageBundle,
+                   which works like the catalog of the -c option.  The -m and
+                   -a options can be used with bundles too.
+
 You can also import this module from your Python scripts, and use its img2py()
 function. See its docstring for more info.
 """
@@ -85,9 +97,10 @@ import glob
 import os
 import re
 import sys
-import tempfile
 
 import wx
+from six import BytesIO
+from wx.lib.embeddedimage import ImageBundle, WriteImageBundle
 from . import img2img
 
 try:
@@ -103,6 +116,11 @@ DEFAULT_IMGNAME = ""
 DEFAULT_ICON = False
 DEFAULT_CATALOG = False
 DEFAULT_COMPATIBLE = False
+DEFAULT_BUNDLE = False
+
+# THE FILES FOUND IN THE FOLDERS GIVEN ON THE COMMAND LINE
+IMAGE_EXTENSIONS = [".png", ".bmp", ".gif", ".jpg", ".jpeg", ".ico", ".cur",
+                    ".ani", ".xpm", ".pcx", ".pnm", ".tif", ".tiff", ".tga", ".iff"]
 
 # THIS IS USED TO IDENTIFY, IN THE GENERATED SCRIPT, LINES IN THE FORM
 # "index.append('Image name')"
@@ -124,6 +142,97 @@ def convert(fileName, maskClr, outputDir, outputName, outType, outExt):
         return img2img.convert(fileName, maskClr, outputDir, outputName, outType, outExt)
 
 
+def getPNGData(image_file, maskClr=DEFAULT_MASKCLR):
+    """
+    Returns the contents of an image file converted to PNG format, with
+    the mask colour applied if not None. Raises IOError if the image
+    can't be loaded or converted.
+    """
+    # if the file is already the right type then just use it directly
+    if maskClr == DEFAULT_MASKCLR and image_file.upper().endswith(".PNG"):
+        with open(image_file, "rb") as f:
+            return f.read()
+
+    bmp = wx.Bitmap(image_file, wx.BITMAP_TYPE_ANY)
+    if not bmp.IsOk():
+        raise IOError(image_file + " failed to load!")
+    if maskClr:
+        bmp.SetMask(wx.Mask(bmp, maskClr))
+
+    # convert in memory rather than through a temporary file
+    stream = BytesIO()
+    if not bmp.ConvertToImage().SaveFile(stream, wx.BITMAP_TYPE_PNG):
+        raise IOError(image_file + " failed to save!")
+    return stream.getvalue()
+
+
+def listImages(paths):
+    """
+    Returns the image files given by paths, which can be file names,
+    glob patterns or folders, in which case the image files they contain
+    are listed, sorted by name.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                fileName = os.path.join(path, name)
+                if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS and \
+                   os.path.isfile(fileName):
+                    files.append(fileName)
+        else:
+            files.extend(sorted(glob.glob(path)) or [path])
+    return files
+
+
+def img2bundle(image_files, bundle_file,
+               append=DEFAULT_APPEND,
+               maskClr=DEFAULT_MASKCLR,
+               imgNames=None,
+               ):
+    """
+    Converts image files to PNG format and writes them to a binary bundle
+    file, which can be loaded with wx.lib.embeddedimage.ImageBundle
+    --image_files: list of strings; the paths of the source image files
+    --bundle_file: string; the path of the destination bundle file
+    --append: boolean; keep the images already in bundle_file
+    --imgNames: list of strings; the names of the images in the bundle,
+      the file names without any path or extension by default
+    """
+    global app
+    if not wx.GetApp():
+        app = wx.App(0)
+
+    images = []
+    if append and os.path.exists(bundle_file):
+        bundle = ImageBundle(bundle_file)
+        try:
+            images = [(name, bundle.GetData(name)) for name in bundle.index]
+        finally:
+            bundle.Close()
+
+    if imgNames is None:
+        imgNames = [os.path.splitext(os.path.basename(image_file))[0]
+                    for image_file in image_files]
+
+    names = set(name for name, data in images)
+    for image_file, imgName in zip(image_files, imgNames):
+        try:
+            data = getPNGData(image_file, maskClr)
+        except IOError as error:
+            print(error)
+            continue
+
+        if imgName in names:
+            print("Warning: %s already in bundle, only the last one is kept." % imgName)
+            images = [(name, old) for name, old in images if name != imgName]
+        names.add(imgName)
+        images.append((imgName, data))
+
+    WriteImageBundle(bundle_file, images)
+    print("Bundled %d images into %s" % (len(images), bundle_file))
+
+
 def img2py(image_file, python_file,
            append=DEFAULT_APPEND,
            compressed=DEFAULT_COMPRESSED,
@@ -149,30 +258,25 @@ def img2py(image_file, python_file,
     if not wx.GetApp():
         app = wx.App(0)
 
-    # convert the image file to a temporary file
-    tfname = tempfile.mktemp()
+    # convert the image file to PNG
     try:
-        ok, msg = convert(image_file, maskClr, None, tfname, wx.BITMAP_TYPE_PNG, ".png")
-        if not ok:
-            print(msg)
-            return
-
-        lines = []
-        data = b64encode(open(tfname, "rb").read())
-        while data:
-            part = data[:72]
-            data = data[72:]
-            if sys.version > '3':
-                output = '    %s' % part
-            else:
-                output = '    "%s"' % part
-            if not data:
-                output += ")"
-            lines.append(output)
-        data = "\n".join(lines)
-    finally:
-        if os.path.exists(tfname):
-            os.remove(tfname)
+        data = b64encode(getPNGData(image_file, maskClr))
+    except IOError as error:
+        print(error)
+        return
+
+    lines = []
+    while data:
+        part = data[:72]
+        data = data[72:]
+        if sys.version > '3':
+            output = '    %s' % part
+        else:
+            output = '    "%s"' % part
+        if not data:
+            output += ")"
+        lines.append(output)
+    data = "\n".join(lines)
 
     old_index = []
     if catalog and append and python_file != '-':
@@ -285,9 +389,10 @@ def main(args=None):
     icon = DEFAULT_ICON
     catalog = DEFAULT_CATALOG
     compatible = DEFAULT_COMPATIBLE
+    bundle = DEFAULT_BUNDLE
 
     try:
-        opts, fileArgs = getopt.getopt(args, "auicfFn:m:")
+        opts, fileArgs = getopt.getopt(args, "auicfFbn:m:")
     except getopt.GetoptError:
         print(__doc__)
         return
@@ -307,14 +412,33 @@ def main(args=None):
             compatible = True
         elif opt == "-F":
             compatible = False
+        elif opt == "-b":
+            bundle = True
 
-    if len(fileArgs) != 2:
+    if len(fileArgs) < 2:
         print(__doc__)
         return
 
-    image_file, python_file = fileArgs
-    img2py(image_file, python_file,
-           append, compressed, maskClr, imgName, icon, catalog, compatible)
+    output_file = fileArgs[-1]
+    image_files = listImages(fileArgs[:-1])
+
+    if bundle:
+        imgNames = None
+        if imgName and len(image_files) == 1:
+            imgNames = [imgName]
+        img2bundle(image_files, output_file, append, maskClr, imgNames)
+
+    elif len(image_files) == 1 and not os.path.isdir(fileArgs[0]):
+        img2py(image_files[0], output_file,
+               append, compressed, maskClr, imgName, icon, catalog, compatible)
+
+    else:
+        # all the images in one go, each one named after its file
+        for image_file in image_files:
+            imgName = os.path.splitext(os.path.basename(image_file))[0]
+            img2py(image_file, output_file,
+                   append, compressed, maskClr, imgName, icon, catalog, compatible)
+            append = True
 
 if __name__ == "__main__":
     main(sys.argv[1:])